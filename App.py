@@ -1,36 +1,65 @@
+import os
 import streamlit as st
 
 # Importer les packages depuis py
 from py.gpt_coref_resolver import coreference_resolver
 from py.rdf_grapher import RDFGrapher
 from py.knowledge_graph_extractor import KnowledgeGraphExtractor
+from py.pipeline import DocumentPipeline
+from py.graph_renderer import GraphRenderer
+from py.model_registry import registry
 
+# Fichier SQLite où les graphes de tous les documents s'accumulent (aucun si non défini)
+GRAPH_STORE_PATH = os.environ.get("GRAPH_STORE_PATH")
+# Fichier SQLite du cache des résolutions de co-références (aucun si non défini)
+COREF_CACHE_PATH = os.environ.get("COREF_CACHE_PATH")
 
-def main_with_coref_resolution(kge, text: str, graph_name: str):
-    # Résoudre les co-références dans le texte
-    resolved_text = coreference_resolver(text)
 
-    # Extraire les triplets
-    triplets = kge.extract_triplet(resolved_text)
-    rdf_triplets = kge.transform_to_rdf_triplet(triplets)
-    enriched_triplets = kge.enrichir_graph(rdf_triplets)
+@st.cache_resource
+def get_extractor():
+    # Un seul extracteur par processus : le pipeline Spacy + REBEL, chargé et rodé une fois
+    # (voir py.model_registry), ainsi que ses clients HTTP et ses caches, sont réutilisés
+    # d'une exécution du script à l'autre
+    return KnowledgeGraphExtractor()
 
-    # Générer le graphe RDF
-    generate_graph(enriched_triplets, graph_name)
 
-    # Afficher les triplets enrichis dans l'application Streamlit
-    st.write("**Triplets enrichis :**")
-    for triplet in enriched_triplets:
-        st.write(triplet)
+@st.cache_resource
+def get_renderer():
+    # Rendu des graphes en arrière-plan : un gros graphe n'immobilise pas l'application.
+    # Un seul pool de threads par processus, partagé par toutes les exécutions du script
+    return GraphRenderer(max_nodes=150, timeout=60)
 
 
-def generate_graph(triplet, name):
-    rdfgraphe = RDFGrapher()
-    rdf_graph_triplet = rdfgraphe.transform_triplets_to_rdflib(triplet)
-    final_graph = rdfgraphe.get_final_graph(rdf_graph_triplet)
+def main_with_coref_resolution(kge, text: str, graph_name: str):
+    # Co-références, extraction, liaison, enrichissement et graphe, étape par étape
+    pipeline = DocumentPipeline(
+        kge,
+        coref=lambda texte: coreference_resolver(texte, cache_path=COREF_CACHE_PATH),
+    )
+    resultat = pipeline.process([text])[0]
+    if resultat.error is not None:
+        st.error(f"Une erreur est survenue : {resultat.error}")
+        return
+
+    # Ajouter (ou remplacer) les triplets du document dans le store persistant
+    if GRAPH_STORE_PATH:
+        grapher = RDFGrapher(store_path=GRAPH_STORE_PATH)
+        grapher.upsert_document(graph_name, resultat.triplets)
+        grapher.store.close()
 
     # Visualiser et enregistrer le graphe
-    rdfgraphe.visualize(final_graph, name)
+    try:
+        chemin = RDFGrapher.visualize(
+            resultat.graph, graph_name, renderer=get_renderer()
+        )
+        st.image(chemin)
+    except (RuntimeError, TimeoutError) as e:
+        st.warning(f"Le graphe n'a pas pu être affiché : {e}")
+
+    # Afficher les triplets enrichis dans l'application Streamlit
+    st.write("**Triplets enrichis :**")
+    for triplet in resultat.triplets:
+        st.write(triplet)
 
 
 def main():
@@ -40,7 +69,9 @@ def main():
     text_input = st.text_area("Texte à analyser", height=300)
     graph_name_input = st.text_input("Nom du fichier pour le graphe (sans extension)")
 
-    kge = KnowledgeGraphExtractor()
+    kge = get_extractor()
+    with st.sidebar.expander("Chargement des modèles"):
+        st.json(registry.metrics())
 
     if st.button("Générer les Triplets RDF Enrichis"):
         if text_input and graph_name_input:
@@ -0,0 +1,61 @@
+"""
+Compare la latence des moteurs d'inférence REBEL sur CPU (torch, int8, onnx)
+et vérifie que leurs triplets sont identiques à ceux du moteur torch.
+
+Usage : python -m benchmarks.bench_backends [répétitions] [chemin_du_modele_onnx]
+"""
+
+import sys
+import time
+import spacy
+from modules.spacy_component import BACKENDS
+
+PHRASES = [
+    "Paris is the capital of France.",
+    "Barack Obama was born in Hawaii.",
+    "Napoleon Bonaparte was a French military leader born in Ajaccio.",
+    "Bill Gates founded Microsoft with Paul Allen.",
+    "The University of Versailles Saint-Quentin-en-Yvelines is a French public "
+    "university created in 1991.",
+    "Mark Zuckerberg conceived Facebook while he was a student at Harvard University.",
+]
+
+
+def main(repetitions=3, onnx_path=None):
+    reference = None
+    for backend in BACKENDS:
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        config = {"device": -1, "backend": backend}
+        if backend == "onnx":
+            config["model_path"] = onnx_path
+        try:
+            debut = time.perf_counter()
+            rebel = nlp.add_pipe("rebel", config=config)
+            chargement = time.perf_counter() - debut
+        except ImportError as e:
+            print(f"{backend:>5} : ignoré ({e})")
+            continue
+
+        doc = nlp.get_pipe("sentencizer")(nlp.make_doc(" ".join(PHRASES)))
+        sents = list(doc.sents)
+        durees = []
+        for _ in range(repetitions):
+            debut = time.perf_counter()
+            triplets = rebel._generate_triplets(sents)
+            durees.append(time.perf_counter() - debut)
+
+        if reference is None:
+            reference = triplets
+        print(
+            f"{backend:>5} : chargement {chargement:.1f} s, "
+            f"{min(durees) / len(sents) * 1000:.0f} ms/phrase (meilleur de {repetitions}), "
+            f"triplets identiques à torch : {triplets == reference}"
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 3,
+        sys.argv[2] if len(sys.argv) > 2 else None,
+    )
@@ -0,0 +1,68 @@
+"""
+Compare les backends de résolution des co-références (py.gpt_coref_resolver) : latence
+par document et F1 des triplets REBEL extraits ensuite (Evaluation.evaluation.calcul_metrics).
+
+Un backend indisponible (clé OpenAI absente, allennlp non installé) est signalé puis ignoré.
+
+Usage : python -m benchmarks.bench_coref_backends [répétitions]
+"""
+
+import sys
+import time
+from Evaluation.evaluation import calcul_metrics
+from py.gpt_coref_resolver import COREF_BACKENDS, make_coref_backend
+from py.knowledge_graph_extractor import KnowledgeGraphExtractor
+
+DOCUMENTS = [
+    "Marie Curie was born in Warsaw. She won the Nobel Prize in Physics in 1903.",
+    "Bill Gates founded Microsoft in 1975. He was born in Seattle.",
+    "Microsoft is headquartered in Redmond. It was founded by Bill Gates and Paul Allen.",
+    "Napoleon was born in Ajaccio. His brother Joseph became king of Spain.",
+]
+
+REFERENCE = [
+    ("Marie Curie", "place of birth", "Warsaw"),
+    ("Marie Curie", "award received", "Nobel Prize in Physics"),
+    ("Microsoft", "founded by", "Bill Gates"),
+    ("Bill Gates", "place of birth", "Seattle"),
+    ("Microsoft", "headquarters location", "Redmond"),
+    ("Microsoft", "founded by", "Paul Allen"),
+    ("Napoleon", "place of birth", "Ajaccio"),
+    ("Napoleon", "sibling", "Joseph"),
+    ("Joseph", "position held", "king of Spain"),
+]
+
+
+def main(repetitions=3):
+    kge = KnowledgeGraphExtractor()
+    for backend in COREF_BACKENDS:
+        try:
+            resolver = make_coref_backend(backend)
+            resolver.resolve(DOCUMENTS[0])
+        except Exception as e:
+            print(f"{backend:>9} : indisponible ({e})")
+            continue
+
+        durees = []
+        for _ in range(repetitions):
+            debut = time.perf_counter()
+            for document in DOCUMENTS:
+                resolus = resolver.resolve(document)
+            durees.append((time.perf_counter() - debut) / len(DOCUMENTS))
+        resolus = resolver.resolve_many(DOCUMENTS)
+
+        triplets = [t for texte in resolus for t in kge.extract_triplet(texte)]
+        try:
+            metriques = calcul_metrics(triplets, REFERENCE)
+        except ZeroDivisionError:
+            # calcul_metrics divise par le nombre de triplets corrects
+            metriques = {"precision": 0.0, "rappel": 0.0, "f1-score": 0.0}
+        print(
+            f"{backend:>9} : {min(durees) * 1000:.1f} ms/doc, "
+            f"F1 {metriques['f1-score']:.3f} "
+            f"(précision {metriques['precision']:.3f}, rappel {metriques['rappel']:.3f})"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,49 @@
+"""
+Compare le temps de production du DOT (et du rendu SVG si Graphviz est installé) pour le
+graphe entier et pour un échantillon de 150 nœuds, sur des graphes de 1k, 10k et 100k
+triplets.
+
+Usage : python -m benchmarks.bench_graph_renderer [nombre_max_de_triplets]
+"""
+
+import shutil
+import sys
+import time
+from benchmarks.bench_rdf_grapher import triplets_synthetiques
+from py.graph_renderer import render, sample_graph
+from py.rdf_grapher import RDFGrapher
+
+
+def chronometrer(fonction):
+    debut = time.perf_counter()
+    resultat = fonction()
+    return time.perf_counter() - debut, resultat
+
+
+def main(n_max=100000):
+    formats = ("dot", "svg") if shutil.which("dot") else ("dot",)
+    for n in (1000, 10000, 100000):
+        if n > n_max:
+            break
+        graphe = RDFGrapher().add_triplets(triplets_synthetiques(n))
+        duree, echantillon = chronometrer(lambda: sample_graph(graphe, 150))
+        print(
+            f"{n:>7,} triplets : échantillon de {len(echantillon):,} triplets "
+            f"en {duree:.2f} s"
+        )
+        for format in formats:
+            for nom, max_nodes in (("entier", None), ("150 nœuds", 150)):
+                if format == "svg" and max_nodes is None and n > 1000:
+                    # Graphviz prend plusieurs minutes sur un graphe entier de cette taille
+                    continue
+                duree, sortie = chronometrer(
+                    lambda: render(graphe, format, max_nodes, timeout=600)
+                )
+                print(
+                    f"{n:>7,} triplets, {format} {nom:>9} : {duree:6.2f} s, "
+                    f"{len(sortie) / 2**10:,.0f} Kio"
+                )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
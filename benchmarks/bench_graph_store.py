@@ -0,0 +1,70 @@
+"""
+Mesure le débit d'insertion du store persistant GraphStore par documents de 100 triplets,
+puis la latence des recherches par motif (sujet seul, prédicat + objet, objet seul, triplet
+complet) et celle d'un `upsert_document`, sur 1M triplets par défaut.
+
+Usage : python -m benchmarks.bench_graph_store [nombre_de_triplets] [nombre_de_recherches]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from benchmarks.bench_ntriples_sink import TRIPLETS_PAR_DOCUMENT, documents
+from py.rdf_grapher import RDFGrapher
+
+
+def latences(fonction, motifs):
+    durees = []
+    for motif in motifs:
+        debut = time.perf_counter()
+        fonction(motif)
+        durees.append(time.perf_counter() - debut)
+    durees.sort()
+    return durees[len(durees) // 2], durees[int(len(durees) * 0.99)]
+
+
+def main(n=1000000, n_recherches=1000):
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "graphe.db")
+        grapher = RDFGrapher(store_path=chemin)
+        debut = time.perf_counter()
+        for document_id, triplets in documents(n):
+            grapher.upsert_document(document_id, triplets)
+        duree = time.perf_counter() - debut
+        taille = len(grapher.g)
+        print(
+            f"insertion : {n:,} triplets en {duree:.1f} s "
+            f"({n / duree:,.0f} triplets/s), {taille:,} distincts, "
+            f"{os.path.getsize(chemin) / 2**20:.0f} Mio sur disque"
+        )
+
+        echantillon = random.Random(0).sample(list(grapher.g), n_recherches)
+        graphe = grapher.g
+        recherches = (
+            ("s ? ?", lambda t: list(graphe.triples((t[0], None, None)))),
+            ("? p o", lambda t: list(graphe.triples((None, t[1], t[2])))),
+            ("? ? o", lambda t: list(graphe.triples((None, None, t[2])))),
+            ("s p o", lambda t: t in graphe),
+        )
+        for nom, fonction in recherches:
+            p50, p99 = latences(fonction, echantillon)
+            print(f"recherche {nom} : p50 {p50 * 1e3:.3f} ms, p99 {p99 * 1e3:.3f} ms")
+
+        anciens = dict(documents(TRIPLETS_PAR_DOCUMENT * 100))
+        p50, p99 = latences(
+            lambda document_id: grapher.upsert_document(
+                document_id, anciens[document_id]
+            ),
+            list(anciens),
+        )
+        print(
+            f"upsert d'un document de {TRIPLETS_PAR_DOCUMENT} triplets : "
+            f"p50 {p50 * 1e3:.2f} ms, p99 {p99 * 1e3:.2f} ms"
+        )
+        grapher.store.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
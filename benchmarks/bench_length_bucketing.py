@@ -0,0 +1,66 @@
+"""
+Compare la génération REBEL par lots dans l'ordre des phrases et par lots triés par longueur :
+nombre de tokens de padding et temps de génération.
+
+Usage : python -m benchmarks.bench_length_bucketing [nombre_de_phrases] [taille_de_lot]
+"""
+
+import sys
+import time
+import spacy
+from modules.spacy_component import bucket_by_length, padded_token_count
+
+PHRASES = [
+    "Paris is the capital of France.",
+    "Napoleon Bonaparte, born in Ajaccio in 1769, was a French military and political "
+    "leader who rose to prominence during the French Revolution and led several "
+    "successful campaigns during the Revolutionary Wars.",
+    "Barack Obama was born in Hawaii.",
+    "The University of Versailles Saint-Quentin-en-Yvelines is a French public university "
+    "created in 1991, located in the department of Yvelines and, since 2002, in "
+    "Hauts-de-Seine, and it is a constituent of Paris-Saclay University.",
+    "Bill Gates founded Microsoft.",
+    "Mark Zuckerberg conceived Facebook while he was a student at Harvard University.",
+]
+
+
+def main(n_phrases=64, batch_size=8):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    rebel = nlp.add_pipe("rebel", config={"device": -1, "batch_size": batch_size})
+    texte = " ".join(PHRASES[i % len(PHRASES)] for i in range(n_phrases))
+    # Seul le découpage en phrases est appliqué, la génération est mesurée à part
+    sents = list(nlp.get_pipe("sentencizer")(nlp.make_doc(texte)).sents)
+
+    lengths = [
+        len(ids)
+        for ids in rebel.triplet_extractor.tokenizer([s.text for s in sents])[
+            "input_ids"
+        ]
+    ]
+    lots_ordre = [
+        list(range(i, min(i + batch_size, len(lengths))))
+        for i in range(0, len(lengths), batch_size)
+    ]
+    lots_tries = bucket_by_length(lengths, batch_size)
+
+    resultats = {}
+    for nom, trie, lots in (
+        ("ordre du document", False, lots_ordre),
+        ("trié par longueur", True, lots_tries),
+    ):
+        rebel.sort_by_length = trie
+        debut = time.perf_counter()
+        resultats[nom] = rebel._generate_triplets(sents)
+        duree = time.perf_counter() - debut
+        print(
+            f"{nom:>18} : {padded_token_count(lengths, lots):>6} tokens de padding "
+            f"/ {sum(lengths)} tokens réels, {duree:.2f} s"
+        )
+
+    identiques = resultats["ordre du document"] == resultats["trié par longueur"]
+    print(f"Triplets identiques dans les deux modes : {identiques}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,61 @@
+"""
+Mesure la latence des recherches dans un store DBpedia local (py.local_dbpedia)
+construit à partir d'un dump synthétique.
+
+Usage : python -m benchmarks.bench_local_dbpedia [nombre_de_ressources] [recherches]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from py.local_dbpedia import RDF_TYPE, LocalDBpediaStore
+
+DBR = "http://dbpedia.org/resource/"
+DBO = "http://dbpedia.org/ontology/"
+
+
+def triplets_synthetiques(n_ressources):
+    for i in range(n_ressources):
+        for t in range(4):
+            yield f"{DBR}R{i}", RDF_TYPE, f"{DBO}Type{(i + t) % 300}"
+        for j in range(1, 4):
+            yield f"{DBR}R{i}", f"{DBO}p{j}", f"{DBR}R{(i * 7 + j) % n_ressources}"
+
+
+def main(n_ressources=200000, n_recherches=20000):
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "dbpedia.db")
+        store = LocalDBpediaStore(chemin)
+        debut = time.perf_counter()
+        n = store.load(triplets_synthetiques(n_ressources))
+        print(f"Chargement : {n:,} triplets en {time.perf_counter() - debut:.1f} s")
+
+        hasard = random.Random(0)
+        ressources = [
+            f"{DBR}R{hasard.randrange(n_ressources)}" for _ in range(n_recherches)
+        ]
+        paires = [
+            (uri, f"{DBR}R{hasard.randrange(n_ressources)}") for uri in ressources
+        ]
+
+        for nom, fonction, arguments in (
+            ("types", store.types, [[uri] for uri in ressources]),
+            ("predicates", store.predicates, [[paire] for paire in paires]),
+            (
+                "types x50",
+                store.types,
+                [ressources[i : i + 50] for i in range(0, n_recherches, 50)],
+            ),
+        ):
+            debut = time.perf_counter()
+            for argument in arguments:
+                fonction(argument)
+            duree = time.perf_counter() - debut
+            print(f"{nom:>10} : {duree / len(arguments) * 1e6:,.1f} µs par appel")
+        store.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,76 @@
+"""
+Compare l'export d'un corpus par un graphe rdflib en mémoire (`RDFGrapher.add_triplets` puis
+`Graph.serialize`) à l'écriture au fil de l'eau de NTriplesSink (N-Triples, puis N-Quads
+compressé), en temps et en pic de mémoire (tracemalloc), sur 10k, 100k et 1M triplets
+répartis en documents de 100 triplets.
+
+Usage : python -m benchmarks.bench_ntriples_sink [nombre_max_de_triplets]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+from benchmarks.bench_rdf_grapher import triplets_synthetiques
+from py.ntriples_sink import NTriplesSink
+from py.rdf_grapher import RDFGrapher
+
+TRIPLETS_PAR_DOCUMENT = 100
+
+
+def documents(n):
+    # Les documents sont produits au fil de l'eau : seule la sortie occupe la mémoire
+    triplets = triplets_synthetiques(n)
+    for debut in range(0, n, TRIPLETS_PAR_DOCUMENT):
+        yield f"doc-{debut}", list(islice(triplets, TRIPLETS_PAR_DOCUMENT))
+
+
+def en_memoire(n, chemin):
+    grapher = RDFGrapher()
+    for _, triplets in documents(n):
+        grapher.add_triplets(triplets)
+    grapher.g.serialize(chemin, format="nt", encoding="utf-8")
+
+
+def au_fil_de_l_eau(extension):
+    def exporter(n, chemin):
+        with NTriplesSink(chemin + extension) as sink:
+            for document_id, triplets in documents(n):
+                sink.write(triplets, document_id)
+
+    return exporter
+
+
+def mesurer(fonction, n, dossier):
+    chemin = os.path.join(dossier, "corpus")
+    tracemalloc.start()
+    debut = time.perf_counter()
+    fonction(n, chemin)
+    duree = time.perf_counter() - debut
+    pic = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duree, pic
+
+
+def main(n_max=1000000):
+    methodes = (
+        ("graphe rdflib", en_memoire),
+        ("flux .nt", au_fil_de_l_eau(".nt")),
+        ("flux .nq.gz", au_fil_de_l_eau(".nq.gz")),
+    )
+    with tempfile.TemporaryDirectory() as dossier:
+        for n in (10000, 100000, 1000000):
+            if n > n_max:
+                break
+            for nom, fonction in methodes:
+                duree, pic = mesurer(fonction, n, dossier)
+                print(
+                    f"{n:>9,} triplets, {nom:>13} : {duree:6.2f} s, "
+                    f"pic {pic / 2**20:7.1f} Mio"
+                )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,64 @@
+"""
+Mesure le débit des recherches dans l'index de titres hors ligne (py.offline_linker)
+et la mémoire résidente du processus, sur un index synthétique.
+
+Usage : python -m benchmarks.bench_offline_linker [nombre_de_titres] [recherches]
+"""
+
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from py.offline_linker import OfflineTitleIndex, write_index
+
+DBR = "http://dbpedia.org/resource/"
+
+
+def memoire_residente():
+    """Mémoire résidente actuelle du processus, en Mio (pic si /proc est absent)."""
+    try:
+        with open("/proc/self/status") as f:
+            for ligne in f:
+                if ligne.startswith("VmRSS:"):
+                    return int(ligne.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(n_titres=1000000, n_recherches=200000):
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "titles.idx")
+        debut = time.perf_counter()
+        write_index(
+            chemin,
+            {f"entity {i}": (f"{DBR}Entity_{i}", False) for i in range(n_titres)},
+        )
+        print(
+            f"Construction : {n_titres:,} titres en {time.perf_counter() - debut:.1f} s, "
+            f"{os.path.getsize(chemin) / 2**20:.1f} Mio sur disque"
+        )
+
+        avant = memoire_residente()
+        index = OfflineTitleIndex(chemin)
+        hasard = random.Random(0)
+        # Une recherche sur dix porte sur un titre absent
+        formes = [
+            f"Entity {hasard.randrange(n_titres * 11 // 10)}"
+            for _ in range(n_recherches)
+        ]
+        debut = time.perf_counter()
+        trouves = sum(index(forme)[1] is not None for forme in formes)
+        duree = time.perf_counter() - debut
+        print(f"Recherches : {n_recherches / duree:,.0f} /s ({trouves:,} trouvées)")
+        print(
+            f"Mémoire résidente : {avant:.1f} Mio avant ouverture, "
+            f"{memoire_residente():.1f} Mio après les recherches"
+        )
+        index.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
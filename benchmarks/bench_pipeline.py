@@ -0,0 +1,51 @@
+"""
+Compare l'exécution séquentielle de App.main_with_coref_resolution (une étape après
+l'autre, un document après l'autre) au pipeline asynchrone (py.pipeline), sur le vrai
+modèle REBEL et les vrais services réseau.
+
+Usage : python -m benchmarks.bench_pipeline [nombre_de_documents]
+"""
+
+import sys
+import time
+from py.knowledge_graph_extractor import KnowledgeGraphExtractor
+from py.pipeline import DocumentPipeline, build_graph
+
+DOCUMENTS = [
+    "Paris is the capital of France. The Eiffel Tower is located in Paris.",
+    "Barack Obama was born in Hawaii. He was the 44th president of the United States.",
+    "Bill Gates founded Microsoft with Paul Allen in 1975.",
+    "Napoleon Bonaparte was a French military leader born in Ajaccio in 1769.",
+]
+
+
+def main(n_documents=16):
+    # Des textes distincts, pour que les caches ne faussent pas la comparaison
+    textes = [
+        f"{DOCUMENTS[i % len(DOCUMENTS)]} This is document {i}."
+        for i in range(n_documents)
+    ]
+    kge = KnowledgeGraphExtractor()
+    kge.extract_triplet(DOCUMENTS[0])
+
+    debut = time.perf_counter()
+    for texte in textes[: n_documents // 2]:
+        triplets = kge.extract_triplet(texte)
+        build_graph(kge.enrichir_graph(kge.transform_to_rdf_triplet(triplets)))
+    duree = time.perf_counter() - debut
+    print(f"Séquentiel : {n_documents // 2 / duree:.2f} docs/s")
+
+    pipeline = DocumentPipeline(kge)
+    pipeline.process(textes[n_documents // 2 :])
+    metriques = pipeline.metrics()
+    print(f"Pipeline   : {metriques['docs_per_sec']:.2f} docs/s")
+    for etape, resume in metriques["stages"].items():
+        print(
+            f"{etape:>11} : {resume['busy_seconds']:.2f} s de travail, "
+            f"file moyenne {resume['mean_queue_depth']:.1f} "
+            f"(max {resume['max_queue_depth']}), {resume['errors']} erreur(s)"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,82 @@
+"""
+Compare la construction du graphe RDF triplet par triplet (normalisation répétée puis
+`Graph.add`) au chemin groupé de RDFGrapher (termes internés puis `Graph.addN`),
+en temps et en pic de mémoire (tracemalloc), sur 10k, 100k et 1M triplets.
+
+Usage : python -m benchmarks.bench_rdf_grapher [nombre_max_de_triplets]
+"""
+
+import sys
+import time
+import tracemalloc
+from rdflib import Graph, Literal, Namespace
+from py.rdf_grapher import RDFGrapher
+
+EX = Namespace("http://example.org/")
+DB = Namespace("http://dbpedia.org/resource/")
+RELATIONS = ["country", "place of birth", "instance of", "part of", "inception"]
+
+
+def triplets_synthetiques(n):
+    # Environ n / 10 entités distinctes, comme dans un corpus où les entités se répètent
+    n_entites = max(1, n // 10)
+    for i in range(n):
+        tour = i // n_entites
+        sujet = f"http://dbpedia.org/resource/Entity_{i % n_entites}"
+        if tour % 3 == 0:
+            objet = f"{1900 + i % 120}"
+        else:
+            objet = f"http://example.org/Thing_{(i * 7 + tour) % n_entites}"
+        yield sujet, RELATIONS[tour % len(RELATIONS)], objet
+
+
+def par_triplet(triplets):
+    """Le chemin d'origine : chaque élément est normalisé et converti à chaque triplet."""
+    graphe = Graph()
+    for sujet, predicat, objet in triplets:
+        termes = []
+        for element in (sujet, objet):
+            element = element.replace(" ", "_").replace("'", "").strip()
+            if "http://" in element:
+                espace = DB if "http://dbpedia.org" in element else EX
+                termes.append(espace[element.split("/")[-1]])
+            else:
+                termes.append(Literal(element))
+        segment = predicat.split("/")[-1].replace(" ", "_").replace("'", "")
+        espace = DB if "http://dbpedia.org" in predicat else EX
+        graphe.add((termes[0], espace[segment], termes[1]))
+    return graphe
+
+
+def groupe(triplets):
+    return RDFGrapher().add_triplets(triplets)
+
+
+def mesurer(fonction, triplets):
+    debut = time.perf_counter()
+    graphe = fonction(triplets)
+    duree = time.perf_counter() - debut
+    taille = len(graphe)
+    del graphe
+    tracemalloc.start()
+    fonction(triplets)
+    pic = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duree, pic, taille
+
+
+def main(n_max=1000000):
+    for n in (10000, 100000, 1000000):
+        if n > n_max:
+            break
+        triplets = list(triplets_synthetiques(n))
+        for nom, fonction in (("par triplet", par_triplet), ("groupé", groupe)):
+            duree, pic, taille = mesurer(fonction, triplets)
+            print(
+                f"{n:>9,} triplets, {nom:>11} : {duree:6.2f} s, "
+                f"pic {pic / 2**20:7.1f} Mio, {taille:,} triplets dans le graphe"
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
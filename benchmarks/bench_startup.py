@@ -0,0 +1,91 @@
+"""
+Mesure, pour chaque point d'entrée, le temps d'import et la mémoire résidente (RSS) du
+processus juste après l'import, dans un interpréteur neuf à chaque mesure, et liste les
+dépendances lourdes chargées au passage.
+
+Usage : python -m benchmarks.bench_startup [nombre_de_mesures]
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+ENTRY_POINTS = (
+    "py.knowledge_graph_extractor",
+    "py.rdf_grapher",
+    "py.gpt_coref_resolver",
+    "py.pipeline",
+    "py.enrichment",
+    "py.entity_linker",
+    "py.local_dbpedia",
+    "py.offline_linker",
+    "py.ntriples_sink",
+    "py.graph_store",
+    "py.graph_renderer",
+    "App",
+)
+
+# Dépendances dont l'import coûte cher et qui ne devraient être chargées qu'à l'usage
+HEAVY_MODULES = (
+    "spacy",
+    "transformers",
+    "torch",
+    "langchain_openai",
+    "langchain_core",
+    "dotenv",
+    "IPython",
+    "pydotplus",
+    "wikipedia",
+    "SPARQLWrapper",
+    "pyvis",
+)
+
+MESURE = """
+import json, resource, sys, time
+avant = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+debut = time.perf_counter()
+import {module}
+duree = time.perf_counter() - debut
+print(json.dumps({{
+    "seconds": duree,
+    "rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "rss_delta_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - avant,
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def mesurer(module):
+    resultat = subprocess.run(
+        [sys.executable, "-c", MESURE.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+    )
+    if resultat.returncode != 0:
+        return None, resultat.stderr.strip().splitlines()[-1]
+    return json.loads(resultat.stdout), None
+
+
+def main(n_mesures=5):
+    for module in ENTRY_POINTS:
+        mesures = []
+        for _ in range(n_mesures):
+            mesure, erreur = mesurer(module)
+            if erreur is not None:
+                print(f"{module:<30} : import impossible ({erreur})")
+                break
+            mesures.append(mesure)
+        else:
+            secondes = statistics.median(m["seconds"] for m in mesures)
+            rss = statistics.median(m["rss_kib"] for m in mesures)
+            delta = statistics.median(m["rss_delta_kib"] for m in mesures)
+            lourdes = ", ".join(mesures[0]["heavy"]) or "aucune"
+            print(
+                f"{module:<30} : {secondes * 1e3:7.1f} ms, RSS {rss / 1024:6.1f} Mio "
+                f"(+{delta / 1024:5.1f} Mio), dépendances lourdes : {lourdes}"
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,70 @@
+"""
+Mesure le débit de classification des queues de triplets REBEL : l'ancien test
+(`dateutil.parser.parse` sur chaque chaîne, analysée deux fois pour une date) contre
+`classify_literal` (filtres rapides puis cache LRU), à froid et à chaud.
+
+Usage : python -m benchmarks.bench_term_classifier [nombre_de_queues]
+"""
+
+import sys
+import time
+from dateutil.parser import parse
+from py.rdf_grapher import classify_literal
+
+# Queues typiques de REBEL : surtout des entités, quelques dates et nombres
+QUEUES = [
+    "France",
+    "French",
+    "Paris-Saclay University",
+    "department of Yvelines",
+    "university",
+    "military leader",
+    "19,000 students",
+    "752 people",
+    "1991",
+    "October 28, 1955",
+    "15 August 1769",
+    "May 2002",
+    "1,389",
+    "Academy of Versailles",
+    "United States",
+    "Microsoft",
+    "chemist",
+    "Nobel Prize in Physics",
+]
+
+
+def ancien_is_literal(element):
+    try:
+        parse(element)
+    except (ValueError, OverflowError):
+        return "http://" not in element
+    parse(element).strftime("%Y-%m-%d")
+    return True
+
+
+def main(n_queues=200000):
+    # Une partie des queues se répète, comme sur un corpus réel
+    queues = [
+        QUEUES[i % len(QUEUES)] if i % 4 else f"{QUEUES[i % len(QUEUES)]} {i}"
+        for i in range(n_queues)
+    ]
+
+    debut = time.perf_counter()
+    for queue in queues:
+        ancien_is_literal(queue)
+    print(
+        f"dateutil à chaque fois : {n_queues / (time.perf_counter() - debut):,.0f} /s"
+    )
+
+    classify_literal.cache_clear()
+    for nom in ("classify_literal à froid", "classify_literal à chaud"):
+        debut = time.perf_counter()
+        for queue in queues:
+            classify_literal(queue)
+        print(f"{nom} : {n_queues / (time.perf_counter() - debut):,.0f} /s")
+    print(classify_literal.cache_info())
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
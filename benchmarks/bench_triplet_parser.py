@@ -0,0 +1,47 @@
+"""
+Compare le décodage des sorties REBEL : texte complet (batch_decode + extract_triplets)
+contre le parseur sur les identifiants de tokens (extract_triplets_from_ids).
+
+Usage : python -m benchmarks.bench_triplet_parser [nombre_de_sorties] [répétitions]
+"""
+
+import sys
+import timeit
+from transformers import AutoTokenizer
+from modules.spacy_component import extract_triplets, extract_triplets_from_ids
+
+SORTIES = [
+    "<triplet> Paris <subj> France <obj> capital of",
+    "<triplet> Napoleon Bonaparte <subj> Ajaccio <obj> place of birth <subj> French "
+    "<obj> country of citizenship <triplet> Ajaccio <subj> France <obj> country",
+    "<triplet> University of Versailles Saint-Quentin-en-Yvelines <subj> 1991 "
+    "<obj> inception <subj> Paris-Saclay University <obj> parent organization",
+]
+
+
+def main(n_sorties=1000, repetitions=5):
+    tokenizer = AutoTokenizer.from_pretrained("Babelscape/rebel-large")
+    marker_ids = tokenizer.convert_tokens_to_ids(["<triplet>", "<subj>", "<obj>"])
+    skip_ids = set(tokenizer.convert_tokens_to_ids(["<s>", "<pad>", "</s>"]))
+    ids = tokenizer([SORTIES[i % len(SORTIES)] for i in range(n_sorties)])["input_ids"]
+
+    def par_texte():
+        return [extract_triplets(text) for text in tokenizer.batch_decode(ids)]
+
+    def par_identifiants():
+        return [
+            extract_triplets_from_ids(token_ids, tokenizer.decode, marker_ids, skip_ids)
+            for token_ids in ids
+        ]
+
+    identiques = [
+        [record._asdict() for record in records] for records in par_identifiants()
+    ] == par_texte()
+    for nom, fonction in (("texte", par_texte), ("identifiants", par_identifiants)):
+        duree = min(timeit.repeat(fonction, number=1, repeat=repetitions))
+        print(f"{nom:>12} : {n_sorties / duree:,.0f} sorties/s")
+    print(f"Triplets identiques : {identiques}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
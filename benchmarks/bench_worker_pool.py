@@ -0,0 +1,41 @@
+"""
+Mesure le passage à l'échelle du pool de workers REBEL avec 1, 2, 4 et 8 processus.
+Chaque worker charge son propre modèle (spawn) avant les documents de préchauffage.
+
+Usage : python -m benchmarks.bench_worker_pool [nombre_de_documents]
+"""
+
+import sys
+import time
+from py.knowledge_graph_extractor import KnowledgeGraphExtractor
+
+DOCUMENTS = [
+    "Paris is the capital of France. The Eiffel Tower is located in Paris.",
+    "Barack Obama was born in Hawaii. He was the 44th president of the United States.",
+    "Bill Gates founded Microsoft with Paul Allen in 1975.",
+    "Napoleon Bonaparte was a French military leader born in Ajaccio in 1769.",
+]
+
+
+def main(n_documents=32):
+    textes = [DOCUMENTS[i % len(DOCUMENTS)] for i in range(n_documents)]
+    kge = KnowledgeGraphExtractor()
+    reference = None
+    for n_workers in (1, 2, 4, 8):
+        with kge.worker_pool(n_workers) as pool:
+            # Quelques documents servent de préchauffage avant la mesure
+            list(pool.imap(textes[:n_workers]))
+            debut = time.perf_counter()
+            for _ in pool.imap(textes):
+                pass
+            duree = time.perf_counter() - debut
+        if reference is None:
+            reference = duree
+        print(
+            f"{n_workers} worker(s) : {n_documents / duree:.2f} docs/s, "
+            f"accélération x{reference / duree:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
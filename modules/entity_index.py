@@ -0,0 +1,166 @@
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+
+    return char.isalnum() or char == "_"
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """
+    Tells whether there is a word boundary (as the regex `\\b`) at `index` in `text`.
+
+    :param text: the text
+    :type text: str
+    :param index: a position between two characters of the text
+    :type index: int
+    :return: True if exactly one of the characters around `index` is a word character.
+    """
+
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+
+    return before != after
+
+
+class AhoCorasick:
+    """
+    An Aho–Corasick automaton: finds every occurrence of a set of patterns in a single pass over a text.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+
+        for pattern in set(patterns):
+
+            if pattern:
+
+                self._add(pattern)
+
+        self._build_failure_links()
+
+    def _add(self, pattern: str):
+
+        state = 0
+
+        for char in pattern:
+
+            if char not in self._goto[state]:
+
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = len(self._goto) - 1
+
+            state = self._goto[state][char]
+
+        self._output[state].append(pattern)
+
+    def _build_failure_links(self):
+
+        queue = deque(self._goto[0].values())
+
+        while queue:
+
+            state = queue.popleft()
+
+            for char, child in self._goto[state].items():
+
+                queue.append(child)
+                fallback = self._fail[state]
+
+                while fallback and char not in self._goto[fallback]:
+
+                    fallback = self._fail[fallback]
+
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = (
+                    self._output[child] + self._output[self._fail[child]]
+                )
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Yields every occurrence of every pattern in the text, overlapping ones included.
+
+        :param text: the text to search
+        :type text: str
+        :return: An iterator of (start index, pattern) pairs, ordered by end index.
+        """
+
+        state = 0
+
+        for index, char in enumerate(text):
+
+            while state and char not in self._goto[state]:
+
+                state = self._fail[state]
+
+            state = self._goto[state].get(char, 0)
+
+            for pattern in self._output[state]:
+
+                yield index + 1 - len(pattern), pattern
+
+
+class EntitySpanIndex:
+    """
+    The positions of all the heads and tails of a document, found in one pass over its text.
+
+    `find` mirrors the previous per-triplet search (a whole-word match first, then any substring),
+    but prefers the occurrences that lie inside the sentence the triplet was generated from.
+    """
+
+    def __init__(self, text: str, patterns: Iterable[str]):
+
+        self.occurrences: Dict[str, List[Tuple[int, bool]]] = {}
+
+        for start, pattern in AhoCorasick(patterns).iter_matches(text):
+
+            whole_word = _is_boundary(text, start) and _is_boundary(
+                text, start + len(pattern)
+            )
+            self.occurrences.setdefault(pattern, []).append((start, whole_word))
+
+        for occurrences in self.occurrences.values():
+
+            occurrences.sort()
+
+    def find(self, pattern: str, sent_start: int = 0, sent_end: int = -1) -> int:
+        """
+        Finds the best occurrence of a pattern, in this order of preference:
+        a whole-word match inside the sentence, any match inside the sentence,
+        the first whole-word match of the document, the first match of the document.
+
+        :param pattern: the lowercased head or tail
+        :type pattern: str
+        :param sent_start: the character index where the sentence starts
+        :type sent_start: int
+        :param sent_end: the character index where the sentence ends, -1 for no sentence
+        :type sent_end: int
+        :return: The start index of the occurrence, or -1 if the pattern does not occur.
+        """
+
+        occurrences = self.occurrences.get(pattern, [])
+        in_sentence = [
+            (start, whole_word)
+            for start, whole_word in occurrences
+            if sent_start <= start and start + len(pattern) <= sent_end
+        ]
+
+        for candidates in (in_sentence, occurrences):
+
+            for start, whole_word in candidates:
+
+                if whole_word:
+
+                    return start
+
+            if candidates:
+
+                return candidates[0][0]
+
+        return -1
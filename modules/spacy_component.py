@@ -1,8 +1,19 @@
 from spacy import Language, util
 from spacy.tokens import Doc, Span
-from transformers import pipeline
-from typing import List
-import re
+from typing import Callable, Collection, List, NamedTuple, Optional, Sequence
+from modules.entity_index import EntitySpanIndex
+from modules.triplet_cache import TripletCache, normalize_sentence
+import json
+
+
+class Triplet(NamedTuple):
+    """
+    A triplet extracted by REBEL: the head entity, the relation type and the tail entity.
+    """
+
+    head: str
+    type: str
+    tail: str
 
 
 def extract_triplets(text: str) -> List[str]:
@@ -88,6 +99,226 @@ def extract_triplets(text: str) -> List[str]:
     return triplets
 
 
+def bucket_by_length(lengths: List[int], batch_size: int) -> List[List[int]]:
+    """
+    Groups sentence indices into generation batches of similar length.
+    The indices are sorted by token length and cut into consecutive batches of `batch_size`,
+    so that each batch is padded to the length of sentences close to its own.
+
+    :param lengths: the token length of each sentence
+    :type lengths: List[int]
+    :param batch_size: the number of sentences per generation batch
+    :type batch_size: int
+    :return: A list of batches, each batch being a list of indices into `lengths`.
+    """
+
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+
+    return [order[i : i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def padded_token_count(lengths: List[int], batches: List[List[int]]) -> int:
+    """
+    Counts the padding tokens added when every batch is padded to its longest sentence.
+
+    :param lengths: the token length of each sentence
+    :type lengths: List[int]
+    :param batches: the generation batches, as lists of indices into `lengths`
+    :type batches: List[List[int]]
+    :return: The number of padding tokens.
+    """
+
+    padding = 0
+
+    for batch in batches:
+
+        batch_lengths = [lengths[i] for i in batch]
+        padding += max(batch_lengths) * len(batch) - sum(batch_lengths)
+
+    return padding
+
+
+BACKENDS = ("torch", "onnx", "int8")
+
+
+def load_triplet_extractor(
+    model_name: str,
+    device: int,
+    backend: str = "torch",
+    model_path: Optional[str] = None,
+):
+    """
+    Builds the `text2text-generation` pipeline used to generate the linearized triplets.
+
+    - "torch" loads the full-precision model, on CPU or GPU.
+    - "int8" loads the model on CPU and quantizes its linear layers to int8 with PyTorch
+      dynamic quantization.
+    - "onnx" runs the model with ONNX Runtime on CPU. `model_path` points to a model already
+      exported with `optimum-cli export onnx`; without it the model is exported on load.
+
+    :param model_name: the name of the model on the Hugging Face hub
+    :type model_name: str
+    :param device: the GPU number, -1 for the CPU
+    :type device: int
+    :param backend: one of "torch", "onnx" or "int8"
+    :type backend: str
+    :param model_path: a local directory to load the model from instead of `model_name`
+    :type model_path: Optional[str]
+    :return: A transformers pipeline.
+    """
+
+    # transformers is only imported when a model is actually loaded
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+
+    if backend not in BACKENDS:
+
+        raise ValueError(
+            f"Unknown backend {backend!r}, expected one of {', '.join(BACKENDS)}."
+        )
+
+    if backend != "torch" and device != -1:
+
+        raise ValueError(f"The {backend} backend only runs on CPU (device=-1).")
+
+    path = model_path or model_name
+
+    if backend == "torch":
+
+        return pipeline(
+            "text2text-generation",
+            model=path,
+            tokenizer=path,
+            device=device,
+        )
+
+    if backend == "int8":
+
+        import torch
+
+        model = torch.quantization.quantize_dynamic(
+            AutoModelForSeq2SeqLM.from_pretrained(path),
+            {torch.nn.Linear},
+            dtype=torch.qint8,
+        )
+
+    else:
+
+        try:
+
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+        except ImportError as error:
+
+            raise ImportError(
+                "The onnx backend requires optimum with ONNX Runtime: "
+                "pip install optimum[onnxruntime]"
+            ) from error
+
+        model = ORTModelForSeq2SeqLM.from_pretrained(path, export=model_path is None)
+
+    return pipeline(
+        "text2text-generation",
+        model=model,
+        tokenizer=AutoTokenizer.from_pretrained(path),
+        device=device,
+    )
+
+
+def extract_triplets_from_ids(
+    token_ids: Sequence[int],
+    decode: Callable[[List[int]], str],
+    marker_ids: Sequence[int],
+    skip_ids: Collection[int],
+) -> List[Triplet]:
+    """
+    parses the generated token ids to triplets, without decoding the whole sequence to text.
+    It follows the same rules as `extract_triplets`, but works on the ids of the
+    <triplet>, <subj> and <obj> tokens and only decodes the id slices between them,
+    each slice at most once.
+
+    :param token_ids: the ids generated by the model for one sentence
+    :type token_ids: Sequence[int]
+    :param decode: turns a list of token ids into text, e.g. `tokenizer.decode`
+    :type decode: Callable[[List[int]], str]
+    :param marker_ids: the ids of the <triplet>, <subj> and <obj> tokens
+    :type marker_ids: Sequence[int]
+    :param skip_ids: the ids to drop before parsing (<s>, <pad>, </s>)
+    :type skip_ids: Collection[int]
+    :return: A list of Triplet records.
+    """
+
+    triplet_id, subj_id, obj_id = marker_ids
+    ids = [token_id for token_id in token_ids if token_id not in skip_ids]
+    decoded = {}
+
+    def text(bounds):
+
+        if bounds not in decoded:
+
+            decoded[bounds] = " ".join(decode(ids[bounds[0] : bounds[1]]).split())
+
+        return decoded[bounds]
+
+    triplets = []
+    empty = (0, 0)
+    subject, relation, object_ = empty, empty, empty
+    current = "x"
+    start = 0
+
+    # A last None marker closes the final slice
+    for position, token_id in enumerate(ids + [None]):
+
+        if token_id not in (triplet_id, subj_id, obj_id, None):
+
+            continue
+
+        if current == "t":
+
+            subject = (start, position)
+
+        elif current == "s":
+
+            object_ = (start, position)
+
+        elif current == "o":
+
+            relation = (start, position)
+
+        start = position + 1
+
+        if token_id == triplet_id:
+
+            current = "t"
+
+            if text(relation) != "":
+
+                triplets.append(Triplet(text(subject), text(relation), text(object_)))
+                relation = empty
+
+            subject = empty
+
+        elif token_id == subj_id:
+
+            current = "s"
+
+            if text(relation) != "":
+
+                triplets.append(Triplet(text(subject), text(relation), text(object_)))
+
+            object_ = empty
+
+        elif token_id == obj_id:
+
+            current = "o"
+            relation = empty
+
+    if text(subject) != "" and text(relation) != "" and text(object_) != "":
+
+        triplets.append(Triplet(text(subject), text(relation), text(object_)))
+
+    return triplets
+
+
 @Language.factory(
     "rebel",
     requires=["doc.sents"],
@@ -95,6 +326,12 @@ def extract_triplets(text: str) -> List[str]:
     default_config={
         "model_name": "Babelscape/rebel-large",
         "device": 0,
+        "backend": "torch",
+        "model_path": None,
+        "batch_size": 8,
+        "sort_by_length": True,
+        "cache_path": None,
+        "cache_max_entries": 100000,
     },
 )
 class RebelComponent:
@@ -105,30 +342,58 @@ class RebelComponent:
         name,
         model_name: str,
         device: int,
+        backend: str,
+        model_path: Optional[str],
+        batch_size: int,
+        sort_by_length: bool,
+        cache_path: Optional[str],
+        cache_max_entries: int,
     ):
 
         assert model_name is not None, ""
 
-        self.triplet_extractor = pipeline(
-            "text2text-generation",
-            model=model_name,
-            tokenizer=model_name,
-            device=device,
+        self.batch_size = batch_size
+        self.sort_by_length = sort_by_length
+
+        self.triplet_extractor = load_triplet_extractor(
+            model_name, device, backend, model_path
+        )
+
+        tokenizer = self.triplet_extractor.tokenizer
+        self.marker_ids = tokenizer.convert_tokens_to_ids(
+            ["<triplet>", "<subj>", "<obj>"]
         )
+        self.skip_ids = set(tokenizer.convert_tokens_to_ids(["<s>", "<pad>", "</s>"]))
+
+        # Sentences already seen (same model and generation settings) are answered from the cache
+        self.cache = None
+
+        if cache_path is not None:
+
+            namespace = json.dumps(
+                {
+                    "model_name": model_name,
+                    "backend": backend,
+                    "record": "Triplet",
+                    "generation_config": self.triplet_extractor.model.generation_config.to_dict(),
+                },
+                sort_keys=True,
+                default=str,
+            )
+            self.cache = TripletCache(cache_path, namespace, cache_max_entries)
 
         # Register custom extension on the Doc
         if not Doc.has_extension("rel"):
 
             Doc.set_extension("rel", default={})
 
-    def _generate_triplets(self, sents: List[Span]) -> List[List[dict]]:
+    def _generate_triplets(self, sents: List[Span]) -> List[List[Triplet]]:
         """
         1. We pass the text of the sentence to the triplet extractor.
         2. The triplet extractor returns a list of dictionaries.
         3. We extract the token ids from the dictionaries.
-        4. We decode the token ids into text.
-        5. We extract the triplets from the text.
-        6. We return the triplets.
+        4. We extract the triplets from the token ids (see `extract_triplets_from_ids`).
+        5. We return the triplets.
 
         The triplet extractor is a model that takes a sentence as input and returns a list of dictionaries.
         Each dictionary contains the token ids of the extracted triplets.
@@ -136,74 +401,161 @@ class RebelComponent:
         The token ids are the numbers that represent the words in the sentence.
         For example, the token id of the word "the" is 2.
 
-        The token ids are decoded into text using the tokenizer.
+        Only the token ids between the <triplet>, <subj> and <obj> markers are decoded into text using the tokenizer.
         The tokenizer is a model that takes a list of token ids as input and returns a list of words.
 
+        The result holds one list of triplets per sentence, in the order of `sents`,
+        so that callers batching several documents can give each document back its own triplets.
+
+        Sentences found in the cache (when `cache_path` is set) are not sent to the model,
+        and a sentence repeated within `sents` is generated only once.
+        The other sentences are sent to the model in batches of `batch_size`. When `sort_by_length` is set,
+        the batches are built from sentences of similar token length (see `bucket_by_length`),
+        which keeps padding low, and the triplets are put back in the original sentence order.
+
         :param sents: List[Span]
         :type sents: List[Span]
-        :return: A list of lists of dicts.
+        :return: A list of lists of Triplet records.
         """
 
-        output_ids = self.triplet_extractor(
-            [sent.text for sent in sents], return_tensors=True, return_text=False
-        )  # [0]["generated_token_ids"]
-        extracted_texts = self.triplet_extractor.tokenizer.batch_decode(
-            [out["generated_token_ids"] for out in output_ids]
-        )
-        extracted_triplets = []
+        texts = [sent.text for sent in sents]
+        extracted_triplets = [None] * len(texts)
+
+        if self.cache is not None:
+
+            cached = self.cache.get_many(texts)
+
+            for i, text in enumerate(texts):
+
+                if text in cached:
+
+                    extracted_triplets[i] = [
+                        Triplet(*triplet) for triplet in cached[text]
+                    ]
+
+        # Sentences repeated inside the batch are generated once
+        pending = {}
+
+        for i, text in enumerate(texts):
+
+            if extracted_triplets[i] is None:
+
+                pending.setdefault(normalize_sentence(text), []).append(i)
+
+        to_generate = [indices[0] for indices in pending.values()]
+
+        if not to_generate:
+
+            return extracted_triplets
+
+        if self.sort_by_length:
 
-        for text in extracted_texts:
+            lengths = [
+                len(ids)
+                for ids in self.triplet_extractor.tokenizer(
+                    [texts[i] for i in to_generate]
+                )["input_ids"]
+            ]
+            batches = [
+                [to_generate[j] for j in batch]
+                for batch in bucket_by_length(lengths, self.batch_size)
+            ]
 
-            extracted_triplets.extend(extract_triplets(text))
+        else:
+
+            batches = [
+                to_generate[j : j + self.batch_size]
+                for j in range(0, len(to_generate), self.batch_size)
+            ]
+
+        for batch in batches:
+
+            output_ids = self.triplet_extractor(
+                [texts[i] for i in batch],
+                batch_size=len(batch),
+                return_tensors=True,
+                return_text=False,
+            )  # [0]["generated_token_ids"]
+
+            for i, out in zip(batch, output_ids):
+
+                token_ids = out["generated_token_ids"]
+                extracted_triplets[i] = extract_triplets_from_ids(
+                    token_ids.tolist() if hasattr(token_ids, "tolist") else token_ids,
+                    self.triplet_extractor.tokenizer.decode,
+                    self.marker_ids,
+                    self.skip_ids,
+                )
+
+        for indices in pending.values():
+
+            for i in indices[1:]:
+
+                extracted_triplets[i] = extracted_triplets[indices[0]]
+
+        if self.cache is not None:
+
+            self.cache.put_many({texts[i]: extracted_triplets[i] for i in to_generate})
 
         return extracted_triplets
 
-    def set_annotations(self, doc: Doc, triplets: List[dict]):
+    def set_annotations(self, doc: Doc, sentence_triplets: List[List[Triplet]]):
         """
-        The function takes a spacy Doc object and a list of triplets (dictionaries) as input.
+        The function takes a spacy Doc object and the triplets (Triplet records) of each of its sentences as input.
         For each triplet, it finds the substring in the Doc object that matches the head and tail of the triplet.
         It then creates a spacy span object for each of the head and tail.
         Finally, it creates a dictionary of the relation type, head span and tail span and adds it to the Doc object
 
+        All heads and tails are located in a single pass over the text (see `EntitySpanIndex`),
+        and an occurrence inside the sentence that produced the triplet is preferred.
+
         :param doc: the spacy Doc object
         :type doc: Doc
-        :param triplets: List[dict]
-        :type triplets: List[dict]
+        :param sentence_triplets: the triplets of each sentence, in the order of `doc.sents`
+        :type sentence_triplets: List[List[Triplet]]
         """
 
         text = doc.text.lower()
 
-        for triplet in triplets:
+        # The extension default is shared by every Doc, each doc gets its own dict
+        doc._.rel = {}
+
+        index = EntitySpanIndex(
+            text,
+            [
+                entity.lower()
+                for triplets in sentence_triplets
+                for triplet in triplets
+                for entity in (triplet.head, triplet.tail)
+            ],
+        )
+
+        for sent, triplet in (
+            (sent, triplet)
+            for sent, triplets in zip(doc.sents, sentence_triplets)
+            for triplet in triplets
+        ):
 
-            if triplet["head"] == triplet["tail"]:
+            if triplet.head == triplet.tail:
 
                 continue
 
-            head_match = re.search(
-                r"\b" + re.escape(triplet["head"].lower()) + r"\b", text
+            head_index = index.find(
+                triplet.head.lower(), sent.start_char, sent.end_char
             )
-            if head_match:
-                head_index = head_match.start()
-            else:
-                head_index = text.find(triplet["head"].lower())
-
-            tail_match = re.search(
-                r"\b" + re.escape(triplet["tail"].lower()) + r"\b", text
+            tail_index = index.find(
+                triplet.tail.lower(), sent.start_char, sent.end_char
             )
-            if tail_match:
-                tail_index = tail_match.start()
-            else:
-                tail_index = text.find(triplet["tail"].lower())
 
             if (head_index == -1) or (tail_index == -1):
 
                 continue
 
             head_span = doc.char_span(
-                head_index, head_index + len(triplet["head"]), alignment_mode="expand"
+                head_index, head_index + len(triplet.head), alignment_mode="expand"
             )
             tail_span = doc.char_span(
-                tail_index, tail_index + len(triplet["tail"]), alignment_mode="expand"
+                tail_index, tail_index + len(triplet.tail), alignment_mode="expand"
             )
 
             try:
@@ -217,7 +569,7 @@ class RebelComponent:
             if offset not in doc._.rel:
 
                 doc._.rel[offset] = {
-                    "relation": triplet["type"],
+                    "relation": triplet.type,
                     "head_span": head_span,
                     "tail_span": tail_span,
                 }
@@ -231,7 +583,7 @@ class RebelComponent:
         :return: A Doc object with the sentence triplets added as annotations.
         """
 
-        sentence_triplets = self._generate_triplets(doc.sents)
+        sentence_triplets = self._generate_triplets(list(doc.sents))
         self.set_annotations(doc, sentence_triplets)
 
         return doc
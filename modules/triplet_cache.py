@@ -0,0 +1,153 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Dict, List
+
+
+def normalize_sentence(text: str) -> str:
+    """
+    Normalizes a sentence before it is used as a cache key:
+    surrounding whitespace is removed and inner whitespace runs are collapsed to one space.
+
+    :param text: the sentence
+    :type text: str
+    :return: The normalized sentence.
+    """
+
+    return " ".join(text.split())
+
+
+class TripletCache:
+    """
+    A persistent, content-addressed cache of the triplets extracted from single sentences.
+
+    Entries are stored in a SQLite file and keyed on a hash of the namespace
+    (model name and generation settings) and of the normalized sentence.
+    Once the cache holds more than `max_entries` sentences, the least recently used ones are evicted.
+    """
+
+    def __init__(self, path: str, namespace: str, max_entries: int = 100000):
+
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS triplets ("
+            "key TEXT PRIMARY KEY, triplets TEXT NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS triplets_last_used ON triplets (last_used)"
+        )
+        self._connection.commit()
+        self._clock, self._size = self._connection.execute(
+            "SELECT COALESCE(MAX(last_used), 0), COUNT(*) FROM triplets"
+        ).fetchone()
+
+    def key(self, sentence: str) -> str:
+        """
+        Computes the cache key of a sentence.
+
+        :param sentence: the sentence text
+        :type sentence: str
+        :return: The hexadecimal digest identifying the sentence in this namespace.
+        """
+
+        content = self.namespace + "\0" + normalize_sentence(sentence)
+
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get_many(self, sentences: List[str]) -> Dict[str, list]:
+        """
+        Looks up several sentences at once and marks the found entries as recently used.
+
+        :param sentences: the sentences to look up
+        :type sentences: List[str]
+        :return: A dictionary from each cached sentence to its triplets.
+        """
+
+        sentence_keys = [self.key(sentence) for sentence in sentences]
+        key_list = list(set(sentence_keys))
+        rows = []
+
+        with self._lock:
+
+            # SQLite limits the number of bound parameters of a single statement
+            for i in range(0, len(key_list), 500):
+
+                chunk = key_list[i : i + 500]
+                rows += self._connection.execute(
+                    "SELECT key, triplets FROM triplets WHERE key IN (%s)"
+                    % ",".join("?" * len(chunk)),
+                    chunk,
+                ).fetchall()
+
+            self._clock += 1
+            self._connection.executemany(
+                "UPDATE triplets SET last_used = ? WHERE key = ?",
+                [(self._clock, key) for key, _ in rows],
+            )
+            self._connection.commit()
+
+        cached = {key: json.loads(triplets) for key, triplets in rows}
+        found = {
+            sentence: cached[key]
+            for sentence, key in zip(sentences, sentence_keys)
+            if key in cached
+        }
+        self.hits += sum(1 for key in sentence_keys if key in cached)
+        self.misses += sum(1 for key in sentence_keys if key not in cached)
+
+        return found
+
+    def put_many(self, entries: Dict[str, list]):
+        """
+        Stores the triplets of several sentences, then evicts the least recently used entries
+        if the cache grew beyond `max_entries`.
+
+        :param entries: a dictionary from sentence to its triplets
+        :type entries: Dict[str, list]
+        """
+
+        if not entries:
+
+            return
+
+        with self._lock:
+
+            self._clock += 1
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO triplets (key, triplets, last_used) VALUES (?, ?, ?)",
+                [
+                    (self.key(sentence), json.dumps(triplets), self._clock)
+                    for sentence, triplets in entries.items()
+                ],
+            )
+            self._size = self._connection.execute(
+                "SELECT COUNT(*) FROM triplets"
+            ).fetchone()[0]
+
+            if self._size > self.max_entries:
+
+                self._connection.execute(
+                    "DELETE FROM triplets WHERE key IN "
+                    "(SELECT key FROM triplets ORDER BY last_used LIMIT ?)",
+                    (self._size - self.max_entries,),
+                )
+                self._size = self.max_entries
+
+            self._connection.commit()
+
+    def __len__(self) -> int:
+
+        return self._size
+
+    def close(self):
+        """
+        Closes the underlying SQLite connection.
+        """
+
+        self._connection.close()
@@ -0,0 +1,190 @@
+"""
+Ce module fournit des backends locaux de résolution des co-références, utilisables à la place
+du modèle de langage distant derrière `coreference_resolver(text, backend=...)` :
+
+- "spacy" : règles sur les entités nommées de Spacy, sur CPU, dans le processus ;
+- "allennlp" : le modèle neuronal SpanBERT d'AllenNLP, chargé seulement s'il est demandé.
+
+Chaque backend offre `resolve(text)` et `resolve_many(texts)`, comme `CorefResolver`.
+"""
+
+# Pronoms remplacés par la dernière personne citée, et leur forme possessive
+PRONOMS_PERSONNE = {"he", "him", "she", "his", "hers", "himself", "herself"}
+PRONOMS_CHOSE = {"it", "its", "itself"}
+POSSESSIFS = {"his", "hers", "its"}
+
+# Entités qui peuvent être désignées par "it"
+LABELS_CHOSE = {"ORG", "GPE", "LOC", "FAC", "PRODUCT", "WORK_OF_ART", "EVENT", "LAW"}
+
+ALLENNLP_MODEL = (
+    "https://storage.googleapis.com/allennlp-public-models/"
+    "coref-spanbert-large-2021.03.10.tar.gz"
+)
+
+
+class SpacyCorefResolver:
+    """
+    Résolution des co-références par règles, à partir des entités nommées de Spacy.
+
+    Les pronoms de personne ("he", "she", "his"...) sont remplacés par la dernière entité
+    PERSON qui les précède, et "it"/"its" par la dernière organisation ou le dernier lieu,
+    à condition que l'entité soit citée dans la même phrase ou dans les `max_distance`
+    phrases précédentes. "her", possessif ou complément, est distingué par son étiquette
+    morphosyntaxique. Les documents sont analysés par lots avec `nlp.pipe`.
+    """
+
+    def __init__(self, nlp=None, max_distance=2, batch_size=32):
+        """
+        Args:
+            nlp (Language, optional): Le pipeline Spacy, qui doit reconnaître les entités ;
+                                      en_core_web_sm sans analyseur syntaxique si None.
+            max_distance (int): Nombre maximal de phrases entre l'entité et le pronom.
+            batch_size (int): Nombre de documents par lot dans `resolve_many`.
+        """
+        if nlp is None:
+            import spacy
+
+            nlp = spacy.load("en_core_web_sm", disable=["parser", "lemmatizer"])
+            if "senter" in nlp.disabled:
+                nlp.enable_pipe("senter")
+        self.nlp = nlp
+        self.max_distance = max_distance
+        self.batch_size = batch_size
+
+    def __sentence_index(self, doc):
+        """L'indice de phrase de chaque token, 0 partout sans segmentation."""
+        if not doc.has_annotation("SENT_START"):
+            return [0] * len(doc)
+        indices = []
+        phrase = -1
+        for token in doc:
+            if token.is_sent_start or phrase < 0:
+                phrase += 1
+            indices.append(phrase)
+        return indices
+
+    def resolve_doc(self, doc):
+        """
+        Réécrit un document analysé en remplaçant ses pronoms par leur antécédent.
+
+        Args:
+            doc (Doc): Le document analysé par Spacy.
+
+        Returns:
+            str: Le texte avec les co-références résolues.
+        """
+        phrases = self.__sentence_index(doc)
+        entites = {ent.start: ent for ent in doc.ents}
+        dans_entite = {i for ent in doc.ents for i in range(ent.start, ent.end)}
+        personne = chose = None
+        morceaux = []
+        i = 0
+        while i < len(doc):
+            if i in entites:
+                ent = entites[i]
+                if ent.label_ == "PERSON":
+                    personne = ent
+                elif ent.label_ in LABELS_CHOSE:
+                    chose = ent
+                morceaux.append(ent.text_with_ws)
+                i = ent.end
+                continue
+
+            token = doc[i]
+            mot = token.lower_
+            antecedent = None
+            if mot in PRONOMS_PERSONNE or mot == "her":
+                antecedent = personne
+            elif mot in PRONOMS_CHOSE:
+                antecedent = chose
+            if (
+                antecedent is not None
+                and i not in dans_entite
+                and phrases[i] - phrases[antecedent.start] <= self.max_distance
+            ):
+                possessif = mot in POSSESSIFS or (mot == "her" and token.tag_ == "PRP$")
+                morceaux.append(
+                    antecedent.text + ("'s" if possessif else "") + token.whitespace_
+                )
+            else:
+                morceaux.append(token.text_with_ws)
+            i += 1
+        return "".join(morceaux)
+
+    def resolve_many(self, texts):
+        """
+        Résout les co-références de plusieurs textes, analysés par lots.
+
+        Args:
+            texts (Iterable[str]): Les textes d'entrée.
+
+        Returns:
+            List[str]: Les textes avec les co-références résolues, dans l'ordre d'entrée.
+        """
+        return [
+            self.resolve_doc(doc)
+            for doc in self.nlp.pipe(texts, batch_size=self.batch_size)
+        ]
+
+    def resolve(self, text):
+        """
+        Résout les co-références dans le texte donné.
+
+        Args:
+            text (str): Le texte d'entrée.
+
+        Returns:
+            str: Le texte avec les co-références résolues.
+        """
+        return self.resolve_many([text])[0]
+
+    __call__ = resolve
+
+
+class AllenNlpCorefResolver:
+    """
+    Résolution des co-références avec le modèle SpanBERT d'AllenNLP.
+
+    `allennlp` et `allennlp_models` ne sont importés qu'à la création du résolveur :
+    ils restent optionnels pour les autres backends.
+    """
+
+    def __init__(self, model_path=ALLENNLP_MODEL, cuda_device=-1):
+        """
+        Args:
+            model_path (str): L'archive du modèle, locale ou distante.
+            cuda_device (int): -1 pour le CPU, sinon le numéro du GPU.
+
+        Raises:
+            ImportError: Si allennlp ou allennlp_models n'est pas installé.
+        """
+        from allennlp.predictors.predictor import Predictor
+        import allennlp_models.coref  # noqa: F401 (enregistre le prédicteur)
+
+        self.predictor = Predictor.from_path(model_path, cuda_device=cuda_device)
+
+    def resolve(self, text):
+        """
+        Résout les co-références dans le texte donné.
+
+        Args:
+            text (str): Le texte d'entrée.
+
+        Returns:
+            str: Le texte avec les co-références résolues.
+        """
+        return self.predictor.coref_resolved(text)
+
+    def resolve_many(self, texts):
+        """
+        Résout les co-références de plusieurs textes.
+
+        Args:
+            texts (Iterable[str]): Les textes d'entrée.
+
+        Returns:
+            List[str]: Les textes avec les co-références résolues, dans l'ordre d'entrée.
+        """
+        return [self.resolve(text) for text in texts]
+
+    __call__ = resolve
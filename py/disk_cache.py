@@ -0,0 +1,111 @@
+"""
+Ce module fournit la classe DiskCache, un petit cache clé/valeur persistant sur disque
+(SQLite) dont les entrées expirent après une durée de vie donnée.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+
+class DiskCache:
+    """
+    Cache persistant de valeurs JSON, partageable entre threads.
+
+    Chaque entrée garde sa date d'expiration : une entrée expirée est considérée
+    comme absente et sera remplacée à la prochaine écriture.
+    """
+
+    def __init__(self, path, table="cache"):
+        """
+        Args:
+            path (str): Le fichier SQLite du cache.
+            table (str): La table utilisée, pour ranger plusieurs caches dans un même fichier.
+        """
+        self.table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        self._connection.commit()
+
+    def get(self, key, default=None):
+        """Lit une entrée du cache.
+
+        Args:
+            key (str): La clé de l'entrée.
+            default: La valeur rendue si l'entrée est absente ou expirée.
+
+        Returns:
+            La valeur stockée, ou `default`.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return default
+        return json.loads(row[0])
+
+    def get_many(self, keys):
+        """Lit plusieurs entrées du cache en une seule requête par lot de clés.
+
+        Args:
+            keys (Iterable[str]): Les clés à lire.
+
+        Returns:
+            dict: Les valeurs des entrées présentes et non expirées, par clé.
+        """
+        keys = list(set(keys))
+        maintenant = time.time()
+        rows = []
+        with self._lock:
+            # SQLite limite le nombre de paramètres d'une même requête
+            for i in range(0, len(keys), 500):
+                lot = keys[i : i + 500]
+                rows += self._connection.execute(
+                    f"SELECT key, value, expires_at FROM {self.table} "
+                    f"WHERE key IN ({','.join('?' * len(lot))})",
+                    lot,
+                ).fetchall()
+        return {
+            key: json.loads(value)
+            for key, value, expires_at in rows
+            if expires_at is None or expires_at >= maintenant
+        }
+
+    def set(self, key, value, ttl=None):
+        """Écrit une entrée dans le cache.
+
+        Args:
+            key (str): La clé de l'entrée.
+            value: Une valeur sérialisable en JSON.
+            ttl (float, optional): Durée de vie en secondes ; l'entrée n'expire pas si None.
+        """
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, entries, ttl=None):
+        """Écrit plusieurs entrées dans le cache en une seule transaction.
+
+        Args:
+            entries (dict): Les valeurs, sérialisables en JSON, par clé.
+            ttl (float, optional): Durée de vie en secondes ; les entrées n'expirent pas si None.
+        """
+        expires_at = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                [
+                    (key, json.dumps(value), expires_at)
+                    for key, value in entries.items()
+                ],
+            )
+            self._connection.commit()
+
+    def close(self):
+        """Ferme la connexion SQLite."""
+        self._connection.close()
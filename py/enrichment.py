@@ -0,0 +1,304 @@
+"""
+Ce module fournit la classe DBpediaEnricher pour enrichir des triplets RDF à partir de DBpedia
+en regroupant les requêtes d'un document dans quelques requêtes par lots.
+
+Les requêtes passent par un backend interchangeable : `SparqlBackend` interroge un point
+d'accès SPARQL (blocs VALUES), `py.local_dbpedia.LocalDBpediaStore` répond hors ligne
+à partir d'un dump DBpedia indexé sur disque.
+"""
+
+import re
+import threading
+from py.disk_cache import DiskCache
+from py.http_client import HttpClient
+
+DBPEDIA_RESOURCE = "http://dbpedia.org/resource/"
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+
+# Caractères interdits dans une IRI SPARQL : une seule IRI invalide ferait échouer tout un lot
+IRI_INTERDITE = re.compile(r'[<>"{}|^`\\\s]')
+
+
+def check_is_dbpedia(resource):
+    """Vérifie si une ressource est une URI de DBpedia.
+
+    Args:
+        resource (str): L'URI à vérifier.
+
+    Returns:
+        bool: True si l'URI appartient à DBpedia, sinon False.
+    """
+    return DBPEDIA_RESOURCE in resource
+
+
+class SparqlBackend:
+    """
+    Backend d'enrichissement qui interroge un point d'accès SPARQL.
+
+    Un backend répond aux deux questions de l'enrichissement, pour un lot à la fois :
+    `predicates` (les prédicats reliant des paires de ressources) et `types`
+    (les rdf:type de ressources).
+    """
+
+    def __init__(self, endpoint="http://dbpedia.org/sparql", client=None):
+        """
+        Args:
+            endpoint (str): L'adresse du point d'accès SPARQL.
+            client (HttpClient, optional): Le client HTTP partagé ; un client propre
+                                           à ce backend si None.
+        """
+        self.endpoint = endpoint
+        self.client = client if client is not None else HttpClient()
+
+    def __select(self, query):
+        """Exécute une requête SELECT (POST, protocole SPARQL) et renvoie ses résultats.
+
+        Args:
+            query (str): La requête SPARQL.
+
+        Returns:
+            List[dict]: Les lignes de résultat ("bindings").
+        """
+        response = self.client.post(
+            self.endpoint,
+            data={"query": query},
+            headers={"Accept": "application/sparql-results+json"},
+        )
+        return response.json()["results"]["bindings"]
+
+    def predicates(self, pairs):
+        """Récupère, en une requête, les prédicats reliant chaque paire de ressources.
+
+        Args:
+            pairs (List[Tuple[str, str]]): Les paires (URI sujet, URI objet).
+
+        Returns:
+            dict: La liste des prédicats trouvés pour chaque paire (sujet, objet).
+        """
+        valeurs = " ".join(f"(<{sujet}> <{objet}>)" for sujet, objet in pairs)
+        resultats = self.__select(
+            f"""
+            SELECT DISTINCT ?s ?o ?predicate
+            WHERE {{
+                VALUES (?s ?o) {{ {valeurs} }}
+                ?s ?predicate ?o .
+            }}
+            """
+        )
+        predicats = {}
+        for result in resultats:
+            paire = (result["s"]["value"], result["o"]["value"])
+            predicats.setdefault(paire, []).append(result["predicate"]["value"])
+        return predicats
+
+    def types(self, uris):
+        """Récupère, en une requête, les types (rdf:type) de chaque ressource.
+
+        Args:
+            uris (List[str]): Les URIs des ressources.
+
+        Returns:
+            dict: La liste des types trouvés pour chaque URI.
+        """
+        valeurs = " ".join(f"<{uri}>" for uri in uris)
+        resultats = self.__select(
+            f"""
+            SELECT ?r ?type
+            WHERE {{
+                VALUES ?r {{ {valeurs} }}
+                ?r <{RDF_TYPE}> ?type .
+            }}
+            """
+        )
+        types = {}
+        for result in resultats:
+            types.setdefault(result["r"]["value"], []).append(result["type"]["value"])
+        return types
+
+
+class DBpediaEnricher:
+    """
+    Enrichit les triplets d'un document avec les prédicats DBpedia reliant leurs ressources
+    et les types (rdf:type) de ces ressources.
+
+    Toutes les paires (sujet, objet) et toutes les ressources distinctes du document sont
+    collectées, puis soumises au backend par lots de `chunk_size` au lieu d'une requête
+    par triplet.
+
+    Les types de chaque ressource sont gardés en mémoire pour la durée de vie de l'enrichisseur,
+    et optionnellement sur disque : une ressource n'est interrogée qu'une seule fois.
+
+    Un même enrichisseur peut servir à plusieurs threads (voir py.pipeline).
+    """
+
+    def __init__(
+        self,
+        endpoint="http://dbpedia.org/sparql",
+        chunk_size=50,
+        type_cache_path=None,
+        type_cache_ttl=7 * 24 * 3600,
+        backend=None,
+        client=None,
+    ):
+        """
+        Args:
+            endpoint (str): L'adresse du point d'accès SPARQL.
+            chunk_size (int): Nombre de paires ou de ressources par requête.
+            type_cache_path (str, optional): Fichier SQLite où garder les types d'une
+                                             exécution à l'autre ; aucun si None.
+            type_cache_ttl (float): Durée de vie, en secondes, des types gardés sur disque.
+            backend (optional): Le backend interrogé, par exemple un `LocalDBpediaStore` ;
+                                un `SparqlBackend` sur `endpoint` si None.
+            client (HttpClient, optional): Le client HTTP du `SparqlBackend` par défaut.
+        """
+        self.endpoint = endpoint
+        self.backend = (
+            backend if backend is not None else SparqlBackend(endpoint, client)
+        )
+        self.chunk_size = chunk_size
+        self.type_cache_ttl = type_cache_ttl
+        self.type_cache = (
+            DiskCache(type_cache_path, "types") if type_cache_path else None
+        )
+        self.type_memo = {}
+        self.stats = {"type_lookups": 0, "type_fetched": 0, "type_queries": 0}
+        # Protège type_memo et stats ; les requêtes se font hors du verrou
+        self._lock = threading.Lock()
+
+    def __chunks(self, elements):
+        """Découpe une liste en lots de `chunk_size` éléments.
+
+        Args:
+            elements (list): Les éléments à découper.
+
+        Yields:
+            list: Les lots successifs.
+        """
+        for i in range(0, len(elements), self.chunk_size):
+            yield elements[i : i + self.chunk_size]
+
+    def predicates_for_pairs(self, pairs):
+        """Récupère les prédicats DBpedia reliant chaque paire de ressources.
+
+        Un lot en erreur est signalé puis ignoré : ses paires n'ont aucun prédicat,
+        comme dans `KnowledgeGraphExtractor.get_predicate_sparql`.
+
+        Args:
+            pairs (Iterable[Tuple[str, str]]): Les paires (URI sujet, URI objet).
+
+        Returns:
+            dict: La liste des prédicats trouvés pour chaque paire (sujet, objet).
+        """
+        pairs = [
+            pair
+            for pair in dict.fromkeys(pairs)
+            if not any(IRI_INTERDITE.search(uri) for uri in pair)
+        ]
+        predicats = {}
+        for lot in self.__chunks(pairs):
+            try:
+                predicats.update(self.backend.predicates(lot))
+            except Exception as e:
+                print(f"Une erreur est survenue: {e}")
+        return predicats
+
+    def types_for_resources(self, uris):
+        """Récupère les types (rdf:type) de chaque ressource.
+
+        Seules les ressources absentes des caches (mémoire puis disque) sont interrogées ;
+        leurs types, même vides, sont ensuite mis en cache.
+
+        Args:
+            uris (Iterable[str]): Les URIs des ressources.
+
+        Returns:
+            dict: La liste des types trouvés pour chaque URI.
+        """
+        demandes = list(uris)
+        uris = list(dict.fromkeys(demandes))
+        with self._lock:
+            types = {uri: self.type_memo[uri] for uri in uris if uri in self.type_memo}
+        manquantes = [uri for uri in uris if uri not in types]
+        if self.type_cache is not None and manquantes:
+            sur_disque = self.type_cache.get_many(manquantes)
+            with self._lock:
+                self.type_memo.update(sur_disque)
+            types.update(sur_disque)
+            manquantes = [uri for uri in manquantes if uri not in sur_disque]
+
+        recuperes = {uri: [] for uri in manquantes if not IRI_INTERDITE.search(uri)}
+        requetes = 0
+        for lot in self.__chunks(list(recuperes)):
+            recuperes.update(self.backend.types(lot))
+            requetes += 1
+
+        if self.type_cache is not None and recuperes:
+            self.type_cache.set_many(recuperes, self.type_cache_ttl)
+        types.update(recuperes)
+        with self._lock:
+            self.type_memo.update(recuperes)
+            self.stats["type_queries"] += requetes
+            self.stats["type_lookups"] += len(demandes)
+            self.stats["type_fetched"] += len(recuperes)
+        return types
+
+    @property
+    def type_lookups_saved(self):
+        """Nombre de recherches de types évitées grâce aux caches et au dédoublonnage.
+
+        Returns:
+            int: Les recherches demandées moins les ressources réellement interrogées.
+        """
+        with self._lock:
+            return self.stats["type_lookups"] - self.stats["type_fetched"]
+
+    def enrich(self, triplet_list):
+        """Enrichit les triplets RDF avec des prédicats et types à partir de DBpedia.
+
+        Le résultat suit les règles des requêtes triplet par triplet : pour chaque
+        triplet, les prédicats DBpedia entre ses ressources suivis du triplet d'origine,
+        puis au plus 10 types par ressource DBpedia. Les types d'une ressource ne sont
+        émis qu'à sa première apparition dans le document.
+
+        Args:
+            triplet_list (List[Tuple]): Liste de triplets à enrichir.
+
+        Returns:
+            List[Tuple]: Liste de triplets enrichis.
+        """
+        predicats = self.predicates_for_pairs(
+            (a_tuple[0], a_tuple[2])
+            for a_tuple in triplet_list
+            if check_is_dbpedia(a_tuple[0]) and check_is_dbpedia(a_tuple[2])
+        )
+        types = self.types_for_resources(
+            uri
+            for a_tuple in triplet_list
+            for uri in (a_tuple[0], a_tuple[2])
+            if check_is_dbpedia(uri)
+        )
+
+        list_modified = []
+        deja_types = set()
+
+        def types_de(uri):
+            if uri in deja_types:
+                return []
+            deja_types.add(uri)
+            return [(uri, RDF_TYPE, value) for value in types.get(uri, [])[:10]]
+
+        for a_tuple in triplet_list:
+            uri_0, old_predicate, uri_1 = a_tuple[0], a_tuple[1], a_tuple[2]
+            if check_is_dbpedia(uri_0) and check_is_dbpedia(uri_1):
+                list_modified.extend(
+                    (uri_0, value, uri_1) for value in predicats.get((uri_0, uri_1), [])
+                )
+                list_modified.append((uri_0, old_predicate, uri_1))
+            if check_is_dbpedia(uri_0):
+                list_modified.extend(types_de(uri_0))
+            if check_is_dbpedia(uri_1):
+                list_modified.extend(types_de(uri_1))
+            else:
+                list_modified.append(tuple(a_tuple))
+
+        return list_modified
@@ -0,0 +1,270 @@
+"""
+Ce module fournit la classe EntityLinker pour relier une entité textuelle à sa ressource
+DBpedia, en gardant les résultats en mémoire et sur disque d'une exécution à l'autre.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import threading
+import time
+from py.disk_cache import DiskCache
+from py.http_client import HttpClient
+
+DBPEDIA_RESOURCE = "http://dbpedia.org/resource/"
+
+# Issues possibles d'une résolution
+FOUND = "found"
+MISSING = "missing"
+DISAMBIGUATION = "disambiguation"
+
+
+def wikipedia_resolver(candidate_entity):
+    """Cherche la page Wikipedia d'une entité sans télécharger son contenu.
+
+    `wikipedia.page(..., preload=False)` ne fait qu'une requête (titre, URL) : le résumé
+    et le contenu de la page ne sont jamais demandés.
+
+    Args:
+        candidate_entity (str): L'entité à relier.
+
+    Returns:
+        Tuple[str, str]: L'issue (FOUND, MISSING ou DISAMBIGUATION) et l'URI DBpedia
+                         si la page a été trouvée, sinon None.
+
+    Raises:
+        Exception: Les erreurs réseau sont propagées pour ne pas être mises en cache.
+    """
+    import wikipedia
+
+    try:
+        page = wikipedia.page(candidate_entity, auto_suggest=False, preload=False)
+    except wikipedia.exceptions.DisambiguationError:
+        return DISAMBIGUATION, None
+    except wikipedia.exceptions.PageError:
+        return MISSING, None
+    return FOUND, DBPEDIA_RESOURCE + page.url.split("/")[-1]
+
+
+class RateLimiter:
+    """
+    Limite le nombre de requêtes par seconde envoyées à chaque hôte, tous threads confondus.
+    """
+
+    def __init__(self, max_per_second=10.0):
+        """
+        Args:
+            max_per_second (float): Nombre maximal de requêtes par seconde et par hôte.
+        """
+        self.interval = 1.0 / max_per_second
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        """Bloque jusqu'au prochain créneau libre pour cet hôte.
+
+        Args:
+            host (str): L'hôte interrogé.
+        """
+        with self._lock:
+            maintenant = time.monotonic()
+            creneau = max(maintenant, self._next_slot.get(host, maintenant))
+            self._next_slot[host] = creneau + self.interval
+        time.sleep(max(0.0, creneau - maintenant))
+
+
+class WikipediaApiResolver:
+    """
+    Résolveur qui interroge directement l'API MediaWiki, avec un délai maximal par requête
+    et une limite de débit par hôte. Il fait la même requête que `wikipedia.page`
+    (titre, URL, homonymie) sans jamais demander le contenu de la page.
+
+    Les requêtes passent par un `HttpClient` dont les connexions restent ouvertes.
+    """
+
+    def __init__(
+        self,
+        api_url="https://en.wikipedia.org/w/api.php",
+        timeout=5.0,
+        rate_limiter=None,
+        client=None,
+    ):
+        """
+        Args:
+            api_url (str): L'adresse de l'API MediaWiki.
+            timeout (float): Délai maximal, en secondes, d'une requête.
+            rate_limiter (RateLimiter, optional): Limiteur de débit partagé ; un limiteur
+                                                  à 10 requêtes par seconde si None.
+            client (HttpClient, optional): Le client HTTP partagé ; si None, un client propre
+                                           sans nouvelles tentatives, laissées à `EntityLinker`.
+        """
+        self.api_url = api_url
+        self.host = urlparse(api_url).netloc
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.client = client if client is not None else HttpClient(retries=0)
+
+    def __call__(self, candidate_entity):
+        """Résout une entité, sur le modèle de `wikipedia_resolver`.
+
+        Args:
+            candidate_entity (str): L'entité à relier.
+
+        Returns:
+            Tuple[str, str]: L'issue et l'URI DBpedia si la page a été trouvée, sinon None.
+
+        Raises:
+            requests.RequestException: En cas d'erreur réseau, de délai dépassé ou de statut HTTP d'erreur.
+            CircuitOpenError: Si le disjoncteur du point d'accès est ouvert.
+        """
+        self.rate_limiter.wait(self.host)
+        response = self.client.get(
+            self.api_url,
+            params={
+                "action": "query",
+                "format": "json",
+                "prop": "info|pageprops",
+                "inprop": "url",
+                "ppprop": "disambiguation",
+                "redirects": "",
+                "titles": candidate_entity,
+            },
+            timeout=self.timeout,
+        )
+        pages = response.json().get("query", {}).get("pages", {})
+        for page in pages.values():
+            if "missing" in page or "invalid" in page:
+                return MISSING, None
+            if "disambiguation" in page.get("pageprops", {}):
+                return DISAMBIGUATION, None
+            return FOUND, DBPEDIA_RESOURCE + page["fullurl"].split("/")[-1]
+        return MISSING, None
+
+
+class EntityLinker:
+    """
+    Relie des entités à des URIs DBpedia à travers deux niveaux de cache :
+    un dictionnaire en mémoire pour le processus et un cache SQLite optionnel.
+
+    Les échecs définitifs (page absente, page d'homonymie) sont aussi mis en cache,
+    avec leur propre durée de vie ; les erreurs passagères (réseau) ne le sont pas.
+    """
+
+    def __init__(
+        self,
+        resolver=wikipedia_resolver,
+        cache_path=None,
+        ttl=30 * 24 * 3600,
+        negative_ttl=7 * 24 * 3600,
+        max_workers=8,
+        retries=2,
+        backoff=0.5,
+    ):
+        """
+        Args:
+            resolver (Callable[[str], Tuple[str, str]]): Fonction qui résout une entité,
+                                                         sur le modèle de `wikipedia_resolver`.
+            cache_path (str, optional): Fichier SQLite du cache persistant ; aucun si None.
+            ttl (float): Durée de vie, en secondes, d'une entité trouvée.
+            negative_ttl (float): Durée de vie, en secondes, d'une absence ou d'une homonymie.
+            max_workers (int): Nombre maximal de résolutions simultanées dans `resolve_many`.
+            retries (int): Nombre de nouvelles tentatives après une erreur passagère.
+            backoff (float): Attente, en secondes, avant la première nouvelle tentative ;
+                             elle double à chaque tentative.
+        """
+        self.resolver = resolver
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = DiskCache(cache_path, "entities") if cache_path else None
+        self.memo = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "memo_hits": 0,
+            "disk_hits": 0,
+            "lookups": 0,
+            "retries": 0,
+            "errors": 0,
+        }
+
+    def resolve(self, candidate_entity):
+        """Donne l'URI DBpedia d'une entité ; une entité déjà résolue n'est pas redemandée.
+
+        Une erreur passagère du résolveur est retentée `retries` fois, avec une attente
+        qui double à chaque tentative.
+
+        Args:
+            candidate_entity (str): L'entité à relier.
+
+        Returns:
+            str: L'URI DBpedia de l'entité, ou None si elle n'a pas pu être reliée.
+        """
+        with self._lock:
+            if candidate_entity in self.memo:
+                self.stats["memo_hits"] += 1
+                return self.memo[candidate_entity]
+
+        if self.cache is not None:
+            entry = self.cache.get(candidate_entity)
+            if entry is not None:
+                return self.__remember(candidate_entity, entry["uri"], "disk_hits")
+
+        for tentative in range(self.retries + 1):
+            try:
+                status, uri = self.resolver(candidate_entity)
+                break
+            except Exception as e:
+                if tentative == self.retries:
+                    print(f"Une erreur est survenue pour {candidate_entity!r} : {e}")
+                    self.__count("errors")
+                    return None
+                self.__count("retries")
+                time.sleep(self.backoff * 2**tentative)
+
+        if self.cache is not None:
+            self.cache.set(
+                candidate_entity,
+                {"status": status, "uri": uri},
+                self.ttl if status == FOUND else self.negative_ttl,
+            )
+        return self.__remember(candidate_entity, uri, "lookups")
+
+    def resolve_many(self, candidate_entities):
+        """Résout plusieurs entités en parallèle, au plus `max_workers` à la fois.
+
+        Args:
+            candidate_entities (Iterable[str]): Les entités à relier.
+
+        Returns:
+            dict: L'URI DBpedia de chaque entité, ou None si elle n'a pas pu être reliée.
+        """
+        candidate_entities = list(dict.fromkeys(candidate_entities))
+        if len(candidate_entities) <= 1 or self.max_workers <= 1:
+            return {entite: self.resolve(entite) for entite in candidate_entities}
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(candidate_entities))
+        ) as executor:
+            return dict(
+                zip(candidate_entities, executor.map(self.resolve, candidate_entities))
+            )
+
+    def __remember(self, candidate_entity, uri, compteur):
+        """Garde une résolution définitive en mémoire et met à jour les statistiques.
+
+        Args:
+            candidate_entity (str): L'entité résolue.
+            uri (str): Son URI, ou None.
+            compteur (str): La statistique à incrémenter.
+
+        Returns:
+            str: L'URI, ou None.
+        """
+        with self._lock:
+            self.memo[candidate_entity] = uri
+            self.stats[compteur] += 1
+        return uri
+
+    def __count(self, compteur):
+        with self._lock:
+            self.stats[compteur] += 1
@@ -0,0 +1,293 @@
+"""
+Ce module fournit une fonction pour résoudre les co-références dans un texte donné en utilisant
+un modèle de langage (GPT-4) via LangChain.
+
+La classe CorefResolver construit la chaîne LangChain une seule fois, découpe les longs textes
+en fenêtres de phrases résolues en parallèle et garde les résultats sur disque.
+"""
+
+import hashlib
+import re
+from py.disk_cache import DiskCache
+from py.model_registry import registry
+
+# À incrémenter à chaque modification du prompt : les résultats en cache sont alors ignorés
+PROMPT_VERSION = "2"
+
+# Modèle de prompt pour la résolution des co-références
+COREF_TEMPLATE = """
+    Réécrivez le texte suivant en résolvant les co-références :
+
+    Contexte (les phrases qui précèdent, à ne pas réécrire) : \"\"\"{context}\"\"\"
+
+    Texte : \"\"\"{text}\"\"\"
+
+    Remplacez chaque pronom ou expression référentielle dans le texte par l'entité clé correspondante
+    du dictionnaire pour assurer clarté et cohérence. Ne renvoyez que le texte réécrit.
+    """
+
+# Fin de phrase : ponctuation finale suivie d'espaces (séparateur gardé)
+FIN_DE_PHRASE = re.compile(r"(?<=[.!?])(\s+)")
+
+
+def split_sentences(text: str):
+    """
+    Découpe un texte en phrases, en gardant l'espace qui suit chacune.
+
+    Args:
+        text (str): Le texte à découper.
+
+    Returns:
+        List[Tuple[str, str]]: Les paires (phrase, séparateur qui la suit).
+    """
+    morceaux = FIN_DE_PHRASE.split(text)
+    morceaux.append("")
+    return [
+        (morceaux[i], morceaux[i + 1])
+        for i in range(0, len(morceaux) - 1, 2)
+        if morceaux[i]
+    ]
+
+
+def split_windows(text: str, max_chars: int = 4000, overlap_sentences: int = 2):
+    """
+    Découpe un texte en fenêtres de phrases entières d'au plus `max_chars` caractères
+    (une phrase plus longue forme sa propre fenêtre).
+
+    Args:
+        text (str): Le texte à découper.
+        max_chars (int): Taille maximale d'une fenêtre, en caractères.
+        overlap_sentences (int): Nombre de phrases précédentes données en contexte.
+
+    Returns:
+        List[Tuple[str, str, str]]: Pour chaque fenêtre, son contexte (les dernières phrases
+                                    de la fenêtre précédente), son texte et le séparateur
+                                    qui la suit dans le texte d'origine.
+    """
+    fenetres = []
+    phrases = []
+    taille = 0
+    for phrase, separateur in split_sentences(text):
+        if phrases and taille + len(phrase) > max_chars:
+            fenetres.append(phrases)
+            phrases, taille = [], 0
+        phrases.append((phrase, separateur))
+        taille += len(phrase) + len(separateur)
+    if phrases:
+        fenetres.append(phrases)
+
+    resultat = []
+    for i, phrases in enumerate(fenetres):
+        precedentes = (
+            fenetres[i - 1][-overlap_sentences:] if i and overlap_sentences else []
+        )
+        contexte = "".join(p + s for p, s in precedentes).strip()
+        texte = "".join(p + s for p, s in phrases)
+        resultat.append((contexte, texte.rstrip(), texte[len(texte.rstrip()) :]))
+    return resultat
+
+
+class CorefResolver:
+    """
+    Résout les co-références avec un modèle de langage, en réutilisant la même chaîne
+    (prompt + client) pour tous les appels.
+
+    Les longs textes sont découpés en fenêtres de phrases ; chaque fenêtre est envoyée avec
+    les dernières phrases de la précédente comme contexte, puis les fenêtres réécrites sont
+    recollées dans l'ordre. Les fenêtres sont résolues en parallèle, au plus
+    `max_concurrency` à la fois, et leurs résultats peuvent être gardés sur disque.
+    """
+
+    def __init__(
+        self,
+        model: str = "gpt-4o-mini",
+        temperature: float = 0,
+        max_chars: int = 4000,
+        overlap_sentences: int = 2,
+        max_concurrency: int = 4,
+        cache_path: str = None,
+        **llm_kwargs,
+    ):
+        """
+        Args:
+            model (str): Le modèle de langage utilisé.
+            temperature (float): La température du modèle.
+            max_chars (int): Taille maximale d'une fenêtre, en caractères.
+            overlap_sentences (int): Nombre de phrases précédentes données en contexte.
+            max_concurrency (int): Nombre maximal de requêtes simultanées.
+            cache_path (str, optional): Fichier SQLite du cache des résultats ; aucun si None.
+            **llm_kwargs: Paramètres supplémentaires de `ChatOpenAI` (base_url, api_key,
+                          timeout, max_retries...).
+        """
+        # LangChain et le fichier .env ne sont chargés qu'à la création du premier résolveur
+        from dotenv import load_dotenv
+        from langchain_openai import ChatOpenAI
+        from langchain_core.prompts import PromptTemplate
+
+        load_dotenv()
+
+        self.model = model
+        self.max_chars = max_chars
+        self.overlap_sentences = overlap_sentences
+        self.max_concurrency = max_concurrency
+        self.cache = DiskCache(cache_path, "coreferences") if cache_path else None
+
+        # Création d'une chaîne combinant le prompt et le modèle, une seule fois
+        prompt = PromptTemplate(
+            input_variables=["context", "text"], template=COREF_TEMPLATE
+        )
+        llm = ChatOpenAI(model=model, temperature=temperature, **llm_kwargs)
+        self.chain = prompt | llm
+
+    def __cache_key(self, context: str, text: str) -> str:
+        """Clé de cache d'une fenêtre : empreinte du modèle, du prompt et des textes."""
+        contenu = "\0".join((self.model, PROMPT_VERSION, context, text))
+        return hashlib.sha256(contenu.encode("utf-8")).hexdigest()
+
+    def resolve_many(self, texts):
+        """
+        Résout les co-références de plusieurs textes, toutes fenêtres confondues en parallèle.
+
+        Args:
+            texts (Iterable[str]): Les textes d'entrée.
+
+        Raises:
+            ValueError: Si un texte est vide ou ne contient que des espaces.
+            RuntimeError: Si l'appel au modèle de langage échoue.
+
+        Returns:
+            List[str]: Les textes avec les co-références résolues, dans l'ordre d'entrée.
+        """
+        decoupages = []
+        for text in texts:
+            if not text.strip():
+                raise ValueError("Le texte d'entrée ne peut pas être vide.")
+            decoupages.append(
+                split_windows(text.strip(), self.max_chars, self.overlap_sentences)
+            )
+
+        cles = {
+            self.__cache_key(contexte, texte): (contexte, texte)
+            for fenetres in decoupages
+            for contexte, texte, _ in fenetres
+        }
+        resolus = self.cache.get_many(cles) if self.cache is not None else {}
+        manquantes = [cle for cle in cles if cle not in resolus]
+        if manquantes:
+            entrees = [
+                {"context": cles[cle][0] or "aucun", "text": cles[cle][1]}
+                for cle in manquantes
+            ]
+            try:
+                reponses = self.chain.batch(
+                    entrees, config={"max_concurrency": self.max_concurrency}
+                )
+            except Exception as e:
+                raise RuntimeError(
+                    f"La résolution des co-références a échoué : {e}"
+                ) from e
+            nouveaux = {
+                cle: reponse.content.strip()
+                for cle, reponse in zip(manquantes, reponses)
+            }
+            if self.cache is not None:
+                self.cache.set_many(nouveaux)
+            resolus.update(nouveaux)
+
+        return [
+            "".join(
+                resolus[self.__cache_key(contexte, texte)] + separateur
+                for contexte, texte, separateur in fenetres
+            )
+            for fenetres in decoupages
+        ]
+
+    def resolve(self, text: str) -> str:
+        """
+        Résout les co-références dans le texte donné.
+
+        Args:
+            text (str): Le texte d'entrée dans lequel les co-références doivent être résolues.
+
+        Raises:
+            ValueError: Si le texte d'entrée est vide ou ne contient que des espaces.
+            RuntimeError: Si l'appel au modèle de langage échoue.
+
+        Returns:
+            str: Le texte modifié avec les co-références résolues.
+        """
+        return self.resolve_many([text])[0]
+
+    __call__ = resolve
+
+
+# Backends de résolution : le modèle de langage distant, ou un résolveur local (py.coref_backends)
+COREF_BACKENDS = ("llm", "spacy", "allennlp")
+
+
+def make_coref_backend(backend: str = "llm", **kwargs):
+    """
+    Crée un résolveur de co-références.
+
+    Args:
+        backend (str): "llm" (CorefResolver), "spacy" (règles sur les entités nommées)
+                       ou "allennlp" (modèle SpanBERT, si allennlp est installé).
+        **kwargs: Les paramètres du résolveur créé.
+
+    Raises:
+        ValueError: Si le backend est inconnu.
+
+    Returns:
+        Le résolveur, qui offre `resolve(text)` et `resolve_many(texts)`.
+    """
+    if backend == "llm":
+        return CorefResolver(**kwargs)
+    if backend == "spacy":
+        from py.coref_backends import SpacyCorefResolver
+
+        return SpacyCorefResolver(**kwargs)
+    if backend == "allennlp":
+        from py.coref_backends import AllenNlpCorefResolver
+
+        return AllenNlpCorefResolver(**kwargs)
+    raise ValueError(f"Backend inconnu : {backend!r}, choisir parmi {COREF_BACKENDS}.")
+
+
+def coreference_resolver(
+    text: str, backend: str = "llm", cache_path: str = None
+) -> str:
+    """
+    Résout les co-références dans le texte donné en utilisant un modèle de langage,
+    ou un backend local.
+
+    Le résolveur de chaque backend (et de chaque cache) est créé au premier appel puis
+    partagé par tout le processus (voir py.model_registry).
+
+    Args:
+        text (str): Le texte d'entrée dans lequel les co-références doivent être résolues.
+        backend (str): Le backend utilisé, voir `make_coref_backend`.
+        cache_path (str, optional): Fichier SQLite du cache des résolutions (backend "llm"
+                                    uniquement) ; aucun si None.
+
+    Raises:
+        ValueError: Si le texte d'entrée est vide, si le backend est inconnu ou s'il n'a
+                    pas de cache.
+        RuntimeError: Si l'appel au modèle de langage échoue.
+
+    Returns:
+        str: Le texte modifié avec les co-références résolues.
+    """
+    # Vérification que le texte n'est pas vide
+    if not text.strip():
+        raise ValueError("Le texte d'entrée ne peut pas être vide.")
+
+    if cache_path is None:
+        options = {}
+    elif backend == "llm":
+        options = {"cache_path": cache_path}
+    else:
+        raise ValueError(f"Le backend {backend!r} n'a pas de cache de résolutions.")
+    resolver = registry.get(
+        ("coref", backend, cache_path), lambda: make_coref_backend(backend, **options)
+    )
+    return resolver.resolve(text)
@@ -0,0 +1,266 @@
+"""
+Ce module fournit le rendu des graphes RDF : le DOT est produit en mémoire, le graphe est
+d'abord réduit à un nombre borné de nœuds (les plus connectés, ou le voisinage d'une entité),
+puis rendu en SVG ou PNG par Graphviz, ou en HTML interactif par pyvis.
+
+La classe GraphRenderer exécute les rendus dans un thread de fond, avec un délai maximal,
+pour que l'application ne reste pas bloquée sur un gros graphe.
+"""
+
+import heapq
+import io
+import shutil
+import subprocess
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from rdflib import Graph, Literal, URIRef
+from rdflib.tools.rdf2dot import rdf2dot
+
+FORMATS = ("dot", "svg", "png", "html")
+
+# Valeur par défaut de `max_nodes` dans GraphRenderer : None y signifie « tout le graphe »
+_DEFAUT = object()
+
+
+def sample_graph(g, max_nodes=150, focus=None, depth=2):
+    """
+    Réduit un graphe à au plus `max_nodes` nœuds (sujets et objets).
+
+    Sans entité focale, l'échantillon part du nœud de plus haut degré et s'étend le long de
+    ses arêtes, toujours vers le voisin de plus haut degré (à égalité, le premier dans l'ordre
+    alphabétique) : les nœuds gardés restent reliés entre eux. Avec une entité focale, son
+    voisinage (dans les deux sens) est parcouru en largeur jusqu'à `depth` arêtes.
+
+    Args:
+        g (Graph): Le graphe à réduire.
+        max_nodes (int, optional): Nombre maximal de nœuds gardés ; sans limite si None.
+        focus (str, optional): L'URI de l'entité au centre du sous-graphe.
+        depth (int): Distance maximale, en arêtes, à l'entité focale.
+
+    Returns:
+        Graph: Les triplets dont le sujet et l'objet sont gardés ; `g` lui-même s'il est
+               déjà assez petit.
+    """
+    if focus is None:
+        voisins = defaultdict(list)
+        for s, _, o in g:
+            voisins[s].append(o)
+            voisins[o].append(s)
+        if max_nodes is None or len(voisins) <= max_nodes:
+            return g
+
+        def priorite(noeud):
+            return (-len(voisins[noeud]), str(noeud))
+
+        graines = sorted(voisins, key=priorite)
+        gardes = set()
+        frontiere = []
+        while len(gardes) < max_nodes:
+            if not frontiere:
+                # Composante épuisée : on repart du nœud restant de plus haut degré
+                graine = next(noeud for noeud in graines if noeud not in gardes)
+                heapq.heappush(frontiere, (priorite(graine), graine))
+            _, noeud = heapq.heappop(frontiere)
+            if noeud in gardes:
+                continue
+            gardes.add(noeud)
+            for voisin in voisins[noeud]:
+                if voisin not in gardes:
+                    heapq.heappush(frontiere, (priorite(voisin), voisin))
+    else:
+        focus = URIRef(focus)
+        limite = float("inf") if max_nodes is None else max_nodes
+        gardes = {focus}
+        file = deque([(focus, 0)])
+        while file and len(gardes) < limite:
+            noeud, distance = file.popleft()
+            if distance == depth or isinstance(noeud, Literal):
+                continue
+            voisins = [o for _, _, o in g.triples((noeud, None, None))]
+            voisins += [s for s, _, _ in g.triples((None, None, noeud))]
+            for voisin in voisins:
+                if voisin not in gardes and len(gardes) < limite:
+                    gardes.add(voisin)
+                    file.append((voisin, distance + 1))
+
+    sous_graphe = Graph(namespace_manager=g.namespace_manager)
+    sous_graphe.addN(
+        (s, p, o, sous_graphe) for s, p, o in g if s in gardes and o in gardes
+    )
+    return sous_graphe
+
+
+def to_dot(g):
+    """
+    Écrit un graphe en DOT, en mémoire.
+
+    Args:
+        g (Graph): Le graphe.
+
+    Returns:
+        str: Le source DOT.
+    """
+    flux = io.StringIO()
+    rdf2dot(g, flux)
+    return flux.getvalue()
+
+
+def run_graphviz(dot, format="svg", timeout=30.0):
+    """
+    Rend un source DOT avec Graphviz ; le processus est arrêté au bout de `timeout` secondes.
+
+    Args:
+        dot (str): Le source DOT.
+        format (str): Le format de sortie de Graphviz ("svg", "png"...).
+        timeout (float): Délai maximal, en secondes.
+
+    Returns:
+        bytes: L'image rendue.
+
+    Raises:
+        RuntimeError: Si Graphviz n'est pas installé ou si le rendu échoue.
+        TimeoutError: Si le rendu dépasse le délai.
+    """
+    programme = shutil.which("dot")
+    if programme is None:
+        raise RuntimeError("Graphviz (la commande dot) n'est pas installé.")
+    try:
+        resultat = subprocess.run(
+            [programme, f"-T{format}"],
+            input=dot.encode("utf-8"),
+            capture_output=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired as e:
+        raise TimeoutError(f"Le rendu Graphviz a dépassé {timeout} s.") from e
+    if resultat.returncode != 0:
+        raise RuntimeError(
+            f"Le rendu Graphviz a échoué : {resultat.stderr.decode(errors='replace')}"
+        )
+    return resultat.stdout
+
+
+def _label(noeud):
+    """Le libellé court d'un nœud : le littéral, ou le dernier segment de l'URI."""
+    if isinstance(noeud, Literal):
+        return str(noeud)
+    return str(noeud).rstrip("/").split("/")[-1].split("#")[-1]
+
+
+def to_html(g, height="750px"):
+    """
+    Produit une page HTML interactive (pyvis) du graphe.
+
+    Args:
+        g (Graph): Le graphe.
+        height (str): La hauteur du graphe dans la page.
+
+    Returns:
+        str: La page HTML.
+
+    Raises:
+        ImportError: Si pyvis n'est pas installé.
+    """
+    from pyvis.network import Network
+
+    reseau = Network(height=height, width="100%", directed=True, cdn_resources="remote")
+    for s, p, o in g:
+        for noeud in (s, o):
+            reseau.add_node(
+                str(noeud),
+                label=_label(noeud),
+                title=str(noeud),
+                shape="box" if isinstance(noeud, Literal) else "dot",
+            )
+        reseau.add_edge(str(s), str(o), label=_label(p), title=str(p))
+    return reseau.generate_html()
+
+
+def render(g, format="svg", max_nodes=150, focus=None, depth=2, timeout=30.0):
+    """
+    Réduit puis rend un graphe.
+
+    Args:
+        g (Graph): Le graphe.
+        format (str): "dot", "svg", "png" ou "html".
+        max_nodes (int, optional): Nombre maximal de nœuds ; le graphe entier si None.
+        focus (str, optional): L'URI de l'entité au centre du sous-graphe.
+        depth (int): Distance maximale, en arêtes, à l'entité focale.
+        timeout (float): Délai maximal du rendu Graphviz, en secondes.
+
+    Returns:
+        Union[str, bytes]: Le DOT, le SVG ou le HTML en texte, le PNG en octets.
+
+    Raises:
+        ValueError: Si le format est inconnu.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Format inconnu : {format!r}, choisir parmi {FORMATS}.")
+    if max_nodes is not None or focus is not None:
+        g = sample_graph(g, max_nodes, focus, depth)
+    if format == "html":
+        return to_html(g)
+    dot = to_dot(g)
+    if format == "dot":
+        return dot
+    image = run_graphviz(dot, format, timeout)
+    return image.decode("utf-8") if format == "svg" else image
+
+
+class GraphRenderer:
+    """
+    Exécute les rendus dans un pool de threads de fond, chacun avec un délai maximal.
+    """
+
+    def __init__(self, max_nodes=150, timeout=30.0, max_workers=1):
+        """
+        Args:
+            max_nodes (int, optional): Nombre maximal de nœuds par défaut d'un rendu.
+            timeout (float): Délai maximal, en secondes, d'un rendu.
+            max_workers (int): Nombre de rendus exécutés en même temps.
+        """
+        self.max_nodes = max_nodes
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="graph-renderer"
+        )
+
+    def submit(self, g, format="svg", focus=None, depth=2, max_nodes=_DEFAUT):
+        """
+        Lance un rendu en arrière-plan (voir `render`).
+
+        `max_nodes` vaut par défaut celui du renderer ; None rend le graphe entier.
+
+        Returns:
+            Future: Le rendu à venir.
+        """
+        return self._executor.submit(
+            render,
+            g,
+            format,
+            self.max_nodes if max_nodes is _DEFAUT else max_nodes,
+            focus,
+            depth,
+            self.timeout,
+        )
+
+    def render(self, g, format="svg", focus=None, depth=2, max_nodes=_DEFAUT):
+        """
+        Rend un graphe en arrière-plan et attend le résultat au plus `timeout` secondes.
+
+        Returns:
+            Union[str, bytes]: Le rendu (voir `render`).
+
+        Raises:
+            TimeoutError: Si le rendu dépasse le délai.
+        """
+        future = self.submit(g, format, focus, depth, max_nodes)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError as e:
+            future.cancel()
+            raise TimeoutError(f"Le rendu a dépassé {self.timeout} s.") from e
+
+    def close(self):
+        """Arrête le pool de threads, sans attendre les rendus en cours."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,325 @@
+"""
+Ce module fournit la classe GraphStore, un store rdflib persistant sur SQLite : les triplets
+s'accumulent d'un document (et d'un redémarrage) à l'autre, sans doublons, et un motif
+(sujet, prédicat, objet) avec jokers est résolu par l'un des index SPO, POS ou OSP.
+
+Utilisation :
+    graphe = Graph(store=GraphStore("graphe.db"))
+ou, avec les règles de conversion de RDFGrapher :
+    RDFGrapher(store_path="graphe.db").upsert_document("doc-1", triplets)
+"""
+
+import sqlite3
+import threading
+from rdflib.store import Store
+from py.ntriples_sink import nt_term, parse_nt_term
+
+# Document auquel sont rattachés les triplets ajoutés sans identifiant de document
+DEFAULT_DOCUMENT = ""
+
+# Nombre de lignes lues à la fois lors du parcours d'un motif
+FETCH_SIZE = 1000
+
+# Les termes sont stockés une fois, sous leur forme N-Triples ; les triplets ne gardent que
+# leurs identifiants. La clé primaire de `triples` sert d'index SPO.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (id INTEGER PRIMARY KEY, term TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS triples (s INTEGER NOT NULL, p INTEGER NOT NULL,
+                                    o INTEGER NOT NULL,
+                                    PRIMARY KEY (s, p, o)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS triples_pos ON triples (p, o, s);
+CREATE INDEX IF NOT EXISTS triples_osp ON triples (o, s, p);
+CREATE TABLE IF NOT EXISTS documents (document TEXT NOT NULL, s INTEGER NOT NULL,
+                                      p INTEGER NOT NULL, o INTEGER NOT NULL,
+                                      PRIMARY KEY (document, s, p, o)) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS documents_spo ON documents (s, p, o);
+"""
+
+
+class GraphStore(Store):
+    """
+    Store rdflib persistant, partageable entre threads, fondé sur un fichier SQLite.
+
+    Chaque triplet retient les documents qui le contiennent : `upsert_document` remplace les
+    triplets d'un document, et un triplet n'est supprimé que lorsque plus aucun document ne
+    le contient. Les identifiants des termes récemment utilisés restent en mémoire.
+    """
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, path, batch_size=50000, term_cache_size=1000000):
+        """
+        Args:
+            path (str): Le fichier SQLite du store, créé s'il n'existe pas.
+            batch_size (int): Nombre de triplets insérés par transaction.
+            term_cache_size (int): Nombre d'identifiants de termes gardés en mémoire.
+        """
+        super().__init__()
+        self.path = path
+        self.batch_size = batch_size
+        self.term_cache_size = term_cache_size
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._ids = {}
+        self._namespaces = {}
+
+    def __term_ids(self, termes, creer):
+        """
+        Donne l'identifiant de chaque terme (forme N-Triples), en créant les nouveaux.
+
+        Args:
+            termes (Iterable[str]): Les termes sérialisés.
+            creer (bool): Crée les termes absents ; sinon ils sont omis du résultat.
+
+        Returns:
+            dict: L'identifiant de chaque terme trouvé ou créé.
+        """
+        ids = {}
+        manquants = []
+        for terme in set(termes):
+            if terme in self._ids:
+                ids[terme] = self._ids[terme]
+            else:
+                manquants.append(terme)
+        if not manquants:
+            return ids
+
+        if creer:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO terms (term) VALUES (?)",
+                ((terme,) for terme in manquants),
+            )
+        if len(self._ids) + len(manquants) > self.term_cache_size:
+            self._ids.clear()
+        # SQLite limite le nombre de paramètres d'une même requête
+        for i in range(0, len(manquants), 500):
+            lot = manquants[i : i + 500]
+            for id_, terme in self._connection.execute(
+                f"SELECT id, term FROM terms WHERE term IN ({','.join('?' * len(lot))})",
+                lot,
+            ):
+                ids[terme] = self._ids[terme] = id_
+        return ids
+
+    def __insert(self, triplets, document):
+        """Insère un lot de triplets rdflib, dans la transaction en cours."""
+        lignes = [tuple(nt_term(terme) for terme in triplet) for triplet in triplets]
+        ids = self.__term_ids((terme for ligne in lignes for terme in ligne), True)
+        lignes = [(ids[s], ids[p], ids[o]) for s, p, o in lignes]
+        if not lignes:
+            return 0
+        # Pour executemany, rowcount est la somme des lignes réellement insérées
+        nouveaux = self._connection.executemany(
+            "INSERT OR IGNORE INTO triples (s, p, o) VALUES (?, ?, ?)", lignes
+        ).rowcount
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO documents (document, s, p, o) VALUES (?, ?, ?, ?)",
+            ((document, s, p, o) for s, p, o in lignes),
+        )
+        return nouveaux
+
+    def __delete_orphans(self, lignes):
+        """Supprime, parmi les triplets donnés (identifiants), ceux qu'aucun document ne contient.
+
+        Returns:
+            int: Le nombre de triplets supprimés.
+        """
+        if not lignes:
+            return 0
+        return self._connection.executemany(
+            "DELETE FROM triples WHERE s = ?1 AND p = ?2 AND o = ?3 AND NOT EXISTS "
+            "(SELECT 1 FROM documents WHERE s = ?1 AND p = ?2 AND o = ?3)",
+            lignes,
+        ).rowcount
+
+    def add_triples(self, triplets, document_id=None):
+        """
+        Ajoute des triplets rdflib, les doublons étant ignorés.
+
+        Args:
+            triplets (Iterable[Tuple[Node, Node, Node]]): Les triplets à ajouter.
+            document_id (str, optional): Le document qui contient ces triplets.
+
+        Returns:
+            int: Le nombre de triplets qui n'étaient pas encore dans le store.
+        """
+        document = DEFAULT_DOCUMENT if document_id is None else document_id
+        nouveaux = 0
+        lot = []
+        with self._lock:
+            for triplet in triplets:
+                lot.append(triplet)
+                if len(lot) >= self.batch_size:
+                    nouveaux += self.__insert(lot, document)
+                    self._connection.commit()
+                    lot = []
+            nouveaux += self.__insert(lot, document)
+            self._connection.commit()
+        return nouveaux
+
+    def upsert_document(self, document_id, triplets):
+        """
+        Remplace les triplets d'un document, en une seule transaction. Le coût dépend de la
+        taille du document, pas de celle du store.
+
+        Args:
+            document_id (str): L'identifiant du document.
+            triplets (Iterable[Tuple[Node, Node, Node]]): Ses triplets rdflib.
+
+        Returns:
+            Tuple[int, int]: Le nombre de triplets ajoutés au store et supprimés du store.
+        """
+        with self._lock:
+            anciens = self._connection.execute(
+                "SELECT s, p, o FROM documents WHERE document = ?", (document_id,)
+            ).fetchall()
+            self._connection.execute(
+                "DELETE FROM documents WHERE document = ?", (document_id,)
+            )
+            ajoutes = self.__insert(list(triplets), document_id)
+            supprimes = self.__delete_orphans(anciens)
+            self._connection.commit()
+        return ajoutes, supprimes
+
+    def remove_document(self, document_id):
+        """
+        Retire un document ; ses triplets que nul autre document ne contient sont supprimés.
+
+        Args:
+            document_id (str): L'identifiant du document.
+
+        Returns:
+            int: Le nombre de triplets supprimés du store.
+        """
+        return self.upsert_document(document_id, [])[1]
+
+    def documents(self):
+        """
+        Returns:
+            List[str]: Les identifiants des documents présents dans le store.
+        """
+        with self._lock:
+            return [
+                row[0]
+                for row in self._connection.execute(
+                    "SELECT DISTINCT document FROM documents ORDER BY document"
+                )
+            ]
+
+    def __pattern(self, triple_pattern):
+        """
+        Traduit un motif rdflib en clause WHERE sur les identifiants.
+
+        Returns:
+            Tuple[str, list]: La clause et ses paramètres, ou None si un terme du motif
+                              est inconnu (aucun triplet ne peut correspondre).
+        """
+        termes = {
+            colonne: nt_term(terme)
+            for colonne, terme in zip("spo", triple_pattern)
+            if terme is not None
+        }
+        ids = self.__term_ids(termes.values(), False)
+        if len(ids) < len(set(termes.values())):
+            return None
+        clause = " AND ".join(f"t.{colonne} = ?" for colonne in termes) or "1"
+        return clause, [ids[terme] for terme in termes.values()]
+
+    def __count(self):
+        return self._connection.execute("SELECT COUNT(*) FROM triples").fetchone()[0]
+
+    # API rdflib.store.Store
+
+    def add(self, triple, context=None, quoted=False):
+        self.add_triples([triple])
+
+    def addN(self, quads):  # noqa: N802
+        self.add_triples((s, p, o) for s, p, o, _ in quads)
+
+    def remove(self, triple, context=None):
+        """Supprime les triplets qui correspondent au motif, de tous les documents."""
+        with self._lock:
+            motif = self.__pattern(triple)
+            if motif is None:
+                return
+            clause, parametres = motif
+            lignes = self._connection.execute(
+                f"SELECT s, p, o FROM triples t WHERE {clause}", parametres
+            ).fetchall()
+            self._connection.executemany(
+                "DELETE FROM documents WHERE s = ? AND p = ? AND o = ?", lignes
+            )
+            self.__delete_orphans(lignes)
+            self._connection.commit()
+
+    def triples(self, triple_pattern, context=None):
+        """
+        Parcourt les triplets qui correspondent au motif (None pour un joker).
+
+        Les lignes sont lues par paquets de `FETCH_SIZE` : la mémoire reste bornée quel que
+        soit le nombre de correspondances, et le verrou est relâché entre deux paquets.
+
+        Yields:
+            Tuple[Tuple[Node, Node, Node], Iterator]: Chaque triplet et ses contextes
+                                                      (aucun, le store n'en a pas).
+        """
+        with self._lock:
+            motif = self.__pattern(triple_pattern)
+            if motif is None:
+                return
+            clause, parametres = motif
+            curseur = self._connection.execute(
+                "SELECT ts.term, tp.term, tobj.term FROM triples t "
+                "JOIN terms ts ON ts.id = t.s JOIN terms tp ON tp.id = t.p "
+                f"JOIN terms tobj ON tobj.id = t.o WHERE {clause}",
+                parametres,
+            )
+        try:
+            while True:
+                with self._lock:
+                    rows = curseur.fetchmany(FETCH_SIZE)
+                if not rows:
+                    return
+                for s, p, o in rows:
+                    yield (parse_nt_term(s), parse_nt_term(p), parse_nt_term(o)), iter(
+                        ()
+                    )
+        finally:
+            with self._lock:
+                curseur.close()
+
+    def __len__(self, context=None):
+        with self._lock:
+            return self.__count()
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def bind(self, prefix, namespace, override=True):
+        # Les préfixes ne servent qu'à la sérialisation : ils restent en mémoire
+        if override or prefix not in self._namespaces:
+            self._namespaces[prefix] = namespace
+
+    def namespace(self, prefix):
+        return self._namespaces.get(prefix)
+
+    def prefix(self, namespace):
+        for prefix, uri in self._namespaces.items():
+            if uri == namespace:
+                return prefix
+        return None
+
+    def namespaces(self):
+        yield from list(self._namespaces.items())
+
+    def close(self, commit_pending_transaction=False):
+        """Ferme la connexion SQLite."""
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
@@ -0,0 +1,312 @@
+"""
+Ce module fournit la classe HttpClient, la couche HTTP partagée par les appels sortants
+de l'enrichissement (SPARQL, API Wikipedia) : connexions persistantes réutilisées
+(keep-alive), délais configurables, nouvelles tentatives sur 429/5xx, disjoncteur et
+histogramme des latences par point d'accès.
+"""
+
+from datetime import timezone
+import email.utils
+import math
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+# Statuts qui signalent une surcharge ou une panne passagère du serveur
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Bornes supérieures, en secondes, des classes de l'histogramme des latences
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Levée sans appel réseau quand le disjoncteur d'un point d'accès est ouvert."""
+
+
+class LatencyHistogram:
+    """
+    Histogramme cumulatif des latences, à classes fixes (`LATENCY_BUCKETS`).
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        """Ajoute une mesure.
+
+        Args:
+            seconds (float): La durée de la requête, en secondes.
+        """
+        for i, borne in enumerate(LATENCY_BUCKETS):
+            if seconds <= borne:
+                break
+        else:
+            i = len(LATENCY_BUCKETS)
+        self.counts[i] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q):
+        """Estime un quantile par la borne supérieure de sa classe.
+
+        Args:
+            q (float): Le quantile voulu, entre 0 et 1.
+
+        Returns:
+            float: La borne, en secondes ; inf au-delà de la dernière classe, None sans mesure.
+        """
+        if not self.count:
+            return None
+        rang = q * self.count
+        cumul = 0
+        for borne, n in zip(LATENCY_BUCKETS + (float("inf"),), self.counts):
+            cumul += n
+            if cumul >= rang:
+                return borne
+        return float("inf")
+
+    def summary(self):
+        """Résumé de l'histogramme.
+
+        Returns:
+            dict: Nombre de mesures, moyenne, p50, p95 et p99 en secondes, et l'effectif
+                  de chaque classe indexé par sa borne supérieure.
+        """
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip(LATENCY_BUCKETS + (float("inf"),), self.counts)),
+        }
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur d'un point d'accès : après `failure_threshold` échecs consécutifs, les appels
+    sont refusés pendant `reset_timeout` secondes, puis un seul appel d'essai est autorisé.
+    Il referme le circuit s'il réussit et le rouvre sinon.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """
+        Args:
+            failure_threshold (int): Nombre d'échecs consécutifs qui ouvrent le circuit.
+            reset_timeout (float): Durée, en secondes, pendant laquelle le circuit reste ouvert.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self):
+        """Indique si un appel peut être tenté, et passe en demi-ouvert à l'expiration.
+
+        Returns:
+            bool: True si l'appel est autorisé.
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            return True
+        # En demi-ouvert, l'appel d'essai est déjà en cours
+        return self.state == self.CLOSED
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class HttpClient:
+    """
+    Client HTTP partageable entre threads, fondé sur une `requests.Session` dont les
+    connexions restent ouvertes d'un appel à l'autre.
+
+    Un point d'accès est identifié par le schéma, l'hôte et le chemin de l'URL : chacun a
+    son disjoncteur, son histogramme de latences et ses compteurs.
+    """
+
+    def __init__(
+        self,
+        timeout=10.0,
+        retries=3,
+        backoff=0.5,
+        max_backoff=30.0,
+        pool_maxsize=32,
+        failure_threshold=5,
+        reset_timeout=30.0,
+        headers=None,
+    ):
+        """
+        Args:
+            timeout (float): Délai maximal par défaut, en secondes, d'une requête.
+            retries (int): Nombre de nouvelles tentatives après une erreur réseau ou un
+                           statut 429/5xx.
+            backoff (float): Attente, en secondes, avant la première nouvelle tentative ;
+                             elle double à chaque tentative.
+            max_backoff (float): Attente maximale, y compris celle demandée par Retry-After.
+            pool_maxsize (int): Nombre maximal de connexions gardées ouvertes par hôte.
+            failure_threshold (int): Échecs consécutifs qui ouvrent le disjoncteur.
+            reset_timeout (float): Durée, en secondes, d'ouverture du disjoncteur.
+            headers (dict, optional): En-têtes ajoutés à chaque requête.
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "Graph_RDF_extraction"
+        self.session.headers.update(headers or {})
+        # Les nouvelles tentatives sont gérées ici, pas par urllib3
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def __endpoint(self, url):
+        """Donne l'état (disjoncteur, histogramme, compteurs) d'un point d'accès."""
+        parties = urlparse(url)
+        cle = f"{parties.scheme}://{parties.netloc}{parties.path}"
+        with self._lock:
+            if cle not in self._endpoints:
+                self._endpoints[cle] = {
+                    "breaker": CircuitBreaker(
+                        self.failure_threshold, self.reset_timeout
+                    ),
+                    "latency": LatencyHistogram(),
+                    "requests": 0,
+                    "retries": 0,
+                    "errors": 0,
+                    "rejected": 0,
+                }
+            return self._endpoints[cle]
+
+    def __delay(self, tentative, response):
+        """Attente avant une nouvelle tentative : Retry-After s'il est donné, sinon backoff."""
+        # Une réponse 429/503 est « fausse » (`Response.ok`) : il faut la comparer à None
+        retry_after = (
+            response.headers.get("Retry-After") if response is not None else None
+        )
+        attente = None
+        if retry_after:
+            try:
+                attente = float(retry_after)
+            except ValueError:
+                try:
+                    date = email.utils.parsedate_to_datetime(retry_after)
+                except (TypeError, ValueError):
+                    # En-tête illisible : on se rabat sur le backoff exponentiel
+                    date = None
+                if date is not None:
+                    # Une date HTTP est toujours en UTC, même sans fuseau explicite
+                    if date.tzinfo is None:
+                        date = date.replace(tzinfo=timezone.utc)
+                    attente = date.timestamp() - time.time()
+        if attente is None or not math.isfinite(attente):
+            attente = self.backoff * 2**tentative
+        return min(max(attente, 0.0), self.max_backoff)
+
+    def request(self, method, url, **kwargs):
+        """Envoie une requête, en la retentant sur erreur réseau ou statut 429/5xx.
+
+        Args:
+            method (str): La méthode HTTP.
+            url (str): L'URL.
+            **kwargs: Les paramètres de `requests.Session.request` (params, data, headers,
+                      timeout, ...).
+
+        Returns:
+            requests.Response: La réponse, de statut non erreur.
+
+        Raises:
+            CircuitOpenError: Si le disjoncteur du point d'accès est ouvert.
+            requests.RequestException: Si la dernière tentative échoue ou si le statut
+                                       est une erreur qui ne se retente pas (4xx).
+        """
+        etat = self.__endpoint(url)
+        kwargs.setdefault("timeout", self.timeout)
+        for tentative in range(self.retries + 1):
+            with self._lock:
+                autorise = etat["breaker"].allow()
+                etat["requests" if autorise else "rejected"] += 1
+            if not autorise:
+                raise CircuitOpenError(f"Circuit ouvert pour {url}")
+
+            debut = time.perf_counter()
+            response, erreur = None, None
+            # Échec par défaut : une exception non retentée (TooManyRedirects,
+            # ChunkedEncodingError...) doit aussi rouvrir un disjoncteur demi-ouvert
+            passagere = True
+            try:
+                response = self.session.request(method, url, **kwargs)
+                passagere = response.status_code in RETRY_STATUSES
+            except (requests.ConnectionError, requests.Timeout) as e:
+                erreur = e
+            finally:
+                with self._lock:
+                    etat["latency"].observe(time.perf_counter() - debut)
+                    if passagere:
+                        etat["breaker"].record_failure()
+                        etat["errors"] += 1
+                    else:
+                        etat["breaker"].record_success()
+            if not passagere:
+                response.raise_for_status()
+                return response
+            if tentative == self.retries:
+                if erreur is not None:
+                    raise erreur
+                response.raise_for_status()
+            with self._lock:
+                etat["retries"] += 1
+            time.sleep(self.__delay(tentative, response))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        """Statistiques par point d'accès.
+
+        Returns:
+            dict: Pour chaque point d'accès, les compteurs (requêtes, nouvelles tentatives,
+                  erreurs, appels refusés), l'état du disjoncteur et le résumé des latences.
+        """
+        with self._lock:
+            return {
+                cle: {
+                    "requests": etat["requests"],
+                    "retries": etat["retries"],
+                    "errors": etat["errors"],
+                    "rejected": etat["rejected"],
+                    "circuit": etat["breaker"].state,
+                    "latency": etat["latency"].summary(),
+                }
+                for cle, etat in self._endpoints.items()
+            }
+
+    def close(self):
+        """Ferme les connexions gardées ouvertes."""
+        self.session.close()
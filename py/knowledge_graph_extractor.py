@@ -3,10 +3,140 @@ Ce module fournit la classe KnowledgeGraphExtractor pour extraire des graphes de
 en utilisant Spacy et SPARQL.
 """
 
-from SPARQLWrapper import SPARQLWrapper, JSON
-import spacy
-import wikipedia
-import modules.spacy_component
+import io
+import re
+import time
+from py.enrichment import RDF_TYPE, DBpediaEnricher
+from py.local_dbpedia import LocalDBpediaStore
+from py.entity_linker import EntityLinker, WikipediaApiResolver
+from py.http_client import HttpClient
+from py.offline_linker import OfflineTitleIndex
+from py.model_registry import registry
+from py.worker_pool import RebelWorkerPool
+
+# Phrase du rodage du pipeline : la première inférence (allocations, compilation) est lente
+WARMUP_TEXT = "Paris is the capital of France."
+
+
+def iter_text_windows(source, window_chars=5000):
+    """Découpe un texte en fenêtres d'environ `window_chars` caractères, sans le charger en entier.
+
+    Les fenêtres sont coupées de préférence à la fin d'un paragraphe (ligne vide), sinon à la
+    fin d'une phrase, sinon sur un espace. Seules les lignes de la fenêtre en cours sont
+    gardées en mémoire.
+
+    Args:
+        source (str | Iterable[str]): Le texte, ou un itérable de lignes (un fichier ouvert).
+        window_chars (int): La taille visée des fenêtres, en caractères.
+
+    Yields:
+        Tuple[int, str]: La position du début de la fenêtre dans le texte complet et
+                         le texte de la fenêtre, sans espaces autour.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    tampon = ""
+    position = 0
+    fin_paragraphe = 0
+
+    for ligne in source:
+        tampon += ligne
+        if not ligne.strip():
+            fin_paragraphe = len(tampon)
+        while len(tampon) >= window_chars:
+            coupure = fin_paragraphe or _window_cut(tampon, window_chars)
+            yield from _strip_window(position, tampon[:coupure])
+            tampon = tampon[coupure:]
+            position += coupure
+            fin_paragraphe = 0
+
+    yield from _strip_window(position, tampon)
+
+
+def _window_cut(tampon, window_chars):
+    """Choisit la position de coupure d'une fenêtre sans fin de paragraphe.
+
+    Args:
+        tampon (str): Le texte en attente.
+        window_chars (int): La taille visée des fenêtres.
+
+    Returns:
+        int: La fin de la dernière phrase, ou à défaut du dernier espace, avant `window_chars`.
+    """
+    debut = tampon[:window_chars]
+    fins_de_phrase = [m.end() for m in re.finditer(r"[.!?]\s+", debut)]
+    if fins_de_phrase:
+        return fins_de_phrase[-1]
+    espace = debut.rfind(" ")
+    return espace + 1 if espace > 0 else window_chars
+
+
+def _strip_window(position, fenetre):
+    """Retire les espaces autour d'une fenêtre en décalant sa position en conséquence.
+
+    Args:
+        position (int): La position de la fenêtre dans le texte complet.
+        fenetre (str): Le texte de la fenêtre.
+
+    Yields:
+        Tuple[int, str]: La fenêtre nettoyée, si elle n'est pas vide.
+    """
+    texte = fenetre.lstrip()
+    if texte.strip():
+        yield position + len(fenetre) - len(texte), texte.rstrip()
+
+
+def load_nlp(
+    cpu_or_gpu=-1, rebel_cache_path=None, rebel_backend="torch", rebel_model_path=None
+):
+    """Charge le pipeline Spacy (en_core_web_sm) suivi du composant REBEL.
+
+    Préférer `registry.get` (voir KnowledgeGraphExtractor) qui ne le charge qu'une fois.
+
+    Args:
+        cpu_or_gpu (int): -1 pour le CPU, 0 pour le premier GPU.
+        rebel_cache_path (str, optional): Fichier SQLite du cache des triplets par phrase.
+        rebel_backend (str): Moteur d'inférence REBEL : "torch", "onnx" ou "int8".
+        rebel_model_path (str, optional): Dossier local du modèle.
+
+    Returns:
+        Language: Le pipeline.
+    """
+    # Spacy et le composant REBEL (transformers) ne sont importés qu'au chargement
+    import spacy
+    import modules.spacy_component  # noqa: F401 (enregistre le composant "rebel")
+
+    nlp = spacy.load("en_core_web_sm")
+
+    nlp.add_pipe(
+        "rebel",
+        after="senter",
+        config={
+            "device": cpu_or_gpu,  # Numéro du GPU, -1 pour utiliser le CPU
+            "model_name": "Babelscape/rebel-large",
+            "cache_path": rebel_cache_path,
+            "backend": rebel_backend,
+            "model_path": rebel_model_path,
+        },  # Modèle utilisé, par défaut 'Babelscape/rebel-large' si non spécifié
+    )
+    return nlp
+
+
+def warm_up_nlp(nlp):
+    """Fait tourner une première inférence sur un pipeline qui vient d'être chargé.
+
+    Le cache des triplets REBEL est débranché le temps de l'inférence : elle n'y laisse
+    pas d'entrée et ne fausse pas ses compteurs.
+
+    Args:
+        nlp (Language): Le pipeline chargé par `load_nlp`.
+    """
+    rebel = nlp.get_pipe("rebel")
+    cache, rebel.cache = rebel.cache, None
+    try:
+        nlp(WARMUP_TEXT)
+    finally:
+        rebel.cache = cache
 
 
 class KnowledgeGraphExtractor:
@@ -15,18 +145,92 @@ class KnowledgeGraphExtractor:
     le modèle REBEL et des requêtes SPARQL sur DBpedia pour enrichir le graphe.
     """
 
-    def __init__(self, cpu_or_gpu=-1):
+    def __init__(
+        self,
+        cpu_or_gpu=-1,
+        rebel_cache_path=None,
+        rebel_backend="torch",
+        rebel_model_path=None,
+        entity_cache_path=None,
+        type_cache_path=None,
+        dbpedia_store_path=None,
+        entity_index_path=None,
+        warmup=True,
+    ):
+        """
+        Args:
+            cpu_or_gpu (int): -1 pour le CPU, 0 pour le premier GPU.
+            rebel_cache_path (str, optional): Fichier SQLite où garder les triplets déjà
+                                              extraits par phrase ; pas de cache si None.
+            rebel_backend (str): Moteur d'inférence REBEL : "torch", "onnx" ou "int8"
+                                 (ces deux derniers uniquement sur CPU).
+            rebel_model_path (str, optional): Dossier local du modèle (export ONNX par exemple).
+            entity_cache_path (str, optional): Fichier SQLite où garder les URIs des entités
+                                               d'une exécution à l'autre ; aucun si None.
+            type_cache_path (str, optional): Fichier SQLite où garder les types DBpedia des
+                                             ressources d'une exécution à l'autre ; aucun si None.
+            dbpedia_store_path (str, optional): Store construit par `python -m py.local_dbpedia
+                                                build` pour enrichir hors ligne ; le point
+                                                d'accès SPARQL de DBpedia si None.
+            entity_index_path (str, optional): Index construit par `python -m py.offline_linker
+                                               build` pour relier les entités hors ligne ;
+                                               l'API Wikipedia si None.
+            warmup (bool): Fait tourner une première inférence au chargement du pipeline ;
+                           False si un `worker_pool` doit être créé ensuite par fork.
+        """
         if cpu_or_gpu not in [-1, 0]:
             raise ValueError("-1 ou 0, nous n'acceptons pas une autre valeur.")
-        self.nlp = spacy.load("en_core_web_sm")
-
-        self.nlp.add_pipe(
-            "rebel",
-            after="senter",
-            config={
-                "device": cpu_or_gpu,  # Numéro du GPU, -1 pour utiliser le CPU
-                "model_name": "Babelscape/rebel-large",
-            },  # Modèle utilisé, par défaut 'Babelscape/rebel-large' si non spécifié
+        # Paramètres conservés pour recréer l'extracteur dans un processus worker
+        self.init_kwargs = {
+            "cpu_or_gpu": cpu_or_gpu,
+            "rebel_cache_path": rebel_cache_path,
+            "rebel_backend": rebel_backend,
+            "rebel_model_path": rebel_model_path,
+            "entity_cache_path": entity_cache_path,
+            "type_cache_path": type_cache_path,
+            "dbpedia_store_path": dbpedia_store_path,
+            "entity_index_path": entity_index_path,
+            "warmup": warmup,
+        }
+        # Le pipeline est chargé une seule fois par processus et par configuration, puis
+        # partagé par tous les extracteurs ; un pipeline rodé n'est jamais rendu à un
+        # extracteur créé avec warmup=False (il ne pourrait plus être partagé par fork)
+        self.nlp = registry.get(
+            (
+                "nlp",
+                cpu_or_gpu,
+                rebel_cache_path,
+                rebel_backend,
+                rebel_model_path,
+                warmup,
+            ),
+            lambda: load_nlp(
+                cpu_or_gpu, rebel_cache_path, rebel_backend, rebel_model_path
+            ),
+            warmup=warm_up_nlp if warmup else None,
+        )
+        # Statistiques de débit du dernier appel à extract_triplets_batch
+        self.batch_stats = {}
+        # Client HTTP partagé par tous les appels sortants (connexions persistantes)
+        self.http_client = HttpClient()
+        # Liaison des entités à DBpedia, mémorisée en mémoire et sur disque ; les erreurs
+        # passagères sont déjà retentées par le client HTTP
+        self.entity_linker = EntityLinker(
+            (
+                OfflineTitleIndex(entity_index_path)
+                if entity_index_path
+                else WikipediaApiResolver(client=self.http_client)
+            ),
+            cache_path=entity_cache_path,
+            retries=0,
+        )
+        # Enrichissement DBpedia par requêtes SPARQL groupées, types mémorisés entre documents
+        self.enricher = DBpediaEnricher(
+            type_cache_path=type_cache_path,
+            backend=(
+                LocalDBpediaStore(dbpedia_store_path) if dbpedia_store_path else None
+            ),
+            client=self.http_client,
         )
 
     def extract_triplet(self, texte: str):
@@ -40,35 +244,141 @@ class KnowledgeGraphExtractor:
         """
         texte = texte.replace("\n", " ").strip()
         doc = self.nlp(texte)
-        # Extraction des triplets à partir de l'attribut "rel"
-        triplet_list = [
+        return self._triplets_from_doc(doc)
+
+    def extract_triplets_batch(self, textes, batch_size=16, n_process=1):
+        """Extrait les triplets d'un corpus en faisant passer les documents par `nlp.pipe`.
+
+        Les étapes légères de Spacy (tokenisation, découpage en phrases) tournent sur
+        `n_process` processus, puis le composant REBEL traite les documents par lots de
+        `batch_size` afin que toutes les phrases d'un lot partent ensemble vers le modèle.
+        Les statistiques de débit sont tenues à jour dans `self.batch_stats`.
+
+        Args:
+            textes (Iterable[str]): Les documents à analyser.
+            batch_size (int): Nombre de documents envoyés ensemble au modèle REBEL.
+            n_process (int): Nombre de processus pour les étapes Spacy hors REBEL.
+
+        Yields:
+            List: Pour chaque document, dans l'ordre d'entrée, la liste de ses triplets
+                  sous la forme (head, relation, tail).
+        """
+        self.batch_stats = {
+            "docs": 0,
+            "sentences": 0,
+            "seconds": 0.0,
+            "docs_per_sec": 0.0,
+            "sentences_per_sec": 0.0,
+        }
+        textes = (texte.replace("\n", " ").strip() for texte in textes)
+        docs = self.nlp.pipe(
+            textes, batch_size=batch_size, n_process=n_process, disable=["rebel"]
+        )
+        debut = time.perf_counter()
+        for doc in self.nlp.get_pipe("rebel").pipe(docs, batch_size=batch_size):
+            self.__update_batch_stats(doc, time.perf_counter() - debut)
+            yield self._triplets_from_doc(doc)
+
+    def extract_triplet_stream(self, source, window_chars=5000, batch_size=8):
+        """Extrait les triplets d'un long document fenêtre par fenêtre, à mémoire constante.
+
+        Le texte est découpé par `iter_text_windows` ; chaque fenêtre devient un petit
+        document Spacy traité par lots, au lieu d'un seul document pour tout le texte.
+
+        Args:
+            source (str | Iterable[str]): Le texte, ou un itérable de lignes (un fichier ouvert).
+            window_chars (int): La taille visée des fenêtres, en caractères.
+            batch_size (int): Nombre de fenêtres envoyées ensemble au modèle REBEL.
+
+        Yields:
+            Tuple: (head, relation, tail, head_offset, tail_offset) où les offsets sont les
+                   positions (début, fin) de head et tail dans le texte complet.
+        """
+        fenetres = (
+            (texte.replace("\n", " "), position)
+            for position, texte in iter_text_windows(source, window_chars)
+        )
+        for doc, position in self.nlp.pipe(
+            fenetres, as_tuples=True, batch_size=batch_size
+        ):
+            for head, relation, tail in self._triplets_from_doc(doc):
+                yield (
+                    head,
+                    relation,
+                    tail,
+                    (position + head.start_char, position + head.end_char),
+                    (position + tail.start_char, position + tail.end_char),
+                )
+
+    def worker_pool(self, n_workers=2, max_in_flight=None, start_method=None):
+        """Crée un pool de processus qui exécutent chacun le pipeline REBEL de cet extracteur.
+
+        Par défaut chaque worker charge son propre pipeline. Avec `start_method="fork"`
+        (Linux), les workers partagent le modèle déjà chargé en copie sur écriture ; il faut
+        alors un extracteur créé avec `warmup=False` et aucune inférence dans le parent
+        avant la création du pool (voir RebelWorkerPool).
+
+        Exemple :
+            with kge.worker_pool(4) as pool:
+                for triplets in pool.imap(textes):
+                    ...
+
+        Args:
+            n_workers (int): Nombre de processus.
+            max_in_flight (int, optional): Nombre maximal de documents en cours de traitement.
+            start_method (str, optional): "spawn" (par défaut), "forkserver" ou "fork".
+
+        Returns:
+            RebelWorkerPool: Le pool, à fermer avec `close()` ou via un bloc `with`.
+        """
+        return RebelWorkerPool(self, n_workers, max_in_flight, start_method)
+
+    def __update_batch_stats(self, doc, secondes):
+        """Met à jour les compteurs de débit après le traitement d'un document.
+
+        Args:
+            doc (Doc): Le document qui vient d'être traité.
+            secondes (float): Le temps écoulé depuis le début du lot.
+        """
+        stats = self.batch_stats
+        stats["docs"] += 1
+        stats["sentences"] += sum(1 for _ in doc.sents)
+        stats["seconds"] = secondes
+        if secondes > 0:
+            stats["docs_per_sec"] = stats["docs"] / secondes
+            stats["sentences_per_sec"] = stats["sentences"] / secondes
+
+    @staticmethod
+    def _triplets_from_doc(doc):
+        """Construit la liste des triplets à partir de l'attribut "rel" d'un document.
+
+        Args:
+            doc (Doc): Un document annoté par le composant REBEL.
+
+        Returns:
+            List: Une liste de triplets sous la forme (head, relation, tail).
+        """
+        return [
             (rel_dict["head_span"], rel_dict["relation"], rel_dict["tail_span"])
             for value, rel_dict in doc._.rel.items()
         ]
-        return triplet_list
 
     def compose_uri(self, candidate_entity):
         """Compose l'URI pour une entité en se basant sur les résultats trouvés dans Wikipedia.
 
+        La recherche passe par `self.entity_linker` : une entité déjà résolue, dans ce
+        processus ou lors d'une exécution précédente, ne coûte aucune requête.
+
         Args:
             candidate_entity (str): L'entité ou la relation candidate.
 
         Returns:
             str: L'URI DBpedia générée pour l'entité, ou le nom de l'entité si la recherche échoue.
         """
-        try:
-            page = wikipedia.page(candidate_entity, auto_suggest=False)
-            entity_data = {
-                "title": page.title,
-                "url": page.url,
-                "summary": page.summary,
-            }
-            uri = entity_data["url"].split("/")[-1]
-            return "http://dbpedia.org/resource/" + uri
-        except wikipedia.exceptions.DisambiguationError:
-            return candidate_entity
-        except Exception:
+        uri = self.entity_linker.resolve(candidate_entity)
+        if uri is None:
             return candidate_entity
+        return uri
 
     def extract_uri(self, triplet_list):
         """Extrait les URIs pour chaque entité dans une liste de triplets RDF.
@@ -85,7 +395,9 @@ class KnowledgeGraphExtractor:
         my_set = {
             element for tple in triplet_list for element in (tple[0].text, tple[2].text)
         }
-        my_dict = {key: self.compose_uri(key) for key in my_set}
+        # Les entités sont résolues en parallèle, voir EntityLinker.resolve_many
+        uris = self.entity_linker.resolve_many(my_set)
+        my_dict = {key: uri if uri is not None else key for key, uri in uris.items()}
         return my_dict
 
     def transform_to_rdf_triplet(self, triplet_list):
@@ -163,31 +475,12 @@ class KnowledgeGraphExtractor:
         uri_0 = a_tuple[0]
         old_predicate = a_tuple[1]
         uri_1 = a_tuple[2]
-        sparql = SPARQLWrapper("http://dbpedia.org/sparql")
-        sparql.setQuery(
-            f"""
-            SELECT DISTINCT ?predicate
-            WHERE {{
-                <{uri_0}> ?predicate <{uri_1}> .
-            }}
-            """
+        predicates = self.enricher.predicates_for_pairs([(uri_0, uri_1)]).get(
+            (uri_0, uri_1), []
         )
-        sparql.setReturnFormat(JSON)
-        try:
-            results = sparql.query().convert()
-            predicates = [
-                result["predicate"]["value"]
-                for result in results["results"]["bindings"]
-            ]
-            if not predicates:
-                return [(uri_0, old_predicate, uri_1)]
-
-            new_tuples = [(uri_0, value, uri_1) for value in predicates]
-            new_tuples.append((uri_0, old_predicate, uri_1))
-            return new_tuples
-        except Exception as e:
-            print(f"Une erreur est survenue: {e}")
-            return [(uri_0, old_predicate, uri_1)]
+        new_tuples = [(uri_0, value, uri_1) for value in predicates]
+        new_tuples.append((uri_0, old_predicate, uri_1))
+        return new_tuples
 
     def get_resource_type(self, uri):
         """Récupère les types d'une ressource à partir de DBpedia.
@@ -198,49 +491,21 @@ class KnowledgeGraphExtractor:
         Returns:
             List[Tuple]: Une liste de tuples contenant (URI, type) pour chaque type trouvé.
         """
-        sparql = SPARQLWrapper("http://dbpedia.org/sparql")
-        sparql.setQuery(
-            f"""
-            SELECT ?type
-            WHERE {{
-                <{uri}> rdf:type ?type .
-            }}
-            """
-        )
-        sparql.setReturnFormat(JSON)
-        results = sparql.query().convert()
-        types = [result["type"]["value"] for result in results["results"]["bindings"]]
+        types = self.enricher.types_for_resources([uri]).get(uri, [])
         if not types:
             return None
-        new_tuples = [
-            (uri, "http://www.w3.org/1999/02/22-rdf-syntax-ns#type", value)
-            for value in types[:10]
-        ]
+        new_tuples = [(uri, RDF_TYPE, value) for value in types[:10]]
         return new_tuples
 
     def enrichir_graph(self, triplet_list):
         """Enrichit les triplets RDF avec des prédicats et types à partir de DBpedia.
 
+        Les requêtes du document sont regroupées par lots, voir `DBpediaEnricher.enrich`.
+
         Args:
             triplet_list (List[Tuple]): Liste de triplets à enrichir.
 
         Returns:
             List[Tuple]: Liste de triplets enrichis.
         """
-        list_modified = []
-        for a_tuple in triplet_list:
-            if self.check_is_dbpedia(a_tuple[0]) and self.check_is_dbpedia(a_tuple[2]):
-                liste = self.get_predicate_sparql(a_tuple)
-                list_modified.extend(liste)
-            if self.check_is_dbpedia(a_tuple[0]):
-                uri_0_types = self.get_resource_type(a_tuple[0])
-                if uri_0_types is not None:
-                    list_modified.extend(uri_0_types)
-            if self.check_is_dbpedia(a_tuple[2]):
-                uri_2_types = self.get_resource_type(a_tuple[2])
-                if uri_2_types is not None:
-                    list_modified.extend(uri_2_types)
-            else:
-                list_modified.append(tuple(a_tuple))
-
-        return list_modified
+        return self.enricher.enrich(triplet_list)
@@ -0,0 +1,206 @@
+"""
+Ce module fournit la classe LocalDBpediaStore, un backend d'enrichissement hors ligne :
+les types et les propriétés objet de DBpedia sont chargés une fois depuis les dumps
+N-Triples dans un fichier SQLite indexé, puis interrogés sans aucun accès réseau.
+
+Construction du store :
+    python -m py.local_dbpedia build dbpedia.db instance-types_lang=en_specific.ttl.bz2 \
+        mappingbased-objects_lang=en.ttl.bz2
+"""
+
+import argparse
+import bz2
+import gzip
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+
+# Un triplet N-Triples dont l'objet est une IRI ; les lignes à objet littéral sont ignorées
+TRIPLET_IRI = re.compile(r"^<([^>]*)>\s+<([^>]*)>\s+<([^>]*)>\s*\.\s*$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS types (s TEXT NOT NULL, type TEXT NOT NULL,
+                                  PRIMARY KEY (s, type)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS links (s TEXT NOT NULL, o TEXT NOT NULL, p TEXT NOT NULL,
+                                  PRIMARY KEY (s, o, p)) WITHOUT ROWID;
+"""
+
+
+def open_dump(path):
+    """Ouvre un dump N-Triples, éventuellement compressé (.bz2 ou .gz), en texte.
+
+    Args:
+        path (str): Le chemin du dump.
+
+    Returns:
+        TextIO: Le fichier ouvert en lecture.
+    """
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rt", encoding="utf-8")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def iter_ntriples(lines):
+    """Lit les triplets dont l'objet est une IRI.
+
+    Args:
+        lines (Iterable[str]): Les lignes d'un dump N-Triples.
+
+    Yields:
+        Tuple[str, str, str]: Les triplets (sujet, prédicat, objet).
+    """
+    for line in lines:
+        match = TRIPLET_IRI.match(line)
+        if match:
+            yield match.groups()
+
+
+class LocalDBpediaStore:
+    """
+    Backend d'enrichissement qui répond à partir d'un store SQLite construit depuis les dumps
+    DBpedia. Il offre les mêmes méthodes `predicates` et `types` que `SparqlBackend`.
+
+    Les deux tables sont ordonnées par leur clé primaire (WITHOUT ROWID) : les types d'une
+    ressource et les prédicats d'une paire sont lus par une seule recherche dans l'index.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Le fichier SQLite du store.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+
+    def load(self, triplets, batch_size=100000):
+        """Ajoute des triplets au store : rdf:type dans `types`, le reste dans `links`.
+
+        Args:
+            triplets (Iterable[Tuple[str, str, str]]): Les triplets (sujet, prédicat, objet).
+            batch_size (int): Nombre de triplets insérés par transaction.
+
+        Returns:
+            int: Le nombre de triplets lus.
+        """
+        total = 0
+        types, links = [], []
+        for sujet, predicat, objet in triplets:
+            if predicat == RDF_TYPE:
+                types.append((sujet, objet))
+            else:
+                links.append((sujet, objet, predicat))
+            total += 1
+            if len(types) + len(links) >= batch_size:
+                self.__insert(types, links)
+                types, links = [], []
+        self.__insert(types, links)
+        return total
+
+    def __insert(self, types, links):
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO types (s, type) VALUES (?, ?)", types
+            )
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO links (s, o, p) VALUES (?, ?, ?)", links
+            )
+            self._connection.commit()
+
+    def predicates(self, pairs):
+        """Récupère les prédicats reliant chaque paire de ressources.
+
+        Args:
+            pairs (List[Tuple[str, str]]): Les paires (URI sujet, URI objet).
+
+        Returns:
+            dict: La liste des prédicats trouvés pour chaque paire (sujet, objet).
+        """
+        predicats = {}
+        with self._lock:
+            for sujet, objet in pairs:
+                rows = self._connection.execute(
+                    "SELECT p FROM links WHERE s = ? AND o = ?", (sujet, objet)
+                ).fetchall()
+                if rows:
+                    predicats[(sujet, objet)] = [row[0] for row in rows]
+        return predicats
+
+    def types(self, uris):
+        """Récupère les types (rdf:type) de chaque ressource.
+
+        Args:
+            uris (List[str]): Les URIs des ressources.
+
+        Returns:
+            dict: La liste des types trouvés pour chaque URI.
+        """
+        uris = list(uris)
+        types = {}
+        with self._lock:
+            # SQLite limite le nombre de paramètres d'une même requête
+            for i in range(0, len(uris), 500):
+                lot = uris[i : i + 500]
+                for sujet, type_ in self._connection.execute(
+                    f"SELECT s, type FROM types WHERE s IN ({','.join('?' * len(lot))})",
+                    lot,
+                ):
+                    types.setdefault(sujet, []).append(type_)
+        return types
+
+    def close(self):
+        """Ferme la connexion SQLite."""
+        self._connection.close()
+
+
+def build(path, dumps, batch_size=100000):
+    """Construit (ou complète) un store à partir de dumps N-Triples.
+
+    Args:
+        path (str): Le fichier SQLite du store.
+        dumps (Iterable[str]): Les dumps à charger (types, propriétés objet).
+        batch_size (int): Nombre de triplets insérés par transaction.
+
+    Returns:
+        int: Le nombre total de triplets lus.
+    """
+    store = LocalDBpediaStore(path)
+    # Le store est reconstructible depuis les dumps : pas besoin de journal pendant le chargement
+    store._connection.execute("PRAGMA journal_mode = OFF")
+    store._connection.execute("PRAGMA synchronous = OFF")
+    total = 0
+    for dump in dumps:
+        debut = time.perf_counter()
+        with open_dump(dump) as lines:
+            n = store.load(iter_ntriples(lines), batch_size)
+        total += n
+        print(f"{dump} : {n} triplets en {time.perf_counter() - debut:.1f} s")
+    store.close()
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m py.local_dbpedia")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+    commande_build = commandes.add_parser(
+        "build", help="Construit le store SQLite à partir de dumps N-Triples."
+    )
+    commande_build.add_argument("store", help="Fichier SQLite à créer ou compléter.")
+    commande_build.add_argument(
+        "dumps", nargs="+", help="Dumps (.nt, .ttl, .bz2, .gz)."
+    )
+    commande_build.add_argument("--batch-size", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    build(args.store, args.dumps, args.batch_size)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,126 @@
+"""
+Ce module fournit le registre des ressources lourdes du processus (pipeline Spacy + REBEL,
+résolveurs de co-références...) : chacune est chargée au premier usage, une seule fois même
+si plusieurs threads la demandent en même temps, puis partagée par tous les appelants.
+
+Le registre par défaut, `registry`, est commun à tout le processus ; l'application Streamlit
+s'appuie dessus pour ne pas recharger les modèles à chaque exécution du script.
+"""
+
+import threading
+import time
+
+
+class ModelRegistry:
+    """
+    Registre de ressources chargées paresseusement, avec leurs métriques de chargement.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def __entry(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = {
+                    "lock": threading.Lock(),
+                    "loaded": False,
+                    "value": None,
+                    "load_seconds": None,
+                    "warmup_seconds": None,
+                    "loaded_at": None,
+                    "hits": 0,
+                }
+            return self._entries[key]
+
+    def get(self, key, loader, warmup=None):
+        """
+        Donne la ressource `key`, chargée par `loader` au premier appel.
+
+        Args:
+            key (Hashable): L'identifiant de la ressource, configuration comprise.
+            loader (Callable[[], Any]): Charge la ressource.
+            warmup (Callable[[Any], Any], optional): Appelée une fois sur la ressource
+                                                     chargée (une inférence factice par
+                                                     exemple), avant de la rendre.
+
+        Returns:
+            La ressource, la même pour tous les appels avec la même clé.
+
+        Raises:
+            Exception: L'erreur du chargement ; la ressource sera rechargée à l'appel suivant.
+        """
+        entree = self.__entry(key)
+        charge = False
+        if not entree["loaded"]:
+            with entree["lock"]:
+                # Un autre thread a pu la charger pendant l'attente du verrou
+                if not entree["loaded"]:
+                    debut = time.perf_counter()
+                    valeur = loader()
+                    chargement = time.perf_counter() - debut
+                    rodage = None
+                    if warmup is not None:
+                        debut = time.perf_counter()
+                        warmup(valeur)
+                        rodage = time.perf_counter() - debut
+                    entree.update(
+                        value=valeur,
+                        load_seconds=chargement,
+                        warmup_seconds=rodage,
+                        loaded_at=time.time(),
+                        loaded=True,
+                    )
+                    charge = True
+        if not charge:
+            # Seules les réutilisations d'une ressource déjà chargée comptent comme accès
+            with self._lock:
+                entree["hits"] += 1
+        return entree["value"]
+
+    def is_loaded(self, key):
+        """
+        Returns:
+            bool: True si la ressource `key` est déjà chargée.
+        """
+        with self._lock:
+            return key in self._entries and self._entries[key]["loaded"]
+
+    def metrics(self):
+        """
+        Métriques des ressources chargées.
+
+        Returns:
+            dict: Pour chaque ressource, indexée par sa clé en texte : la durée du chargement
+                  et du rodage en secondes, la date du chargement et le nombre d'accès
+                  sans chargement.
+        """
+        with self._lock:
+            return {
+                str(key): {
+                    "load_seconds": entree["load_seconds"],
+                    "warmup_seconds": entree["warmup_seconds"],
+                    "loaded_at": entree["loaded_at"],
+                    "hits": entree["hits"],
+                }
+                for key, entree in self._entries.items()
+                if entree["loaded"]
+            }
+
+    def clear(self, key=None):
+        """
+        Oublie une ressource (ou toutes), qui sera rechargée au prochain accès.
+
+        Args:
+            key (Hashable, optional): La ressource à oublier ; toutes si None.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+# Registre commun à tout le processus
+registry = ModelRegistry()
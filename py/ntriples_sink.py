@@ -0,0 +1,181 @@
+"""
+Ce module fournit la classe NTriplesSink, qui écrit les triplets enrichis directement dans un
+fichier N-Triples ou N-Quads (un graphe nommé par document), sans passer par un graphe rdflib
+en mémoire : la mémoire utilisée reste bornée quelle que soit la taille du corpus.
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+import gzip
+import re
+from rdflib import Literal, URIRef
+from py.rdf_grapher import RDFGrapher, escape_iri
+
+# Échappements des chaînes N-Triples
+ECHAPPEMENTS = str.maketrans(
+    {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+)
+SEQUENCES = {"n": "\n", "r": "\r", "t": "\t"}
+
+# Un littéral N-Triples : sa valeur échappée, puis sa langue ou son type
+LITTERAL = re.compile(r'^"(.*)"(?:@([^@"]+)|\^\^<([^>]*)>)?$', re.DOTALL)
+ECHAPPEMENT = re.compile(r"\\(.)")
+
+
+def nt_term(term):
+    """
+    Écrit un terme rdflib (URIRef ou Literal) en syntaxe N-Triples.
+
+    Les caractères interdits dans une IRI sont encodés en pourcentage (voir `escape_iri`).
+
+    Args:
+        term (Node): Le terme.
+
+    Returns:
+        str: Le terme sérialisé.
+    """
+    if isinstance(term, Literal):
+        texte = '"' + str(term).translate(ECHAPPEMENTS) + '"'
+        if term.language:
+            return f"{texte}@{term.language}"
+        if term.datatype:
+            return f"{texte}^^<{term.datatype}>"
+        return texte
+    return f"<{escape_iri(term)}>"
+
+
+@lru_cache(maxsize=65536)
+def parse_nt_term(text):
+    """
+    Relit un terme écrit par `nt_term`.
+
+    Args:
+        text (str): Le terme sérialisé.
+
+    Returns:
+        Node: L'URIRef ou le Literal correspondant.
+
+    Raises:
+        ValueError: Si le texte n'est ni une IRI ni un littéral N-Triples.
+    """
+    if text.startswith("<") and text.endswith(">"):
+        return URIRef(text[1:-1])
+    match = LITTERAL.match(text)
+    if match is None:
+        raise ValueError(f"Terme N-Triples invalide : {text!r}")
+    valeur, langue, datatype = match.groups()
+    valeur = ECHAPPEMENT.sub(lambda m: SEQUENCES.get(m[1], m[1]), valeur)
+    return Literal(valeur, lang=langue, datatype=URIRef(datatype) if datatype else None)
+
+
+class NTriplesSink:
+    """
+    Écrit des triplets au fil de l'eau en N-Triples ("nt") ou N-Quads ("nq").
+
+    Les triplets sont convertis par un `RDFGrapher`, avec exactement les mêmes règles que
+    `transform_triplets_to_rdflib`. Les lignes déjà écrites parmi les `dedup_window` plus
+    récentes sont ignorées, et les lignes sont écrites par paquets de `buffer_size`.
+    """
+
+    def __init__(
+        self,
+        path,
+        format=None,
+        compress=None,
+        graph_base="http://example.org/graph/",
+        dedup_window=100000,
+        buffer_size=10000,
+        term_cache_size=100000,
+    ):
+        """
+        Args:
+            path (str): Le fichier de sortie.
+            format (str, optional): "nt" ou "nq" ; déduit de l'extension (.nq) si None.
+            compress (bool, optional): Compression gzip ; déduite de l'extension (.gz) si None.
+            graph_base (str): Préfixe de l'IRI du graphe nommé de chaque document (N-Quads).
+            dedup_window (int): Nombre de lignes récentes mémorisées pour le dédoublonnage.
+            buffer_size (int): Nombre de lignes accumulées avant chaque écriture.
+            term_cache_size (int): Nombre de termes convertis gardés en cache avant d'être
+                                   oubliés.
+
+        Raises:
+            ValueError: Si le format n'est ni "nt" ni "nq".
+        """
+        if compress is None:
+            compress = path.endswith(".gz")
+        if format is None:
+            base = path[: -len(".gz")] if path.endswith(".gz") else path
+            format = "nq" if base.endswith(".nq") else "nt"
+        if format not in ("nt", "nq"):
+            raise ValueError("Le format doit être 'nt' ou 'nq'.")
+        self.format = format
+        self.graph_base = graph_base
+        self.dedup_window = dedup_window
+        self.buffer_size = buffer_size
+        self.term_cache_size = term_cache_size
+        self.grapher = RDFGrapher()
+        self._recent = OrderedDict()
+        self._buffer = []
+        self._file = (
+            gzip.open(path, "wt", encoding="utf-8")
+            if compress
+            else open(path, "w", encoding="utf-8")
+        )
+        self.stats = {"written": 0, "duplicates": 0}
+
+    def write(self, triplet_list, document_id=None):
+        """
+        Écrit les triplets d'un document.
+
+        Args:
+            triplet_list (Iterable[Tuple]): Les triplets (sujet, prédicat, objet) enrichis.
+            document_id (str, optional): L'identifiant du document, qui nomme son graphe
+                                         en N-Quads ; le graphe par défaut si None.
+
+        Returns:
+            int: Le nombre de triplets écrits, doublons exclus.
+        """
+        graphe = ""
+        if self.format == "nq" and document_id is not None:
+            graphe = f"<{escape_iri(f'{self.graph_base}{document_id}')}> "
+
+        ecrits = 0
+        for sujet, predicat, objet in self.grapher.transform_triplets_to_rdflib(
+            triplet_list
+        ):
+            ligne = f"{nt_term(sujet)} {nt_term(predicat)} {nt_term(objet)} {graphe}.\n"
+            if ligne in self._recent:
+                self._recent.move_to_end(ligne)
+                self.stats["duplicates"] += 1
+                continue
+            self._recent[ligne] = None
+            if len(self._recent) > self.dedup_window:
+                self._recent.popitem(last=False)
+            self._buffer.append(ligne)
+            ecrits += 1
+            if len(self._buffer) >= self.buffer_size:
+                self.flush()
+
+        self.stats["written"] += ecrits
+        if self.grapher.cached_term_count > self.term_cache_size:
+            self.grapher.clear_term_cache()
+        return ecrits
+
+    def flush(self):
+        """Écrit les lignes en attente dans le fichier."""
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer = []
+        self._file.flush()
+
+    def close(self):
+        """Écrit les lignes en attente puis ferme le fichier."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,294 @@
+"""
+Ce module fournit la classe OfflineTitleIndex, un résolveur d'entités hors ligne pour
+`EntityLinker` : les libellés et redirections de DBpedia sont compilés une fois dans un
+fichier trié (forme normalisée → ressource canonique), lu ensuite par projection en mémoire
+(mmap) et recherche dichotomique, sans aucun accès réseau.
+
+Construction de l'index :
+    python -m py.offline_linker build titles.idx --labels labels_lang=en.ttl.bz2 \
+        --redirects redirects_lang=en.ttl.bz2 --disambiguations disambiguations_lang=en.ttl.bz2
+"""
+
+import argparse
+import mmap
+import re
+import struct
+import sys
+import time
+import unicodedata
+from array import array
+from py.entity_linker import DBPEDIA_RESOURCE, DISAMBIGUATION, FOUND, MISSING
+from py.local_dbpedia import iter_ntriples, open_dump
+
+MAGIC = b"KGTI1\n"
+HEADER = struct.Struct("<6sQ")
+
+# Nature de la valeur d'un enregistrement
+NOM_DBPEDIA = b"F"  # nom local d'une ressource DBpedia
+URI_COMPLETE = b"U"  # URI hors de l'espace de noms DBpedia
+HOMONYMIE = b"D"  # page d'homonymie
+
+LABEL = "http://www.w3.org/2000/01/rdf-schema#label"
+REDIRECT = "http://dbpedia.org/ontology/wikiPageRedirects"
+DISAMBIGUATES = "http://dbpedia.org/ontology/wikiPageDisambiguates"
+
+# Un triplet N-Triples dont l'objet est un littéral, avec sa langue éventuelle
+TRIPLET_LITTERAL = re.compile(
+    r'^<([^>]*)>\s+<([^>]*)>\s+"((?:[^"\\]|\\.)*)"(?:@([A-Za-z0-9-]+)|\^\^<[^>]*>)?\s*\.\s*$'
+)
+ECHAPPEMENT = re.compile(r"\\(u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)")
+ECHAPPEMENTS_SIMPLES = {"t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f"}
+
+
+def normalize_title(surface_form):
+    """Normalise une forme de surface pour la recherche dans l'index.
+
+    Args:
+        surface_form (str): Le texte de l'entité, ou un titre de page.
+
+    Returns:
+        str: La forme en minuscules (casefold, NFKC), les soulignés remplacés par des
+             espaces et les espaces successifs réduits à un seul.
+    """
+    forme = unicodedata.normalize("NFKC", surface_form).replace("_", " ").casefold()
+    return " ".join(forme.split())
+
+
+def _unescape(litteral):
+    """Décode les séquences d'échappement d'un littéral N-Triples."""
+
+    def remplacer(match):
+        sequence = match.group(1)
+        if sequence[0] in "uU" and len(sequence) > 1:
+            return chr(int(sequence[1:], 16))
+        return ECHAPPEMENTS_SIMPLES.get(sequence, sequence)
+
+    return ECHAPPEMENT.sub(remplacer, litteral)
+
+
+def iter_labels(lines, lang="en"):
+    """Lit les libellés (rdfs:label) d'une langue dans un dump N-Triples.
+
+    Args:
+        lines (Iterable[str]): Les lignes du dump.
+        lang (str): La langue gardée ; les libellés sans langue sont aussi gardés.
+
+    Yields:
+        Tuple[str, str]: Les paires (URI de la ressource, libellé).
+    """
+    for line in lines:
+        match = TRIPLET_LITTERAL.match(line)
+        if match and match.group(2) == LABEL and match.group(4) in (None, lang):
+            yield match.group(1), _unescape(match.group(3))
+
+
+def _encode_value(uri, homonymie):
+    if homonymie:
+        return HOMONYMIE + uri.encode("utf-8")
+    if uri.startswith(DBPEDIA_RESOURCE):
+        return NOM_DBPEDIA + uri[len(DBPEDIA_RESOURCE) :].encode("utf-8")
+    return URI_COMPLETE + uri.encode("utf-8")
+
+
+def write_index(path, entries):
+    """Écrit l'index trié sur disque.
+
+    Format : un en-tête (MAGIC, nombre d'entrées), les positions de début des
+    enregistrements (uint64 dans l'ordre d'octets de la machine, une de plus que le nombre
+    d'entrées), puis les enregistrements `forme\\tnature+valeur` triés par forme (octets UTF-8).
+
+    Args:
+        path (str): Le fichier de l'index.
+        entries (dict): La ressource canonique de chaque forme normalisée, sous la forme
+                        {forme: (uri, homonymie)}.
+
+    Returns:
+        int: Le nombre d'entrées écrites.
+    """
+    enregistrements = sorted(
+        (forme.encode("utf-8"), _encode_value(uri, homonymie))
+        for forme, (uri, homonymie) in entries.items()
+    )
+    positions = array("Q")
+    position = 0
+    for cle, valeur in enregistrements:
+        positions.append(position)
+        position += len(cle) + 1 + len(valeur)
+    positions.append(position)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(enregistrements)))
+        positions.tofile(f)
+        for cle, valeur in enregistrements:
+            f.write(cle + b"\t" + valeur)
+    return len(enregistrements)
+
+
+def build(path, labels=(), redirects=(), disambiguations=(), lang="en"):
+    """Construit l'index à partir des dumps DBpedia.
+
+    Chaque ressource est indexée par son nom local et ses libellés. Une page de redirection
+    pointe vers sa cible ; à forme égale, un libellé direct l'emporte sur une redirection.
+
+    Args:
+        path (str): Le fichier de l'index.
+        labels (Iterable[str]): Les dumps de libellés (rdfs:label).
+        redirects (Iterable[str]): Les dumps de redirections (dbo:wikiPageRedirects).
+        disambiguations (Iterable[str]): Les dumps d'homonymies (dbo:wikiPageDisambiguates).
+        lang (str): La langue des libellés gardés.
+
+    Returns:
+        int: Le nombre d'entrées de l'index.
+    """
+    cibles = {}
+    for dump in redirects:
+        with open_dump(dump) as lines:
+            for sujet, predicat, objet in iter_ntriples(lines):
+                if predicat == REDIRECT:
+                    cibles[sujet] = objet
+    homonymies = set()
+    for dump in disambiguations:
+        with open_dump(dump) as lines:
+            for sujet, predicat, _ in iter_ntriples(lines):
+                if predicat == DISAMBIGUATES:
+                    homonymies.add(sujet)
+
+    def canonique(uri):
+        # Les chaînes de redirections sont suivies sur quelques sauts au plus
+        for _ in range(5):
+            if uri not in cibles:
+                break
+            uri = cibles[uri]
+        return uri
+
+    # forme -> (priorité, uri) : 0 pour un libellé direct, 1 pour une redirection
+    formes = {}
+
+    def ajouter(forme, uri, priorite):
+        forme = normalize_title(forme)
+        if forme and (forme not in formes or priorite < formes[forme][0]):
+            formes[forme] = (priorite, uri)
+
+    def nom_local(uri):
+        return uri[len(DBPEDIA_RESOURCE) :] if uri.startswith(DBPEDIA_RESOURCE) else ""
+
+    for dump in labels:
+        with open_dump(dump) as lines:
+            for uri, libelle in iter_labels(lines, lang):
+                priorite = 1 if uri in cibles else 0
+                ajouter(libelle, canonique(uri), priorite)
+                ajouter(nom_local(uri), canonique(uri), priorite)
+    for source in cibles:
+        ajouter(nom_local(source), canonique(source), 1)
+
+    return write_index(
+        path,
+        {forme: (uri, uri in homonymies) for forme, (_, uri) in formes.items()},
+    )
+
+
+class OfflineTitleIndex:
+    """
+    Index hors ligne des titres DBpedia, utilisable comme résolveur d'un `EntityLinker`.
+
+    Le fichier est projeté en mémoire : seules les pages lues par la recherche dichotomique
+    sont chargées, et elles sont partagées entre les processus qui ouvrent le même index.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Le fichier construit par `python -m py.offline_linker build`.
+
+        Raises:
+            ValueError: Si le fichier n'est pas un index de titres.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} n'est pas un index de titres.")
+        debut = HEADER.size
+        self._positions = memoryview(self._mmap)[
+            debut : debut + 8 * (self._count + 1)
+        ].cast("Q")
+        self._donnees = debut + 8 * (self._count + 1)
+
+    def __len__(self):
+        return self._count
+
+    def __record(self, i):
+        debut = self._donnees + self._positions[i]
+        return self._mmap[debut : self._donnees + self._positions[i + 1]]
+
+    def lookup(self, surface_form):
+        """Cherche la ressource d'une forme de surface.
+
+        Args:
+            surface_form (str): Le texte de l'entité.
+
+        Returns:
+            Tuple[bytes, str]: La nature de la valeur (NOM_DBPEDIA, URI_COMPLETE ou HOMONYMIE)
+                               et l'URI, ou None si la forme est absente.
+        """
+        cle = normalize_title(surface_form).encode("utf-8") + b"\t"
+        bas, haut = 0, self._count
+        while bas < haut:
+            milieu = (bas + haut) // 2
+            enregistrement = self.__record(milieu)
+            if enregistrement[: len(cle)] == cle:
+                nature = enregistrement[len(cle) : len(cle) + 1]
+                valeur = enregistrement[len(cle) + 1 :].decode("utf-8")
+                if nature == NOM_DBPEDIA:
+                    valeur = DBPEDIA_RESOURCE + valeur
+                return nature, valeur
+            if enregistrement.split(b"\t", 1)[0] < cle[:-1]:
+                bas = milieu + 1
+            else:
+                haut = milieu
+        return None
+
+    def __call__(self, candidate_entity):
+        """Résout une entité, sur le modèle de `py.entity_linker.wikipedia_resolver`.
+
+        Args:
+            candidate_entity (str): L'entité à relier.
+
+        Returns:
+            Tuple[str, str]: L'issue (FOUND, MISSING ou DISAMBIGUATION) et l'URI DBpedia
+                             si la ressource a été trouvée, sinon None.
+        """
+        resultat = self.lookup(candidate_entity)
+        if resultat is None:
+            return MISSING, None
+        if resultat[0] == HOMONYMIE:
+            return DISAMBIGUATION, None
+        return FOUND, resultat[1]
+
+    def close(self):
+        """Libère la projection en mémoire."""
+        self._positions.release()
+        self._mmap.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m py.offline_linker")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+    commande_build = commandes.add_parser(
+        "build", help="Construit l'index des titres à partir des dumps DBpedia."
+    )
+    commande_build.add_argument("index", help="Fichier de l'index à créer.")
+    commande_build.add_argument("--labels", nargs="*", default=[])
+    commande_build.add_argument("--redirects", nargs="*", default=[])
+    commande_build.add_argument("--disambiguations", nargs="*", default=[])
+    commande_build.add_argument("--lang", default="en")
+    args = parser.parse_args(argv)
+
+    debut = time.perf_counter()
+    n = build(args.index, args.labels, args.redirects, args.disambiguations, args.lang)
+    print(f"{args.index} : {n} formes en {time.perf_counter() - debut:.1f} s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,258 @@
+"""
+Ce module fournit la classe DocumentPipeline, qui enchaîne les étapes de l'extraction
+(co-références → REBEL → liaison des entités → enrichissement → graphe) en pipeline :
+chaque étape a ses propres tâches et une file bornée la sépare de la suivante, si bien que
+le document N+1 passe dans REBEL pendant que le document N est enrichi.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+from py.rdf_grapher import RDFGrapher
+
+STAGES = ("coref", "rebel", "linking", "enrichment", "graph")
+
+# Nombre de documents traités en même temps par étape ; REBEL occupe le CPU (ou le GPU),
+# les autres étapes attendent surtout le réseau
+DEFAULT_CONCURRENCY = {
+    "coref": 4,
+    "rebel": 1,
+    "linking": 4,
+    "enrichment": 2,
+    "graph": 1,
+}
+
+
+class DocumentResult(NamedTuple):
+    """Le résultat du pipeline pour un document."""
+
+    index: int
+    text: str
+    resolved_text: str
+    triplets: list
+    graph: object
+    error: str
+
+
+def build_graph(triplets):
+    """Construit le graphe rdflib d'un document avec un `RDFGrapher` neuf.
+
+    Args:
+        triplets (List[Tuple]): Les triplets enrichis.
+
+    Returns:
+        Graph: Le graphe du document.
+    """
+    rdfgraphe = RDFGrapher()
+    return rdfgraphe.get_final_graph(rdfgraphe.transform_triplets_to_rdflib(triplets))
+
+
+class StageMetrics:
+    """
+    Compteurs d'une étape : documents traités, erreurs, temps de travail cumulé et
+    profondeur de sa file d'entrée, échantillonnée à chaque document reçu.
+    """
+
+    def __init__(self):
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+
+    def sample_queue_depth(self, depth):
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+
+    def summary(self, elapsed):
+        """Résumé des compteurs.
+
+        Args:
+            elapsed (float): La durée, en secondes, de l'exécution du pipeline.
+
+        Returns:
+            dict: Documents traités, erreurs, débit (documents par seconde), temps de
+                  travail cumulé, profondeur moyenne et maximale de la file d'entrée.
+        """
+        return {
+            "processed": self.processed,
+            "errors": self.errors,
+            "docs_per_sec": self.processed / elapsed if elapsed else 0.0,
+            "busy_seconds": self.busy_seconds,
+            "mean_queue_depth": (
+                self._depth_total / self._depth_samples if self._depth_samples else 0.0
+            ),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+class DocumentPipeline:
+    """
+    Exécute le traitement complet d'une suite de documents en pipeline asynchrone.
+
+    REBEL tourne dans un pool de threads dédié (PyTorch libère le GIL pendant l'inférence) ;
+    les étapes réseau tournent dans le pool de threads par défaut d'asyncio. Un document en
+    erreur garde son message dans `DocumentResult.error` et saute les étapes suivantes.
+    """
+
+    def __init__(
+        self,
+        kge,
+        coref=None,
+        graph_builder=build_graph,
+        queue_size=4,
+        concurrency=None,
+    ):
+        """
+        Args:
+            kge (KnowledgeGraphExtractor): L'extracteur (REBEL, liaison, enrichissement).
+            coref (Callable[[str], str], optional): La résolution des co-références, par
+                                                    exemple `coreference_resolver` ; le texte
+                                                    est gardé tel quel si None.
+            graph_builder (Callable[[List[Tuple]], Graph]): Construit le graphe d'un document.
+            queue_size (int): Taille maximale de chaque file entre deux étapes.
+            concurrency (dict, optional): Nombre de tâches par étape, complète
+                                          `DEFAULT_CONCURRENCY`.
+
+        Raises:
+            ValueError: Si une étape inconnue ou un nombre de tâches non positif est donné.
+        """
+        self.concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        if set(self.concurrency) != set(STAGES) or min(self.concurrency.values()) < 1:
+            raise ValueError(
+                f"Les étapes sont {STAGES}, avec au moins une tâche chacune."
+            )
+        self.kge = kge
+        self.coref = coref
+        self.graph_builder = graph_builder
+        self.queue_size = queue_size
+        self.stage_metrics = {stage: StageMetrics() for stage in STAGES}
+        self.elapsed = 0.0
+        self.n_documents = 0
+
+    def __stage_functions(self):
+        """Les fonctions de chaque étape : (champ lu, champ écrit, fonction)."""
+        return {
+            "coref": ("text", "resolved_text", self.coref or (lambda texte: texte)),
+            "rebel": ("resolved_text", "triplets", self.kge.extract_triplet),
+            "linking": ("triplets", "triplets", self.kge.transform_to_rdf_triplet),
+            "enrichment": ("triplets", "triplets", self.kge.enrichir_graph),
+            "graph": ("triplets", "graph", self.graph_builder),
+        }
+
+    async def __worker(self, stage, etape, entree, sortie, executor):
+        """Tâche d'une étape : applique sa fonction aux documents de sa file d'entrée."""
+        champ_lu, champ_ecrit, fonction = etape
+        metriques = self.stage_metrics[stage]
+        boucle = asyncio.get_running_loop()
+        while True:
+            document = await entree.get()
+            if document is None:
+                return
+            metriques.sample_queue_depth(entree.qsize())
+            if document.error is None:
+                debut = time.perf_counter()
+                try:
+                    valeur = await boucle.run_in_executor(
+                        executor, fonction, getattr(document, champ_lu)
+                    )
+                    document = document._replace(**{champ_ecrit: valeur})
+                except Exception as e:
+                    metriques.errors += 1
+                    document = document._replace(error=f"{stage}: {e!r}")
+                metriques.busy_seconds += time.perf_counter() - debut
+                metriques.processed += 1
+            await sortie.put(document)
+
+    async def __stage(self, stage, entree, sortie, executor):
+        """Lance les tâches d'une étape puis signale sa fin à l'étape suivante."""
+        etape = self.__stage_functions()[stage]
+        await asyncio.gather(
+            *(
+                self.__worker(stage, etape, entree, sortie, executor)
+                for _ in range(self.concurrency[stage])
+            )
+        )
+        suivante = STAGES.index(stage) + 1
+        for _ in range(
+            self.concurrency[STAGES[suivante]] if suivante < len(STAGES) else 1
+        ):
+            await sortie.put(None)
+
+    async def run(self, textes):
+        """Traite une suite de documents.
+
+        Args:
+            textes (Iterable[str]): Les documents.
+
+        Returns:
+            List[DocumentResult]: Le résultat de chaque document, dans l'ordre d'entrée.
+        """
+        self.stage_metrics = {stage: StageMetrics() for stage in STAGES}
+        files = [asyncio.Queue(self.queue_size) for _ in range(len(STAGES) + 1)]
+        debut = time.perf_counter()
+
+        async def alimenter():
+            for index, texte in enumerate(textes):
+                await files[0].put(DocumentResult(index, texte, None, None, None, None))
+            for _ in range(self.concurrency[STAGES[0]]):
+                await files[0].put(None)
+
+        resultats = []
+
+        async def collecter():
+            while True:
+                document = await files[-1].get()
+                if document is None:
+                    break
+                resultats.append(document)
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency["rebel"], thread_name_prefix="rebel"
+        ) as executor_rebel:
+            await asyncio.gather(
+                alimenter(),
+                *(
+                    self.__stage(
+                        stage,
+                        files[i],
+                        files[i + 1],
+                        executor_rebel if stage == "rebel" else None,
+                    )
+                    for i, stage in enumerate(STAGES)
+                ),
+                collecter(),
+            )
+        self.elapsed = time.perf_counter() - debut
+        self.n_documents = len(resultats)
+        return sorted(resultats, key=lambda document: document.index)
+
+    def process(self, textes):
+        """Version synchrone de `run`, pour un appelant hors boucle asyncio.
+
+        Args:
+            textes (Iterable[str]): Les documents.
+
+        Returns:
+            List[DocumentResult]: Le résultat de chaque document, dans l'ordre d'entrée.
+        """
+        return asyncio.run(self.run(textes))
+
+    def metrics(self):
+        """Métriques de la dernière exécution.
+
+        Returns:
+            dict: Le résumé de chaque étape (voir `StageMetrics.summary`), la durée totale
+                  et le débit de bout en bout.
+        """
+        return {
+            "stages": {
+                stage: metriques.summary(self.elapsed)
+                for stage, metriques in self.stage_metrics.items()
+            },
+            "elapsed": self.elapsed,
+            "docs_per_sec": self.n_documents / self.elapsed if self.elapsed else 0.0,
+        }
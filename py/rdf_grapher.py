@@ -3,13 +3,105 @@ Ce module fournit la classe RDFGrapher pour créer et visualiser des graphes RDF
 à partir de triplets d'entrée.
 """
 
+from datetime import datetime
+from functools import lru_cache
 from rdflib import Graph, Namespace, Literal
-from IPython.display import display, Image
-from rdflib.tools.rdf2dot import rdf2dot
+from rdflib.namespace import XSD
 from dateutil.parser import parse
-import pydotplus
-import tempfile
+from py.graph_renderer import render as render_graph
 import os
+import re
+
+# Filtres rapides appliqués avant toute analyse de date par dateutil. Un nombre écrit avec
+# des zéros en tête (code postal, identifiant...) n'est pas typé : il perdrait ses zéros
+ANNEE = re.compile(r"^\d{4}$")
+ENTIER = re.compile(r"^[+-]?(?:[1-9]\d{0,2}(?:,\d{3})+|[1-9]\d*|0)$")
+DECIMAL = re.compile(r"^[+-]?(?:[1-9]\d{0,2}(?:,\d{3})+|[1-9]\d*|0)\.\d+$")
+DATE_NUMERIQUE = re.compile(r"^\d{1,4}[-/.]\d{1,2}(?:[-/.]\d{1,4})?$")
+MOIS = re.compile(
+    r"\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|"
+    r"aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b",
+    re.IGNORECASE,
+)
+
+# Caractères interdits dans une IRI (RFC 3987) et dans une IRI N-Triples
+IRI_INTERDITS = re.compile(r'[\x00-\x20<>"{}|^`\\]')
+
+# Un nombre de 4 chiffres n'est une année (xsd:gYear) que dans cet intervalle : en dehors,
+# c'est un effectif, une population ou une référence (1024...)
+ANNEE_MIN = 1500
+ANNEE_MAX = datetime.now().year + 10
+
+# Deux dates par défaut différentes révèlent les champs absents de la chaîne analysée
+DEFAUT_1 = datetime(1, 1, 1)
+DEFAUT_2 = datetime(2, 2, 2)
+
+DATE_TYPES = (XSD.date, XSD.gYearMonth, XSD.gYear)
+
+# Espaces de noms partagés par tous les RDFGrapher du processus
+EX = Namespace("http://example.org/")
+DB = Namespace("http://dbpedia.org/resource/")
+
+
+def escape_iri(iri: str) -> str:
+    """
+    Encode en pourcentage (UTF-8) les caractères interdits dans une IRI.
+
+    Le caractère % n'est pas encodé : une IRI déjà valide est rendue telle quelle, et
+    l'encodage appliqué deux fois ne change plus rien.
+
+    Args:
+        iri (str): L'IRI, éventuellement invalide.
+
+    Returns:
+        str: L'IRI valide.
+    """
+    return IRI_INTERDITS.sub(
+        lambda m: "".join(f"%{octet:02X}" for octet in m[0].encode("utf-8")), iri
+    )
+
+
+@lru_cache(maxsize=65536)
+def classify_literal(element: str):
+    """
+    Classe un littéral : date, année, nombre ou simple chaîne.
+
+    Les expressions régulières écartent la plupart des chaînes avant l'analyse, plus
+    coûteuse, de dateutil ; les résultats sont gardés en cache.
+
+    Args:
+        element (str): Le littéral brut (une queue de triplet REBEL par exemple).
+
+    Returns:
+        Tuple[str, URIRef]: La forme lexicale et le type XSD (xsd:date, xsd:gYearMonth,
+                            xsd:gYear, xsd:integer ou xsd:decimal), ou (element, None)
+                            pour une simple chaîne.
+    """
+    texte = element.strip()
+    if ANNEE.match(texte) and ANNEE_MIN <= int(texte) <= ANNEE_MAX:
+        return texte, XSD.gYear
+    if ENTIER.match(texte):
+        return str(int(texte.replace(",", ""))), XSD.integer
+    if DECIMAL.match(texte):
+        return texte.replace(",", ""), XSD.decimal
+    if not any(c.isdigit() for c in texte) or not (
+        DATE_NUMERIQUE.match(texte) or MOIS.search(texte)
+    ):
+        return element, None
+
+    try:
+        date_1 = parse(texte, default=DEFAUT_1)
+        date_2 = parse(texte, default=DEFAUT_2)
+    except (ValueError, OverflowError):
+        return element, None
+    if date_1.year != date_2.year or date_1.time() != date_2.time():
+        # Sans année (ou avec une heure), ce n'est pas une date du calendrier
+        return element, None
+    if date_1.month != date_2.month:
+        return f"{date_1.year:04d}", XSD.gYear
+    if date_1.day != date_2.day:
+        return f"{date_1.year:04d}-{date_1.month:02d}", XSD.gYearMonth
+    return date_1.date().isoformat(), XSD.date
 
 
 class RDFGrapher:
@@ -17,14 +109,28 @@ class RDFGrapher:
     Classe pour gérer la création et la visualisation de graphes RDF.
     """
 
-    def __init__(self):
+    def __init__(self, store_path: str = None):
         """
         Initialise un nouvel objet RDFGrapher avec des espaces de noms prédéfinis
         et un graphe RDF vide.
+
+        Args:
+            store_path (str, optional): Fichier SQLite d'un store persistant (voir
+                                        py.graph_store) ; le graphe est en mémoire si None.
         """
-        self.EX = Namespace("http://example.org/")
-        self.DB = Namespace("http://dbpedia.org/resource/")
-        self.g = Graph()
+        self.EX = EX
+        self.DB = DB
+        if store_path is None:
+            self.store = None
+            self.g = Graph()
+        else:
+            from py.graph_store import GraphStore
+
+            self.store = GraphStore(store_path)
+            self.g = Graph(store=self.store)
+        # Termes rdflib déjà créés, par élément brut : chaque élément n'est traité qu'une fois
+        self._terms = {}
+        self._predicates = {}
 
     def __is_uri__(self, uri: str) -> bool:
         """
@@ -48,19 +154,8 @@ class RDFGrapher:
         Returns:
             bool: True si l'élément est un littéral, sinon False.
         """
-        if self.is_date(element):
-            # Si c'est une date valide, on le considère comme un littéral
-            date_object = parse(element)
-            date_without_time = date_object.strftime(
-                "%Y-%m-%d"
-            )  # Format ISO 8601 pour la date
-            return True
-
-        if "http://" in element:
-            # Si c'est une URI, ce n'est pas un littéral
-            return False
-
-        return True
+        # Une URI n'est pas un littéral ; tout le reste (dates comprises) en est un
+        return not self.__is_uri__(element)
 
     def is_date(self, date_str: str) -> bool:
         """
@@ -70,85 +165,167 @@ class RDFGrapher:
             date_str (str): La chaîne à vérifier.
 
         Returns:
-            bool: True si c'est une date valide, sinon False.
+            bool: True si c'est une date, un mois ou une année, sinon False.
         """
-        try:
-            parse(date_str)
-            return True
-        except ValueError:
-            return False
+        return classify_literal(date_str)[1] in DATE_TYPES
 
-    def __transform_to_rdflibURIs(self, triplet_list):
+    @staticmethod
+    def __normalize(element: str) -> str:
         """
-        Transforme les triplets d'entrée en triplets RDF.
+        Normalise un élément de triplet avant sa conversion en terme RDF.
 
         Args:
-            triplet_list (list): Liste de triplets à transformer.
+            element (str): L'élément brut (sujet, prédicat ou objet).
+
+        Returns:
+            str: L'élément sans espaces (remplacés par des soulignés) ni apostrophes.
+        """
+        return element.replace(" ", "_").replace("'", "").strip()
+
+    def __term(self, element):
+        """
+        Donne le terme rdflib (URIRef ou Literal) d'un sujet ou d'un objet, créé une seule fois.
+
+        Args:
+            element (str): L'élément brut.
 
         Returns:
-            dict: Un dictionnaire associant les éléments aux URIs ou littéraux correspondants.
-        """
-        my_set = {
-            element.replace(" ", "_").replace("'", "").strip()
-            for tple in triplet_list
-            for element in (tple[0], tple[2])
-        }
-        my_dict = {}
-        for element in my_set:
+            Node: L'URI ou le littéral correspondant.
+        """
+        term = self._terms.get(element)
+        if term is None:
+            normalise = self.__normalize(element)
             # Vérification si l'élément est une URI
-            if self.__is_uri__(element):
-                element_plitted = element.split("/")[
-                    -1
-                ]  # Extrait le dernier segment de l'URL
-                if "http://dbpedia.org" in element:
-                    my_dict[element] = self.DB[element_plitted]
+            if self.__is_uri__(normalise):
+                element_plitted = escape_iri(
+                    normalise.split("/")[-1]
+                )  # Extrait le dernier segment de l'URL
+                if "http://dbpedia.org" in normalise:
+                    term = self.DB[element_plitted]
                 else:
-                    my_dict[element] = self.EX[element_plitted]
+                    term = self.EX[element_plitted]
             else:
-                my_dict[element] = Literal(element)
-        return my_dict
+                valeur, datatype = classify_literal(element)
+                if datatype is None:
+                    term = Literal(normalise)
+                else:
+                    term = Literal(valeur, datatype=datatype)
+            self._terms[element] = term
+        return term
 
-    def transform_triplets_to_rdflib(self, triplet_list):
+    def __predicate(self, predicat):
         """
-        Transforme les triplets d'entrée en objets RDFLib.
+        Donne l'URI rdflib d'un prédicat, créée une seule fois.
 
         Args:
-            triplet_list (list): Liste de triplets à transformer.
+            predicat (str): Le prédicat brut.
 
         Returns:
-            list: Liste de triplets modifiés au format RDFLib.
+            URIRef: L'URI du prédicat.
         """
-        my_dict = self.__transform_to_rdflibURIs(triplet_list)
-        modified_triplet_list = []
-        for a_tuple in triplet_list:
-            # Transformation des sujets et objets en RDFLib
-            subject = my_dict[a_tuple[0].replace(" ", "_").replace("'", "").strip()]
-            object_ = my_dict[a_tuple[2].replace(" ", "_").replace("'", "").strip()]
-
+        term = self._predicates.get(predicat)
+        if term is None:
             # Extraction du dernier segment du prédicat et transformation en URIRef
-            predicat = a_tuple[1]
-            predicat_splitted = (
+            predicat_splitted = escape_iri(
                 predicat.split("/")[-1].replace(" ", "_").replace("'", "")
             )
-
             if "http://dbpedia.org" in predicat:
-                predicat = self.DB[predicat_splitted]
+                term = self.DB[predicat_splitted]
             else:
-                predicat = self.EX[predicat_splitted]
+                term = self.EX[predicat_splitted]
+            self._predicates[predicat] = term
+        return term
 
-            modified_triplet_list.append((subject, predicat, object_))
+    @property
+    def cached_term_count(self):
+        """
+        Returns:
+            int: Le nombre de sujets et d'objets déjà convertis et gardés en cache.
+        """
+        return len(self._terms)
 
-        return modified_triplet_list
+    def clear_term_cache(self):
+        """
+        Oublie les termes et prédicats déjà convertis, pour borner la mémoire sur un long flux.
+        """
+        self._terms.clear()
+        self._predicates.clear()
 
-    def __add_all_triplets_to_graph(self, triplet_list):
+    def __iter_rdflib(self, triplet_list):
         """
-        Ajoute tous les triplets à l'objet graphe RDF.
+        Convertit les triplets en objets RDFLib au fil de l'eau.
 
         Args:
-            triplet_list (list): Liste de triplets à ajouter au graphe.
+            triplet_list (Iterable): Les triplets à transformer.
+
+        Yields:
+            Tuple: Les triplets (sujet, prédicat, objet) au format RDFLib.
         """
+        term = self.__term
+        predicate = self.__predicate
         for a_tuple in triplet_list:
-            self.g.add(a_tuple)
+            yield term(a_tuple[0]), predicate(a_tuple[1]), term(a_tuple[2])
+
+    def transform_triplets_to_rdflib(self, triplet_list):
+        """
+        Transforme les triplets d'entrée en objets RDFLib.
+
+        Chaque élément distinct n'est normalisé et converti qu'une fois : les triplets
+        qui le partagent reçoivent le même objet rdflib.
+
+        Args:
+            triplet_list (list): Liste de triplets à transformer.
+
+        Returns:
+            list: Liste de triplets modifiés au format RDFLib.
+        """
+        return list(self.__iter_rdflib(triplet_list))
+
+    def __add_all_triplets_to_graph(self, triplet_list):
+        """
+        Ajoute tous les triplets à l'objet graphe RDF, en une seule insertion groupée.
+
+        Args:
+            triplet_list (Iterable): Triplets RDFLib à ajouter au graphe.
+        """
+        graphe = self.g
+        self.g.addN((s, p, o, graphe) for s, p, o in triplet_list)
+
+    def add_triplets(self, triplet_list):
+        """
+        Convertit et ajoute des triplets bruts au graphe, sans liste intermédiaire.
+
+        Équivaut à `get_final_graph(transform_triplets_to_rdflib(triplet_list))`.
+
+        Args:
+            triplet_list (Iterable): Triplets (sujet, prédicat, objet) à ajouter.
+
+        Returns:
+            Graph: L'objet Graph contenant tous les triplets.
+        """
+        self.__add_all_triplets_to_graph(self.__iter_rdflib(triplet_list))
+        return self.g
+
+    def upsert_document(self, document_id, triplet_list):
+        """
+        Convertit les triplets bruts d'un document et remplace ceux qu'il avait dans le
+        store persistant ; les triplets partagés avec d'autres documents ne sont pas dupliqués.
+
+        Args:
+            document_id (str): L'identifiant du document.
+            triplet_list (Iterable): Triplets (sujet, prédicat, objet) du document.
+
+        Returns:
+            Tuple[int, int]: Le nombre de triplets ajoutés au store et supprimés du store.
+
+        Raises:
+            ValueError: Si le graphe n'a pas de store persistant.
+        """
+        if self.store is None:
+            raise ValueError(
+                "upsert_document nécessite un store persistant (store_path)."
+            )
+        return self.store.upsert_document(document_id, self.__iter_rdflib(triplet_list))
 
     def get_final_graph(self, triplet_list):
         """
@@ -164,13 +341,31 @@ class RDFGrapher:
         return self.g
 
     @staticmethod
-    def visualize(g: Graph, image_name: str):
+    def visualize(
+        g: Graph,
+        image_name: str,
+        format: str = "png",
+        max_nodes: int = 150,
+        focus: str = None,
+        renderer=None,
+    ):
         """
-        Visualise le graphe RDF en générant une image PNG et en l'enregistrant dans un dossier spécifié.
+        Visualise le graphe RDF en générant une image et en l'enregistrant dans un dossier spécifié.
+
+        Le DOT est produit en mémoire et les gros graphes sont réduits à `max_nodes` nœuds
+        (voir py.graph_renderer) avant le rendu.
 
         Args:
             g (Graph): L'objet Graph à visualiser.
             image_name (str): Le nom du fichier d'image à enregistrer (sans extension).
+            format (str): "png", "svg", "html" (interactif, avec pyvis) ou "dot".
+            max_nodes (int, optional): Nombre maximal de nœuds affichés ; tous si None.
+            focus (str, optional): L'URI de l'entité dont le voisinage est affiché.
+            renderer (GraphRenderer, optional): Exécute le rendu en arrière-plan avec un délai
+                                                maximal ; rendu direct si None.
+
+        Returns:
+            str: Le chemin du fichier enregistré.
         """
         # Définir le chemin du dossier de sortie
         output_directory = "resultat_graph"
@@ -179,16 +374,24 @@ class RDFGrapher:
         os.makedirs(output_directory, exist_ok=True)
 
         # Chemin complet du fichier image
-        output_file_path = os.path.join(output_directory, f"{image_name}.png")
-
-        # Utilisation d'un fichier temporaire pour le graphe
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as temp_dot:
-            rdf2dot(g, temp_dot)
-            temp_dot.flush()
-            dg = pydotplus.graph_from_dot_file(temp_dot.name)
-
-            # Enregistrer le graphe en image PNG dans le dossier spécifié
-            dg.write_png(output_file_path)
+        output_file_path = os.path.join(output_directory, f"{image_name}.{format}")
+
+        if renderer is None:
+            rendu = render_graph(g, format, max_nodes, focus)
+        else:
+            rendu = renderer.render(g, format, focus, max_nodes=max_nodes)
+        if isinstance(rendu, bytes):
+            with open(output_file_path, "wb") as f:
+                f.write(rendu)
+        else:
+            with open(output_file_path, "w", encoding="utf-8") as f:
+                f.write(rendu)
 
         # Optionnel : afficher l'image dans l'environnement Jupyter (si nécessaire)
-        display(Image(output_file_path))
+        from IPython.display import display, Image, SVG
+
+        if format == "png":
+            display(Image(output_file_path))
+        elif format == "svg":
+            display(SVG(rendu))
+        return output_file_path
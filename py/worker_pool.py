@@ -0,0 +1,236 @@
+"""
+Ce module fournit la classe RebelWorkerPool pour répartir l'extraction de triplets
+sur plusieurs processus, chacun possédant son propre pipeline Spacy + REBEL.
+"""
+
+import atexit
+import multiprocessing
+import os
+import queue
+
+
+def _worker(nlp, kge_kwargs, n_threads, taches, resultats):
+    """Boucle d'un processus worker : extrait les triplets des documents reçus.
+
+    Args:
+        nlp (Language): Le pipeline hérité du parent (fork), ou None s'il faut le charger.
+        kge_kwargs (dict): Les paramètres du KnowledgeGraphExtractor à recréer si besoin.
+        n_threads (int): Nombre de threads PyTorch alloués à ce worker.
+        taches (Queue): File des documents (appel, index, texte) ; None demande l'arrêt.
+        resultats (Queue): File des résultats (appel, index, doc sérialisé, relations,
+                           erreur).
+    """
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    import torch
+
+    torch.set_num_threads(n_threads)
+    if nlp is None:
+        from py.knowledge_graph_extractor import KnowledgeGraphExtractor
+
+        nlp = KnowledgeGraphExtractor(**kge_kwargs).nlp
+    else:
+        # Une connexion SQLite ne doit pas servir de part et d'autre d'un fork : le cache
+        # des triplets hérité du parent est rouvert avec une connexion propre au worker
+        rebel = nlp.get_pipe("rebel")
+        if rebel.cache is not None:
+            from modules.triplet_cache import TripletCache
+
+            # La connexion héritée est gardée (et jamais utilisée) jusqu'à la fin du worker
+            heritee = rebel.cache
+            rebel.cache = TripletCache(
+                kge_kwargs["rebel_cache_path"], heritee.namespace, heritee.max_entries
+            )
+
+    while True:
+        tache = taches.get()
+        if tache is None:
+            break
+        appel, index, texte = tache
+        try:
+            doc = nlp(texte)
+            # Les Span ne sont pas sérialisables : on renvoie leurs positions en tokens
+            relations = [
+                (
+                    rel["head_span"].start,
+                    rel["head_span"].end,
+                    rel["relation"],
+                    rel["tail_span"].start,
+                    rel["tail_span"].end,
+                )
+                for rel in doc._.rel.values()
+            ]
+            resultats.put(
+                (appel, index, doc.to_bytes(exclude=["user_data"]), relations, None)
+            )
+        except Exception as e:
+            resultats.put((appel, index, None, None, repr(e)))
+
+
+class RebelWorkerPool:
+    """
+    Pool de processus exécutant chacun le pipeline REBEL d'un KnowledgeGraphExtractor.
+
+    Par défaut ("spawn"), chaque worker charge son propre modèle. Avec la méthode de
+    démarrage "fork" (Linux), les workers héritent du modèle déjà chargé par le parent en
+    copie sur écriture ; le parent ne doit alors avoir fait aucune inférence (les threads
+    de torch/OpenMP ne survivent pas au fork et peuvent bloquer les workers), ce qui exclut
+    un extracteur créé avec `warmup=True`.
+    Le nombre de documents en cours de traitement est borné par `max_in_flight`, ce qui
+    limite la mémoire des files et du tampon de réordonnancement.
+    """
+
+    def __init__(self, kge, n_workers=2, max_in_flight=None, start_method=None):
+        """
+        Args:
+            kge (KnowledgeGraphExtractor): L'extracteur dont le pipeline est réparti.
+            n_workers (int): Nombre de processus.
+            max_in_flight (int, optional): Nombre maximal de documents envoyés et pas encore
+                                           rendus, par défaut 4 par worker.
+            start_method (str, optional): "spawn" (par défaut), "forkserver" ou "fork".
+
+        Raises:
+            ValueError: Si le nombre de workers n'est pas strictement positif, ou si "fork"
+                        est demandé pour un pipeline déjà rodé par une inférence.
+        """
+        if n_workers < 1:
+            raise ValueError("Le nombre de workers doit être au moins 1.")
+        if start_method is None:
+            start_method = "spawn"
+        if start_method == "fork" and kge.init_kwargs.get("warmup"):
+            raise ValueError(
+                "Le pipeline a déjà servi à une inférence (warmup=True) : il ne peut pas "
+                "être partagé par fork, utilisez start_method='spawn'."
+            )
+        contexte = multiprocessing.get_context(start_method)
+
+        self.vocab = kge.nlp.vocab
+        self.max_in_flight = max_in_flight or 4 * n_workers
+        self.taches = contexte.Queue()
+        self.resultats = contexte.Queue()
+        n_threads = max(1, (os.cpu_count() or 1) // n_workers)
+        nlp = kge.nlp if start_method == "fork" else None
+        self.workers = [
+            contexte.Process(
+                target=_worker,
+                args=(nlp, kge.init_kwargs, n_threads, self.taches, self.resultats),
+                daemon=True,
+            )
+            for _ in range(n_workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+        self.closed = False
+        # Numéro de l'appel à `imap` en cours : les résultats d'un appel précédent
+        # (abandonné ou interrompu par une erreur) sont reconnus et ignorés
+        self._appel = 0
+        atexit.register(self.close)
+
+    def imap(self, textes):
+        """Extrait les triplets de chaque texte en répartissant les documents sur les workers.
+
+        Args:
+            textes (Iterable[str]): Les documents à analyser.
+
+        Yields:
+            List: Pour chaque document, dans l'ordre d'entrée, la liste de ses triplets
+                  sous la forme (head, relation, tail).
+
+        Raises:
+            RuntimeError: Si un worker échoue sur un document ou s'arrête inopinément.
+        """
+        if self.closed:
+            raise RuntimeError("Le pool de workers est fermé.")
+        self._appel += 1
+        appel = self._appel
+        textes = enumerate(textes)
+        en_cours = 0
+        prochain = 0
+        tampon = {}
+        epuise = False
+
+        while True:
+            # Contre-pression : on n'envoie de nouveaux documents que sous la limite
+            while not epuise and en_cours < self.max_in_flight:
+                try:
+                    index, texte = next(textes)
+                except StopIteration:
+                    epuise = True
+                    break
+                self.taches.put((appel, index, texte.replace("\n", " ").strip()))
+                en_cours += 1
+            if en_cours == 0:
+                return
+
+            appel_resultat, index, donnees, relations, erreur = self.__next_result()
+            if appel_resultat != appel:
+                continue
+            en_cours -= 1
+            if erreur is not None:
+                raise RuntimeError(
+                    f"Le worker a échoué sur le document {index} : {erreur}"
+                )
+            tampon[index] = self.__rebuild_triplets(donnees, relations)
+
+            while prochain in tampon:
+                yield tampon.pop(prochain)
+                prochain += 1
+
+    def __next_result(self):
+        """Attend le prochain résultat en vérifiant que les workers sont toujours vivants.
+
+        Returns:
+            Tuple: (appel, index, doc sérialisé, relations, erreur).
+        """
+        while True:
+            try:
+                return self.resultats.get(timeout=1)
+            except queue.Empty:
+                if any(worker.exitcode is not None for worker in self.workers):
+                    raise RuntimeError("Un worker s'est arrêté de manière inattendue.")
+
+    def __rebuild_triplets(self, donnees, relations):
+        """Reconstruit le document et ses Span à partir du résultat d'un worker.
+
+        Args:
+            donnees (bytes): Le document sérialisé sans ses annotations "rel".
+            relations (List[Tuple]): Les positions (début, fin) des head et tail en tokens.
+
+        Returns:
+            List: La liste des triplets sous la forme (head, relation, tail).
+        """
+        from spacy.tokens import Doc
+
+        doc = Doc(self.vocab).from_bytes(donnees)
+        return [
+            (doc[head_start:head_end], relation, doc[tail_start:tail_end])
+            for head_start, head_end, relation, tail_start, tail_end in relations
+        ]
+
+    def close(self, timeout=10):
+        """Arrête proprement les workers, en les forçant après `timeout` secondes.
+
+        Args:
+            timeout (float): Temps d'attente maximal par worker.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        for _ in self.workers:
+            self.taches.put(None)
+        for worker in self.workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        # Des résultats abandonnés peuvent rester dans les files : on ne les attend pas
+        self.taches.cancel_join_thread()
+        self.resultats.cancel_join_thread()
+        self.taches.close()
+        self.resultats.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
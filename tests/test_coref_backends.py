@@ -0,0 +1,53 @@
+import pytest
+from py.gpt_coref_resolver import coreference_resolver, make_coref_backend
+
+spacy = pytest.importorskip("spacy")
+
+
+@pytest.fixture
+def nlp():
+    # Pipeline sans modèle : les entités viennent de règles, les phrases du sentencizer
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns(
+        [
+            {"label": "PERSON", "pattern": "John"},
+            {"label": "PERSON", "pattern": "Marie Curie"},
+            {"label": "ORG", "pattern": "Microsoft"},
+        ]
+    )
+    return nlp
+
+
+def test_spacy_backend_replaces_pronouns_with_antecedents(nlp):
+    resolver = make_coref_backend("spacy", nlp=nlp)
+
+    assert (
+        resolver.resolve("John is a doctor. He works at a hospital.")
+        == "John is a doctor. John works at a hospital."
+    )
+    assert (
+        resolver.resolve("Microsoft was founded in 1975. Its founder is Bill Gates.")
+        == "Microsoft was founded in 1975. Microsoft's founder is Bill Gates."
+    )
+    assert resolver.resolve_many(
+        ["Marie Curie won a prize. His work was praised.", "He left."]
+    ) == [
+        "Marie Curie won a prize. Marie Curie's work was praised.",
+        "He left.",
+    ]
+
+
+def test_spacy_backend_ignores_distant_antecedents(nlp):
+    resolver = make_coref_backend("spacy", nlp=nlp, max_distance=1)
+    texte = "John is a doctor. The hospital is big. The city is old. He is happy."
+
+    assert resolver.resolve(texte) == texte
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        make_coref_backend("inconnu")
+    with pytest.raises(ValueError):
+        coreference_resolver("   ", backend="spacy")
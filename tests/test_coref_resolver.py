@@ -1,5 +1,9 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 import pytest
-from py.gpt_coref_resolver import coreference_resolver
+from py.gpt_coref_resolver import CorefResolver, coreference_resolver, split_windows
 
 
 def test_coreference_resolver_basic():
@@ -12,3 +16,146 @@ def test_coreference_resolver_basic():
 
     # Vérifier si la co-référence est bien résolue
     assert resolved_text == expected_output, "La résolution de co-référence a échoué."
+
+
+class FakeChatHandler(BaseHTTPRequestHandler):
+    """Imite l'API chat-completions d'OpenAI : renvoie le texte du prompt en majuscules."""
+
+    latency = 0.0
+    fail = False
+    prompts = []
+
+    def do_POST(self):
+        requete = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = requete["messages"][-1]["content"]
+        FakeChatHandler.prompts.append(prompt)
+        time.sleep(self.latency)
+        if self.fail:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        texte = prompt.split('Texte : """', 1)[1].split('"""', 1)[0]
+        body = json.dumps(
+            {
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": requete["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": texte.upper()},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 1,
+                    "completion_tokens": 1,
+                    "total_tokens": 2,
+                },
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    FakeChatHandler.latency = 0.0
+    FakeChatHandler.fail = False
+    FakeChatHandler.prompts = []
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+
+
+def make_resolver(base_url, **kwargs):
+    return CorefResolver(base_url=base_url, api_key="test", max_retries=0, **kwargs)
+
+
+def test_split_windows_keeps_whole_sentences():
+    texte = "John is a doctor. He works at a hospital.  It is in Paris! Is it big?"
+    fenetres = split_windows(texte, max_chars=30, overlap_sentences=1)
+
+    assert [t for _, t, _ in fenetres] == [
+        "John is a doctor.",
+        "He works at a hospital.",
+        "It is in Paris! Is it big?",
+    ]
+    assert [c for c, _, _ in fenetres] == [
+        "",
+        "John is a doctor.",
+        "He works at a hospital.",
+    ]
+    assert "".join(t + s for _, t, s in fenetres) == texte
+
+
+def test_windows_are_resolved_concurrently_and_stitched(base_url):
+    FakeChatHandler.latency = 0.2
+    phrases = [f"Sentence number {i} is here." for i in range(6)]
+    resolver = make_resolver(base_url, max_chars=40, max_concurrency=6)
+
+    debut = time.perf_counter()
+    resolu = resolver.resolve(" ".join(phrases))
+    duree = time.perf_counter() - debut
+
+    assert resolu == " ".join(phrases).upper()
+    assert len(FakeChatHandler.prompts) == 6
+    assert duree < 6 * 0.2 / 2
+    # Chaque fenêtre reçoit la fin de la précédente comme contexte
+    assert any(phrases[0] in p and phrases[1] in p for p in FakeChatHandler.prompts)
+
+
+def test_results_are_cached_on_disk(base_url, tmp_path):
+    chemin = str(tmp_path / "coref.sqlite")
+    texte = "John is a doctor. He works at a hospital."
+    assert make_resolver(base_url, cache_path=chemin).resolve(texte) == texte.upper()
+    n_requetes = len(FakeChatHandler.prompts)
+
+    # Même texte, même modèle, même version du prompt : aucune nouvelle requête
+    assert make_resolver(base_url, cache_path=chemin).resolve(texte) == texte.upper()
+    assert len(FakeChatHandler.prompts) == n_requetes
+
+    make_resolver(base_url, cache_path=chemin, model="gpt-4o").resolve(texte)
+    assert len(FakeChatHandler.prompts) > n_requetes
+
+
+def test_errors_are_raised(base_url):
+    FakeChatHandler.fail = True
+    with pytest.raises(RuntimeError):
+        make_resolver(base_url).resolve("John is a doctor.")
+    with pytest.raises(ValueError):
+        make_resolver(base_url).resolve("   ")
+
+
+def test_shared_resolver_uses_configured_cache(monkeypatch, tmp_path):
+    from py import gpt_coref_resolver
+
+    crees = []
+
+    class Resolveur:
+        def __init__(self, backend, **kwargs):
+            crees.append(kwargs)
+
+        def resolve(self, texte):
+            return texte
+
+    monkeypatch.setattr(gpt_coref_resolver, "make_coref_backend", Resolveur)
+    chemin = str(tmp_path / "coref.db")
+
+    coreference_resolver("John is a doctor.", cache_path=chemin)
+    coreference_resolver("He works at a hospital.", cache_path=chemin)
+
+    # Un seul résolveur par cache, créé avec ce cache
+    assert crees == [{"cache_path": chemin}]
+    with pytest.raises(ValueError):
+        coreference_resolver("John is a doctor.", backend="spacy", cache_path=chemin)
+    gpt_coref_resolver.registry.clear(("coref", "llm", chemin))
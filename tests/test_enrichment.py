@@ -0,0 +1,151 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import pytest
+from rdflib import Graph, URIRef
+from rdflib.namespace import RDF
+from py.enrichment import RDF_TYPE, DBpediaEnricher
+from py.local_dbpedia import LocalDBpediaStore, build
+
+DBR = "http://dbpedia.org/resource/"
+DBO = "http://dbpedia.org/ontology/"
+
+FIXTURE = Graph()
+for sujet, predicat, objet in [
+    (DBR + "Paris", DBO + "country", DBR + "France"),
+    (DBR + "France", DBO + "capital", DBR + "Paris"),
+    (DBR + "Napoleon", DBO + "birthPlace", DBR + "Ajaccio"),
+    (DBR + "Paris", str(RDF.type), DBO + "City"),
+    (DBR + "Paris", str(RDF.type), DBO + "Place"),
+    (DBR + "France", str(RDF.type), DBO + "Country"),
+    (DBR + "Napoleon", str(RDF.type), DBO + "Person"),
+]:
+    FIXTURE.add((URIRef(sujet), URIRef(predicat), URIRef(objet)))
+
+
+class LocalSparqlHandler(BaseHTTPRequestHandler):
+    """Point d'accès SPARQL local qui répond à partir du graphe FIXTURE."""
+
+    queries = []
+
+    def do_GET(self):
+        self.answer(parse_qs(urlparse(self.path).query)["query"][0])
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        self.answer(parse_qs(body)["query"][0])
+
+    def answer(self, query):
+        self.queries.append(query)
+        body = FIXTURE.query(query).serialize(format="json")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/sparql-results+json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LocalSparqlHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    LocalSparqlHandler.queries = []
+    yield f"http://127.0.0.1:{server.server_address[1]}/sparql"
+    server.shutdown()
+
+
+TRIPLETS = [
+    (DBR + "Paris", "capital of", DBR + "France"),
+    (DBR + "Napoleon", "place of birth", DBR + "Ajaccio"),
+    (DBR + "Napoleon", "occupation", "military leader"),
+    ("http://example.org/Bonaparte", "sibling", DBR + "Paris"),
+]
+
+
+def test_enrich_batches_queries_and_keeps_per_triplet_output(endpoint):
+    enrichi = DBpediaEnricher(endpoint, chunk_size=50).enrich(TRIPLETS)
+    n_requetes_lots = len(LocalSparqlHandler.queries)
+
+    LocalSparqlHandler.queries = []
+    par_triplet = DBpediaEnricher(endpoint, chunk_size=1).enrich(TRIPLETS)
+
+    assert n_requetes_lots == 2
+    assert len(LocalSparqlHandler.queries) > n_requetes_lots
+    assert sorted(enrichi) == sorted(par_triplet)
+    assert sorted(enrichi[:4]) == sorted(
+        [
+            (DBR + "Paris", DBO + "country", DBR + "France"),
+            (DBR + "Paris", "capital of", DBR + "France"),
+            (DBR + "Paris", RDF_TYPE, DBO + "City"),
+            (DBR + "Paris", RDF_TYPE, DBO + "Place"),
+        ]
+    )
+    assert (DBR + "Napoleon", DBO + "birthPlace", DBR + "Ajaccio") in enrichi
+    assert (DBR + "Napoleon", "occupation", "military leader") in enrichi
+
+
+def test_types_are_emitted_once_and_fetched_once_across_documents(endpoint, tmp_path):
+    enricher = DBpediaEnricher(endpoint, type_cache_path=str(tmp_path / "types.db"))
+    premier = enricher.enrich(TRIPLETS)
+    requetes_types = [q for q in LocalSparqlHandler.queries if RDF_TYPE in q]
+
+    types_emis = [t for t in premier if t[1] == RDF_TYPE]
+    assert len(types_emis) == len(set(types_emis))
+    assert len(requetes_types) == 1
+
+    # Deuxième document : les ressources déjà vues ne sont plus interrogées
+    LocalSparqlHandler.queries = []
+    enricher.enrich([(DBR + "France", "capital", DBR + "Paris")])
+    assert not [q for q in LocalSparqlHandler.queries if RDF_TYPE in q]
+    assert enricher.stats["type_queries"] == 1
+    assert enricher.type_lookups_saved == enricher.stats["type_lookups"] - 4
+
+    # Nouvelle exécution : les types sont relus depuis le disque
+    LocalSparqlHandler.queries = []
+    autre = DBpediaEnricher(endpoint, type_cache_path=str(tmp_path / "types.db"))
+    assert sorted(autre.types_for_resources([DBR + "Paris"])[DBR + "Paris"]) == [
+        DBO + "City",
+        DBO + "Place",
+    ]
+    assert autre.stats["type_queries"] == 0
+
+
+def test_enricher_shared_between_threads(endpoint):
+    attendu = DBpediaEnricher(endpoint).enrich(TRIPLETS)
+    enricher = DBpediaEnricher(endpoint)
+    resultats = []
+    threads = [
+        threading.Thread(target=lambda: resultats.append(enricher.enrich(TRIPLETS)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert resultats == [attendu] * 8
+    # Chaque document compte toutes ses recherches, même celles servies par la mémoire
+    assert enricher.stats["type_lookups"] == 8 * 6
+    assert set(enricher.type_memo) == {
+        DBR + "Paris",
+        DBR + "France",
+        DBR + "Napoleon",
+        DBR + "Ajaccio",
+    }
+
+
+def test_local_store_backend_matches_sparql_endpoint(endpoint, tmp_path):
+    dump = tmp_path / "dump.nt"
+    FIXTURE.serialize(destination=str(dump), format="nt", encoding="utf-8")
+    chemin = str(tmp_path / "dbpedia.db")
+    build(chemin, [str(dump)])
+
+    distant = DBpediaEnricher(endpoint).enrich(TRIPLETS)
+    LocalSparqlHandler.queries = []
+    local = DBpediaEnricher(backend=LocalDBpediaStore(chemin)).enrich(TRIPLETS)
+
+    assert not LocalSparqlHandler.queries
+    assert sorted(local) == sorted(distant)
@@ -0,0 +1,30 @@
+import re
+from modules.entity_index import EntitySpanIndex
+
+
+def _regex_find(pattern, text):
+    match = re.search(r"\b" + re.escape(pattern) + r"\b", text)
+    return match.start() if match else text.find(pattern)
+
+
+def test_entity_span_index_matches_regex_search():
+    text = (
+        "paris is the capital of france. the parisian metro serves paris. "
+        "new york (usa) is not in france; york is in england."
+    )
+    patterns = ["paris", "france", "york", "new york", "(usa)", "metro s", "london"]
+
+    index = EntitySpanIndex(text, patterns)
+
+    for pattern in patterns:
+        assert index.find(pattern) == _regex_find(pattern, text)
+
+
+def test_entity_span_index_prefers_the_triplet_sentence():
+    text = "paris is in france. napoleon visited paris in 1800."
+    second_sentence = (text.index("napoleon"), len(text))
+
+    index = EntitySpanIndex(text, ["paris"])
+
+    assert index.find("paris") == 0
+    assert index.find("paris", *second_sentence) == text.rindex("paris")
@@ -0,0 +1,131 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from py.entity_linker import (
+    DISAMBIGUATION,
+    FOUND,
+    MISSING,
+    EntityLinker,
+    RateLimiter,
+    WikipediaApiResolver,
+)
+
+
+class StubResolver:
+    """Résolveur local qui compte ses appels au lieu d'interroger Wikipedia."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, entite):
+        self.calls.append(entite)
+        if entite == "Paris":
+            return FOUND, "http://dbpedia.org/resource/Paris"
+        if entite == "Mercury":
+            return DISAMBIGUATION, None
+        if entite == "Réseau":
+            raise ConnectionError("timeout")
+        return MISSING, None
+
+
+def test_entity_linker_memoizes_and_persists(tmp_path):
+    path = str(tmp_path / "entities.sqlite")
+    resolver = StubResolver()
+    linker = EntityLinker(resolver, cache_path=path)
+
+    for _ in range(3):
+        assert linker.resolve("Paris") == "http://dbpedia.org/resource/Paris"
+        assert linker.resolve("Mercury") is None
+        assert linker.resolve("Inconnue") is None
+    assert resolver.calls == ["Paris", "Mercury", "Inconnue"]
+    assert linker.stats["memo_hits"] == 6
+
+    # Une nouvelle exécution relit le cache disque, échecs définitifs compris
+    resolver = StubResolver()
+    linker = EntityLinker(resolver, cache_path=path)
+    assert linker.resolve("Paris") == "http://dbpedia.org/resource/Paris"
+    assert linker.resolve("Mercury") is None
+    assert resolver.calls == []
+    assert linker.stats["disk_hits"] == 2
+
+
+def test_entity_linker_retries_errors_and_expired_entries(tmp_path):
+    resolver = StubResolver()
+    linker = EntityLinker(resolver, cache_path=str(tmp_path / "e.sqlite"), retries=0)
+
+    # Une erreur passagère n'est ni mémorisée ni mise en cache
+    assert linker.resolve("Réseau") is None
+    assert linker.resolve("Réseau") is None
+    assert resolver.calls == ["Réseau", "Réseau"]
+
+    # Une entrée expirée est résolue à nouveau
+    linker = EntityLinker(resolver, cache_path=str(tmp_path / "e.sqlite"), ttl=-1)
+    linker.resolve("Paris")
+    linker = EntityLinker(resolver, cache_path=str(tmp_path / "e.sqlite"), ttl=-1)
+    linker.resolve("Paris")
+    assert resolver.calls.count("Paris") == 2
+
+
+class FakeWikipediaHandler(BaseHTTPRequestHandler):
+    """Imite l'API MediaWiki (action=query) avec une latence injectée."""
+
+    latency = 0.2
+    failures = {}
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        title = parse_qs(urlparse(self.path).query)["titles"][0]
+        if self.failures.get(title, 0) > 0:
+            self.failures[title] -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        if title.startswith("Missing"):
+            page = {"ns": 0, "title": title, "missing": ""}
+        else:
+            page = {
+                "pageid": 1,
+                "title": title,
+                "fullurl": "https://en.wikipedia.org/wiki/" + title.replace(" ", "_"),
+            }
+        body = json.dumps({"query": {"pages": {"1": page}}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_resolve_many_is_concurrent_and_matches_serial():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeWikipediaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_url = f"http://127.0.0.1:{server.server_address[1]}/w/api.php"
+    entites = [f"Entity {i}" for i in range(15)] + ["Missing page"]
+    FakeWikipediaHandler.failures = {"Entity 3": 1}
+
+    def run(max_workers):
+        resolver = WikipediaApiResolver(
+            api_url, timeout=2, rate_limiter=RateLimiter(1000)
+        )
+        linker = EntityLinker(resolver, max_workers=max_workers, backoff=0.01)
+        debut = time.perf_counter()
+        uris = linker.resolve_many(entites)
+        return uris, time.perf_counter() - debut, linker.stats
+
+    try:
+        serial, duree_serial, _ = run(1)
+        FakeWikipediaHandler.failures = {"Entity 3": 1}
+        concurrent, duree_concurrent, stats = run(8)
+    finally:
+        server.shutdown()
+
+    assert concurrent == serial
+    assert concurrent["Entity 3"] == "http://dbpedia.org/resource/Entity_3"
+    assert concurrent["Missing page"] is None
+    assert stats["retries"] == 1
+    assert duree_concurrent < duree_serial / 3
@@ -0,0 +1,100 @@
+import shutil
+import time
+import pytest
+from rdflib import URIRef
+from py import graph_renderer
+from py.graph_renderer import GraphRenderer, render, sample_graph, to_dot
+from py.rdf_grapher import RDFGrapher
+
+EX = "http://example.org/"
+
+# Une étoile autour de Hub, et une chaîne Hub -> A -> B -> C
+TRIPLETS = [(EX + "Hub", "linked to", EX + f"Leaf_{i}") for i in range(10)] + [
+    (EX + "Hub", "next", EX + "A"),
+    (EX + "A", "next", EX + "B"),
+    (EX + "B", "next", EX + "C"),
+    (EX + "C", "name", "the end"),
+]
+
+
+@pytest.fixture
+def graphe():
+    return RDFGrapher().add_triplets(TRIPLETS)
+
+
+def noeuds(g):
+    return {s for s, _, _ in g} | {o for _, _, o in g}
+
+
+def test_degree_sampling_keeps_most_connected_nodes(graphe):
+    echantillon = sample_graph(graphe, max_nodes=3)
+
+    # L'échantillon part du hub et suit ses arêtes vers les voisins les plus connectés
+    assert noeuds(echantillon) == {URIRef(EX + n) for n in ("Hub", "A", "B")}
+    assert len(echantillon) == 2
+    # Un petit graphe est rendu tel quel
+    assert sample_graph(graphe, max_nodes=100) is graphe
+
+
+def test_neighborhood_sampling_around_focus(graphe):
+    echantillon = sample_graph(graphe, max_nodes=None, focus=EX + "B", depth=1)
+
+    assert noeuds(echantillon) == {
+        URIRef(EX + "A"),
+        URIRef(EX + "B"),
+        URIRef(EX + "C"),
+    }
+    assert len(echantillon) == 2
+
+
+def test_dot_is_generated_in_memory(graphe, tmp_path, monkeypatch):
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+
+    dot = render(graphe, "dot", max_nodes=None)
+
+    assert dot == to_dot(graphe)
+    assert dot.startswith("digraph")
+    assert "Leaf_9" in dot
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unknown_format(graphe):
+    with pytest.raises(ValueError):
+        render(graphe, "gif")
+
+
+@pytest.mark.skipif(shutil.which("dot") is None, reason="Graphviz non installé")
+def test_svg_rendering(graphe):
+    svg = render(graphe, "svg", max_nodes=5)
+
+    assert "<svg" in svg
+
+
+def test_html_rendering(graphe):
+    pytest.importorskip("pyvis")
+
+    html = render(graphe, "html", focus=EX + "Hub", depth=1)
+
+    assert "Leaf_0" in html and "the end" not in html
+
+
+def test_renderer_timeout(graphe, monkeypatch):
+    def lent(*args):
+        time.sleep(1)
+        return "digraph {}"
+
+    monkeypatch.setattr(graph_renderer, "to_dot", lent)
+    renderer = GraphRenderer(timeout=0.1)
+
+    with pytest.raises(TimeoutError):
+        renderer.render(graphe, "dot")
+    renderer.close()
+
+
+def test_renderer_max_nodes_none_renders_whole_graph(graphe):
+    renderer = GraphRenderer(max_nodes=3)
+
+    # None demande le graphe entier, sans retomber sur la limite du renderer
+    assert "Leaf_9" in renderer.render(graphe, "dot", max_nodes=None)
+    assert "Leaf_9" not in renderer.render(graphe, "dot")
+    renderer.close()
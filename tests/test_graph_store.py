@@ -0,0 +1,96 @@
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import XSD
+from py import graph_store
+from py.graph_store import GraphStore
+from py.rdf_grapher import RDFGrapher
+
+EX = "http://example.org/"
+DBR = "http://dbpedia.org/resource/"
+
+TRIPLETS = [
+    (DBR + "Paris", "capital of", DBR + "France"),
+    (DBR + "Paris", "http://dbpedia.org/ontology/country", DBR + "France"),
+    (EX + "Bill_Gates", "founded", EX + "Microsoft"),
+    (EX + "Microsoft", "inception", "April 4, 1975"),
+]
+
+
+def test_store_matches_in_memory_graph_and_survives_restart(tmp_path):
+    chemin = str(tmp_path / "graphe.db")
+    attendu = set(RDFGrapher().add_triplets(TRIPLETS))
+
+    grapher = RDFGrapher(store_path=chemin)
+    grapher.add_triplets(TRIPLETS + TRIPLETS)
+    assert len(grapher.g) == 4
+    grapher.store.close()
+
+    # Un nouveau processus retrouve les mêmes triplets
+    graphe = RDFGrapher(store_path=chemin).g
+    assert set(graphe) == attendu
+    assert (
+        URIRef(EX + "Microsoft"),
+        URIRef(EX + "inception"),
+        Literal("1975-04-04", datatype=XSD.date),
+    ) in graphe
+
+
+def test_pattern_queries(tmp_path):
+    graphe = RDFGrapher(store_path=str(tmp_path / "graphe.db")).add_triplets(TRIPLETS)
+    paris, france = URIRef(DBR + "Paris"), URIRef(DBR + "France")
+
+    assert set(graphe.predicates(paris, france)) == {
+        URIRef(EX + "capital_of"),
+        URIRef(DBR + "country"),
+    }
+    assert set(graphe.subjects(None, france)) == {paris}
+    assert set(graphe.objects(URIRef(EX + "Bill_Gates"))) == {URIRef(EX + "Microsoft")}
+    assert list(graphe.triples((URIRef(EX + "Unknown"), None, None))) == []
+
+
+def test_upsert_document_keeps_shared_triplets(tmp_path):
+    grapher = RDFGrapher(store_path=str(tmp_path / "graphe.db"))
+
+    assert grapher.upsert_document("doc-1", TRIPLETS[:3]) == (3, 0)
+    assert grapher.upsert_document("doc-2", TRIPLETS[2:]) == (1, 0)
+    # doc-1 ne garde que son premier triplet : le deuxième disparaît, le troisième
+    # reste grâce à doc-2
+    assert grapher.upsert_document("doc-1", TRIPLETS[:1]) == (0, 1)
+    assert len(grapher.g) == 3
+    assert grapher.store.documents() == ["doc-1", "doc-2"]
+
+    assert grapher.store.remove_document("doc-2") == 2
+    assert len(grapher.g) == 1
+
+
+def test_remove_pattern(tmp_path):
+    store = GraphStore(str(tmp_path / "graphe.db"))
+    graphe = Graph(store=store)
+    graphe += RDFGrapher().add_triplets(TRIPLETS)
+
+    graphe.remove((URIRef(DBR + "Paris"), None, None))
+
+    assert len(graphe) == 2
+    assert store.documents() == [""]
+
+
+def test_invalid_iri_characters_round_trip(tmp_path):
+    chemin = str(tmp_path / "graphe.db")
+    triplets = [(EX + '"Weird Al" Yankovic', "genre|style", EX + "Parody{music}")]
+    attendu = set(RDFGrapher().add_triplets(triplets))
+
+    RDFGrapher(store_path=chemin).add_triplets(triplets).store.close()
+
+    graphe = RDFGrapher(store_path=chemin).g
+    assert set(graphe) == attendu
+    assert (URIRef(EX + "%22Weird_Al%22_Yankovic"), None, None) in graphe
+
+
+def test_pattern_queries_are_read_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(graph_store, "FETCH_SIZE", 2)
+    graphe = RDFGrapher(store_path=str(tmp_path / "graphe.db")).add_triplets(TRIPLETS)
+
+    assert set(graphe) == set(RDFGrapher().add_triplets(TRIPLETS))
+    # Le verrou est relâché entre deux paquets : le store reste utilisable en cours de
+    # parcours
+    for s, p, o in graphe.triples((URIRef(DBR + "Paris"), None, None)):
+        assert len(graphe) == 4
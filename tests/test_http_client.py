@@ -0,0 +1,159 @@
+import threading
+from datetime import datetime, timedelta, timezone
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from py.http_client import CircuitOpenError, HttpClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serveur HTTP/1.1 local qui rejoue une suite de statuts et compte les connexions."""
+
+    protocol_version = "HTTP/1.1"
+    statuses = []
+    connections = set()
+    hits = 0
+    retry_after = "0"
+
+    def do_GET(self):
+        StubHandler.hits += 1
+        StubHandler.connections.add(self.client_address)
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = b'{"ok": true}'
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", self.retry_after)
+        if status == 302:
+            # Redirection vers elle-même, jusqu'à TooManyRedirects
+            self.send_header("Location", self.path)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StubHandler.statuses = []
+    StubHandler.connections = set()
+    StubHandler.hits = 0
+    StubHandler.retry_after = "0"
+    yield f"http://127.0.0.1:{server.server_address[1]}/sparql"
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_reused(url):
+    client = HttpClient()
+    for _ in range(20):
+        assert client.get(url).json() == {"ok": True}
+
+    assert StubHandler.hits == 20
+    assert len(StubHandler.connections) == 1
+    stats = client.stats()[url]
+    assert stats["requests"] == 20
+    assert stats["latency"]["count"] == 20
+    assert sum(stats["latency"]["buckets"].values()) == 20
+    client.close()
+
+
+def test_retries_on_429_and_5xx(url):
+    client = HttpClient(retries=2, backoff=0.01)
+    StubHandler.statuses = [429, 503]
+    assert client.get(url).status_code == 200
+    assert client.stats()[url]["retries"] == 2
+
+    # Plus d'échecs que de tentatives : l'erreur HTTP est levée
+    StubHandler.statuses = [500, 500, 500]
+    with pytest.raises(requests.HTTPError):
+        client.get(url)
+
+    # Une erreur client ne se retente pas
+    StubHandler.statuses = [404]
+    StubHandler.hits = 0
+    with pytest.raises(requests.HTTPError):
+        client.get(url)
+    assert StubHandler.hits == 1
+
+
+def test_circuit_breaker_opens_then_recovers(url):
+    client = HttpClient(retries=0, failure_threshold=2, reset_timeout=0.2)
+    StubHandler.statuses = [500, 500]
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            client.get(url)
+
+    # Circuit ouvert : l'appel est refusé sans atteindre le serveur
+    with pytest.raises(CircuitOpenError):
+        client.get(url)
+    assert StubHandler.hits == 2
+    assert client.stats()[url]["circuit"] == "open"
+
+    # Après le délai, un appel d'essai réussi referme le circuit
+    time.sleep(0.25)
+    assert client.get(url).status_code == 200
+    assert client.stats()[url]["circuit"] == "closed"
+    assert client.stats()[url]["rejected"] == 1
+
+
+def test_retry_after_is_honoured_up_to_max_backoff(url):
+    client = HttpClient(retries=1, backoff=0.01, max_backoff=0.3)
+    StubHandler.retry_after = "7"
+    StubHandler.statuses = [429]
+
+    debut = time.perf_counter()
+    assert client.get(url).status_code == 200
+    duree = time.perf_counter() - debut
+
+    # L'attente demandée (7 s) est bornée par max_backoff, et non remplacée par le backoff
+    assert 0.3 <= duree < 2
+
+
+def test_retry_after_date_without_zone_is_utc(url):
+    client = HttpClient(retries=1, backoff=0.01, max_backoff=0.3)
+    dans_30_s = datetime.now(timezone.utc) + timedelta(seconds=30)
+    StubHandler.retry_after = dans_30_s.strftime("%a, %d %b %Y %H:%M:%S")
+    StubHandler.statuses = [429]
+
+    debut = time.perf_counter()
+    assert client.get(url).status_code == 200
+
+    assert 0.3 <= time.perf_counter() - debut < 2
+
+
+def test_malformed_retry_after_falls_back_to_backoff(url):
+    client = HttpClient(retries=2, backoff=0.01, max_backoff=5)
+    StubHandler.retry_after = "demain"
+    StubHandler.statuses = [429, 429]
+
+    debut = time.perf_counter()
+    assert client.get(url).status_code == 200
+
+    assert time.perf_counter() - debut < 1
+    assert StubHandler.hits == 3
+
+
+def test_failed_trial_call_reopens_circuit(url):
+    client = HttpClient(retries=0, failure_threshold=1, reset_timeout=0.1)
+    StubHandler.statuses = [500]
+    with pytest.raises(requests.HTTPError):
+        client.get(url)
+
+    # L'appel d'essai échoue sur une erreur qui ne se retente pas : le circuit se rouvre
+    time.sleep(0.15)
+    StubHandler.statuses = [302] * 40
+    with pytest.raises(requests.TooManyRedirects):
+        client.get(url)
+    assert client.stats()[url]["circuit"] == "open"
+
+    # Et il reste utilisable : l'essai suivant le referme
+    time.sleep(0.15)
+    StubHandler.statuses = []
+    assert client.get(url).status_code == 200
+    assert client.stats()[url]["circuit"] == "closed"
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+import pytest
+from py.knowledge_graph_extractor import KnowledgeGraphExtractor, iter_text_windows
+from py.worker_pool import RebelWorkerPool
+
+
+@pytest.fixture(scope="module")
+def kge():
+    # Sans les modèles, les tests d'extraction sont ignorés plutôt qu'en échec
+    spacy = pytest.importorskip("spacy")
+    pytest.importorskip("transformers")
+    if not spacy.util.is_package("en_core_web_sm"):
+        pytest.skip("Le modèle Spacy en_core_web_sm n'est pas installé.")
+    return KnowledgeGraphExtractor()
+
+
+def test_worker_pool_matches_single_process(kge, tmp_path):
+    # Chaque worker (spawn) charge son pipeline et ouvre le cache partagé sur disque
+    extracteur = KnowledgeGraphExtractor(rebel_cache_path=str(tmp_path / "rebel.db"))
+    textes = [
+        "Paris is the capital of France.",
+        "Barack Obama was born in Hawaii.",
+        "Bill Gates founded Microsoft.",
+    ]
+
+    with extracteur.worker_pool(2, max_in_flight=2) as pool:
+        # Un appel abandonné en cours de route ne mélange pas ses résultats à l'appel suivant
+        next(pool.imap(reversed(textes)))
+        resultats = [
+            [(h.text, r, t.text) for h, r, t in triplets]
+            for triplets in pool.imap(textes)
+        ]
+    assert pool.closed
+
+    attendus = [
+        [(h.text, r, t.text) for h, r, t in kge.extract_triplet(texte)]
+        for texte in textes
+    ]
+    assert resultats == attendus
+
+
+def test_worker_pool_refuses_to_fork_a_warmed_pipeline():
+    # Aucun modèle n'est chargé : le refus a lieu avant la création des workers
+    kge = SimpleNamespace(nlp=None, init_kwargs={"warmup": True})
+
+    with pytest.raises(ValueError):
+        RebelWorkerPool(kge, start_method="fork")
+
+
+def test_extract_triplets_batch_matches_single_document(kge):
+    textes = [
+        "Napoleon Bonaparte was born in Ajaccio. He was a French military leader.",
+        "Paris is the capital of France.",
+        "Barack Obama was born in Hawaii.",
+    ]
+
+    resultats = list(kge.extract_triplets_batch(textes, batch_size=2))
+
+    # Un résultat par document, dans l'ordre d'entrée
+    assert len(resultats) == len(textes)
+    for texte, triplets in zip(textes, resultats):
+        attendus = kge.extract_triplet(texte)
+        assert [(h.text, r, t.text) for h, r, t in triplets] == [
+            (h.text, r, t.text) for h, r, t in attendus
+        ]
+    assert kge.batch_stats["docs"] == len(textes)
+    assert kge.batch_stats["sentences"] >= len(textes)
+
+
+def test_iter_text_windows_keeps_global_offsets():
+    paragraphe = "Paris is the capital of France. Barack Obama was born in Hawaii. " * 5
+    texte = "\n\n".join([paragraphe.strip()] * 20)
+
+    fenetres = list(iter_text_windows(texte.splitlines(keepends=True), 700))
+
+    assert len(fenetres) > 1
+    for position, fenetre in fenetres:
+        assert texte[position : position + len(fenetre)] == fenetre
+        assert len(fenetre) <= 700
+        # Les fenêtres commencent au début d'une phrase
+        assert fenetre.startswith("Paris")
+    # Rien n'est perdu entre les fenêtres, hormis les espaces aux coupures
+    assert "".join("".join(f.split()) for _, f in fenetres) == "".join(texte.split())
+
+
+def test_warmed_and_cold_pipelines_are_not_shared(monkeypatch):
+    from py import knowledge_graph_extractor
+
+    rodes = []
+    monkeypatch.setattr(knowledge_graph_extractor, "load_nlp", lambda *args: object())
+    monkeypatch.setattr(knowledge_graph_extractor, "warm_up_nlp", rodes.append)
+    chemin = "registre-test.db"
+
+    rode = KnowledgeGraphExtractor(rebel_cache_path=chemin).nlp
+    froid = KnowledgeGraphExtractor(rebel_cache_path=chemin, warmup=False).nlp
+
+    assert froid is not rode
+    assert rodes == [rode]
@@ -0,0 +1,42 @@
+import gzip
+from py.local_dbpedia import RDF_TYPE, LocalDBpediaStore, build, iter_ntriples
+
+DBR = "http://dbpedia.org/resource/"
+DBO = "http://dbpedia.org/ontology/"
+
+DUMP = f"""# started 2024-01-01
+<{DBR}Paris> <{RDF_TYPE}> <{DBO}City> .
+<{DBR}Paris> <{RDF_TYPE}> <{DBO}Place> .
+<{DBR}Paris> <{DBO}country> <{DBR}France> .
+<{DBR}Paris> <{DBO}populationTotal> "2165423"^^<http://www.w3.org/2001/XMLSchema#nonNegativeInteger> .
+<{DBR}Paris> <http://www.w3.org/2000/01/rdf-schema#label> "Paris"@en .
+<{DBR}France> <{RDF_TYPE}> <{DBO}Country> .
+"""
+
+
+def test_iter_ntriples_skips_literals_and_comments():
+    triplets = list(iter_ntriples(DUMP.splitlines()))
+
+    assert len(triplets) == 4
+    assert (DBR + "Paris", DBO + "country", DBR + "France") in triplets
+
+
+def test_build_from_compressed_dump_and_lookup(tmp_path):
+    dump = tmp_path / "dump.nt.gz"
+    with gzip.open(dump, "wt", encoding="utf-8") as f:
+        f.write(DUMP)
+    chemin = str(tmp_path / "dbpedia.db")
+
+    assert build(chemin, [str(dump)], batch_size=2) == 4
+    # Recharger le même dump ne crée pas de doublons
+    build(chemin, [str(dump)])
+
+    store = LocalDBpediaStore(chemin)
+    assert store.types([DBR + "Paris", DBR + "France", DBR + "Nowhere"]) == {
+        DBR + "Paris": [DBO + "City", DBO + "Place"],
+        DBR + "France": [DBO + "Country"],
+    }
+    assert store.predicates(
+        [(DBR + "Paris", DBR + "France"), (DBR + "France", DBR + "Paris")]
+    ) == {(DBR + "Paris", DBR + "France"): [DBO + "country"]}
+    store.close()
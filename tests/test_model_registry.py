@@ -0,0 +1,63 @@
+import threading
+import time
+import pytest
+from py.model_registry import ModelRegistry
+
+
+def test_resource_is_loaded_once_across_threads():
+    registre = ModelRegistry()
+    chargements = []
+    rodages = []
+
+    def charger():
+        chargements.append(1)
+        time.sleep(0.05)
+        return object()
+
+    resultats = []
+    threads = [
+        threading.Thread(
+            target=lambda: resultats.append(
+                registre.get(("nlp", -1), charger, warmup=rodages.append)
+            )
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(chargements) == 1
+    assert len({id(resultat) for resultat in resultats}) == 1
+    assert rodages == [resultats[0]]
+    metriques = registre.metrics()["('nlp', -1)"]
+    # Le chargement n'est pas un accès : seuls les 7 autres threads comptent
+    assert metriques["hits"] == 7
+    assert metriques["load_seconds"] >= 0.05
+    assert metriques["warmup_seconds"] is not None
+
+
+def test_failed_load_is_retried():
+    registre = ModelRegistry()
+
+    def echouer():
+        raise OSError("modèle introuvable")
+
+    with pytest.raises(OSError):
+        registre.get("coref", echouer)
+    assert not registre.is_loaded("coref")
+    assert registre.metrics() == {}
+
+    assert registre.get("coref", lambda: "résolveur") == "résolveur"
+    assert registre.is_loaded("coref")
+
+
+def test_clear_forces_reload():
+    registre = ModelRegistry()
+    registre.get("a", object)
+    premier = registre.get("a", object)
+
+    registre.clear("a")
+
+    assert registre.get("a", object) is not premier
@@ -0,0 +1,75 @@
+import gzip
+from rdflib import Dataset, Graph, URIRef
+from py.ntriples_sink import NTriplesSink
+from py.rdf_grapher import RDFGrapher
+
+EX = "http://example.org/"
+DBR = "http://dbpedia.org/resource/"
+
+TRIPLETS = [
+    (DBR + "Paris", "capital of", DBR + "France"),
+    (DBR + "Paris", "http://dbpedia.org/ontology/country", DBR + "France"),
+    (EX + "Bill_Gates", "founded", EX + "Microsoft"),
+    (EX + "Bill_Gates", "nickname", 'Trey "the \\ boss"\nGates'),
+    (EX + "Microsoft", "inception", "April 4, 1975"),
+]
+
+
+def graphe_attendu(triplets):
+    grapher = RDFGrapher()
+    return set(grapher.get_final_graph(grapher.transform_triplets_to_rdflib(triplets)))
+
+
+def test_ntriples_output_matches_rdf_grapher(tmp_path):
+    chemin = str(tmp_path / "corpus.nt")
+    with NTriplesSink(chemin, buffer_size=2) as sink:
+        assert sink.write(TRIPLETS) == len(TRIPLETS)
+
+    graphe = Graph().parse(chemin, format="nt")
+
+    assert set(graphe) == graphe_attendu(TRIPLETS)
+
+
+def test_duplicates_within_window_are_skipped(tmp_path):
+    chemin = str(tmp_path / "corpus.nt")
+    with NTriplesSink(chemin, dedup_window=2) as sink:
+        sink.write(TRIPLETS[:2])
+        # Les deux triplets sont encore dans la fenêtre
+        assert sink.write(TRIPLETS[:2]) == 0
+        sink.write(TRIPLETS[2:4])
+        # Le premier triplet est sorti de la fenêtre : il est réécrit
+        assert sink.write(TRIPLETS[:1]) == 1
+
+    with open(chemin, encoding="utf-8") as f:
+        lignes = f.readlines()
+    assert len(lignes) == 5
+    assert sink.stats == {"written": 5, "duplicates": 2}
+
+
+def test_nquads_gzip_one_graph_per_document(tmp_path):
+    chemin = str(tmp_path / "corpus.nq.gz")
+    with NTriplesSink(chemin, term_cache_size=1) as sink:
+        assert sink.format == "nq"
+        sink.write(TRIPLETS[:3], document_id="doc-1")
+        sink.write(TRIPLETS[2:], document_id="doc-2")
+
+    with gzip.open(chemin, "rt", encoding="utf-8") as f:
+        dataset = Dataset().parse(data=f.read(), format="nquads")
+
+    for document, triplets in (("doc-1", TRIPLETS[:3]), ("doc-2", TRIPLETS[2:])):
+        graphe = dataset.graph(URIRef(f"http://example.org/graph/{document}"))
+        assert set(graphe) == graphe_attendu(triplets)
+
+
+def test_invalid_iri_characters_are_percent_encoded(tmp_path):
+    chemin = str(tmp_path / "corpus.nq")
+    triplets = [(EX + '"Weird Al" Yankovic', "genre", EX + "Parody{music}")]
+    with NTriplesSink(chemin) as sink:
+        sink.write(triplets, document_id="doc <1>")
+
+    # Le fichier reste du N-Quads valide
+    dataset = Dataset().parse(chemin, format="nquads")
+
+    graphe = dataset.graph(URIRef("http://example.org/graph/doc%20%3C1%3E"))
+    assert set(graphe) == graphe_attendu(triplets)
+    assert (URIRef(EX + "%22Weird_Al%22_Yankovic"), None, None) in graphe
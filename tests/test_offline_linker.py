@@ -0,0 +1,72 @@
+import bz2
+from py.entity_linker import DISAMBIGUATION, FOUND, MISSING, EntityLinker
+from py.offline_linker import OfflineTitleIndex, build, normalize_title, write_index
+
+DBR = "http://dbpedia.org/resource/"
+LABEL = "http://www.w3.org/2000/01/rdf-schema#label"
+REDIRECT = "http://dbpedia.org/ontology/wikiPageRedirects"
+DISAMBIGUATES = "http://dbpedia.org/ontology/wikiPageDisambiguates"
+
+LABELS = f"""<{DBR}Paris> <{LABEL}> "Paris"@en .
+<{DBR}Napoleon> <{LABEL}> "Napoleon"@en .
+<{DBR}Napoleon> <{LABEL}> "Napoléon"@fr .
+<{DBR}Île-de-France> <{LABEL}> "\\u00CEle-de-France"@en .
+<{DBR}Mercury> <{LABEL}> "Mercury"@en .
+"""
+REDIRECTS = f"""<{DBR}Napoleon_Bonaparte> <{REDIRECT}> <{DBR}Napoleon> .
+<{DBR}Bonaparte> <{REDIRECT}> <{DBR}Napoleon_Bonaparte> .
+"""
+DISAMBIGUATIONS = f"""<{DBR}Mercury> <{DISAMBIGUATES}> <{DBR}Mercury_(planet)> .
+"""
+
+
+def ecrire(chemin, contenu):
+    with bz2.open(chemin, "wt", encoding="utf-8") as f:
+        f.write(contenu)
+    return str(chemin)
+
+
+def test_normalize_title():
+    assert normalize_title("  Napoleon_Bonaparte ") == "napoleon bonaparte"
+    assert normalize_title("ÎLE-DE-FRANCE") == "île-de-france"
+
+
+def test_build_and_resolve_from_dumps(tmp_path):
+    chemin = str(tmp_path / "titles.idx")
+    n = build(
+        chemin,
+        labels=[ecrire(tmp_path / "labels.ttl.bz2", LABELS)],
+        redirects=[ecrire(tmp_path / "redirects.ttl.bz2", REDIRECTS)],
+        disambiguations=[ecrire(tmp_path / "disamb.ttl.bz2", DISAMBIGUATIONS)],
+    )
+    index = OfflineTitleIndex(chemin)
+
+    assert len(index) == n
+    assert index("paris") == (FOUND, DBR + "Paris")
+    assert index("Île-de-France") == (FOUND, DBR + "Île-de-France")
+    # Les chaînes de redirections mènent à la ressource canonique
+    assert index("Napoleon Bonaparte") == (FOUND, DBR + "Napoleon")
+    assert index("Bonaparte") == (FOUND, DBR + "Napoleon")
+    assert index("Napoléon") == (MISSING, None)
+    assert index("Mercury") == (DISAMBIGUATION, None)
+    assert index("Atlantis") == (MISSING, None)
+
+    linker = EntityLinker(index)
+    assert linker.resolve_many(["Paris", "Atlantis"]) == {
+        "Paris": DBR + "Paris",
+        "Atlantis": None,
+    }
+    index.close()
+
+
+def test_binary_search_finds_every_entry(tmp_path):
+    entrees = {f"titre {i}": (f"{DBR}T{i}", False) for i in range(1000)}
+    entrees["hors dbpedia"] = ("http://example.org/X", False)
+    chemin = str(tmp_path / "titles.idx")
+    write_index(chemin, entrees)
+    index = OfflineTitleIndex(chemin)
+
+    assert all(index(forme) == (FOUND, uri) for forme, (uri, _) in entrees.items())
+    assert index("titre") == (MISSING, None)
+    assert index("titre 9999") == (MISSING, None)
+    index.close()
@@ -0,0 +1,68 @@
+import time
+import pytest
+from py.pipeline import DocumentPipeline
+
+
+class FakeExtractor:
+    """Imite KnowledgeGraphExtractor : REBEL et l'enrichissement prennent chacun `delai`."""
+
+    def __init__(self, delai=0.05):
+        self.delai = delai
+
+    def extract_triplet(self, texte):
+        time.sleep(self.delai)
+        if texte == "erreur":
+            raise RuntimeError("REBEL a échoué")
+        return [(texte, "relation", "objet")]
+
+    def transform_to_rdf_triplet(self, triplets):
+        return [
+            ("http://example.org/" + sujet, relation, "http://example.org/" + objet)
+            for sujet, relation, objet in triplets
+        ]
+
+    def enrichir_graph(self, triplets):
+        time.sleep(self.delai)
+        return triplets
+
+
+def test_pipeline_matches_serial_execution_and_overlaps_stages():
+    kge = FakeExtractor()
+    textes = [f"doc{i}" for i in range(10)]
+
+    debut = time.perf_counter()
+    serie = [
+        kge.enrichir_graph(kge.transform_to_rdf_triplet(kge.extract_triplet(t.upper())))
+        for t in textes
+    ]
+    duree_serie = time.perf_counter() - debut
+
+    pipeline = DocumentPipeline(kge, coref=str.upper, graph_builder=len, queue_size=2)
+    resultats = pipeline.process(textes)
+
+    assert [r.triplets for r in resultats] == serie
+    assert [r.graph for r in resultats] == [1] * 10
+    assert [r.resolved_text for r in resultats] == [t.upper() for t in textes]
+    # REBEL et l'enrichissement se recouvrent : environ deux fois plus rapide
+    assert pipeline.elapsed < 0.75 * duree_serie
+
+    metriques = pipeline.metrics()
+    assert metriques["stages"]["rebel"]["processed"] == 10
+    assert metriques["stages"]["enrichment"]["busy_seconds"] >= 10 * kge.delai
+    assert all(etape["max_queue_depth"] <= 2 for etape in metriques["stages"].values())
+
+
+def test_failed_document_skips_later_stages():
+    pipeline = DocumentPipeline(FakeExtractor(0), graph_builder=len)
+    resultats = pipeline.process(["a", "erreur", "b"])
+
+    assert [r.error is None for r in resultats] == [True, False, True]
+    assert "REBEL a échoué" in resultats[1].error
+    assert resultats[1].graph is None
+    assert pipeline.metrics()["stages"]["rebel"]["errors"] == 1
+    assert pipeline.metrics()["stages"]["graph"]["processed"] == 2
+
+
+def test_unknown_stage_is_rejected():
+    with pytest.raises(ValueError):
+        DocumentPipeline(FakeExtractor(), concurrency={"parsing": 2})
@@ -0,0 +1,82 @@
+import pytest
+from rdflib import Literal, URIRef
+from rdflib.namespace import XSD
+from py.rdf_grapher import DATE_TYPES, RDFGrapher, classify_literal
+
+EX = "http://example.org/"
+DBR = "http://dbpedia.org/resource/"
+
+TRIPLETS = [
+    (DBR + "Paris", "capital of", DBR + "France"),
+    (DBR + "Paris", "http://dbpedia.org/ontology/country", DBR + "France"),
+    (EX + "Bill_Gates", "founded", EX + "Microsoft"),
+    (EX + "Bill_Gates", "nickname", "Trey's name"),
+]
+
+
+def test_transform_triplets_to_rdflib():
+    rdf = RDFGrapher().transform_triplets_to_rdflib(TRIPLETS)
+
+    assert rdf == [
+        (URIRef(DBR + "Paris"), URIRef(EX + "capital_of"), URIRef(DBR + "France")),
+        (URIRef(DBR + "Paris"), URIRef(DBR + "country"), URIRef(DBR + "France")),
+        (URIRef(EX + "Bill_Gates"), URIRef(EX + "founded"), URIRef(EX + "Microsoft")),
+        (URIRef(EX + "Bill_Gates"), URIRef(EX + "nickname"), Literal("Treys_name")),
+    ]
+    # Un élément répété est converti une seule fois
+    assert rdf[0][0] is rdf[1][0]
+
+
+def test_add_triplets_matches_get_final_graph():
+    grapher = RDFGrapher()
+    attendu = grapher.get_final_graph(grapher.transform_triplets_to_rdflib(TRIPLETS))
+    triplets_attendus = set(attendu)
+
+    graphe = RDFGrapher().add_triplets(iter(TRIPLETS + TRIPLETS))
+
+    assert set(graphe) == triplets_attendus
+    assert len(graphe) == 4
+
+
+@pytest.mark.parametrize(
+    "queue, valeur, datatype",
+    [
+        ("1991", "1991", XSD.gYear),
+        ("October 28, 1955", "1955-10-28", XSD.date),
+        ("October 1955", "1955-10", XSD.gYearMonth),
+        ("2002-05-01", "2002-05-01", XSD.date),
+        ("1,389", "1389", XSD.integer),
+        ("3.5", "3.5", XSD.decimal),
+        ("0", "0", XSD.integer),
+        ("0.25", "0.25", XSD.decimal),
+        ("1769", "1769", XSD.gYear),
+        ("1024", "1024", XSD.integer),
+        ("9000", "9000", XSD.integer),
+        ("0987", "0987", None),
+        ("02139", "02139", None),
+        ("007", "007", None),
+        ("0000", "0000", None),
+        ("19,000 students", "19,000 students", None),
+        ("May", "May", None),
+        ("French public university", "French public university", None),
+    ],
+)
+def test_classify_literal(queue, valeur, datatype):
+    assert classify_literal(queue) == (valeur, datatype)
+    assert RDFGrapher().is_date(queue) == (datatype in DATE_TYPES)
+
+
+def test_dates_and_numbers_become_typed_literals():
+    rdf = RDFGrapher().transform_triplets_to_rdflib(
+        [
+            (EX + "Bill_Gates", "date of birth", "October 28, 1955"),
+            (EX + "UVSQ", "teachers", "1,389"),
+            (EX + "UVSQ", "population", "19,000 students"),
+        ]
+    )
+
+    assert [objet for _, _, objet in rdf] == [
+        Literal("1955-10-28", datatype=XSD.date),
+        Literal("1389", datatype=XSD.integer),
+        Literal("19,000_students"),
+    ]
@@ -0,0 +1,88 @@
+import functools
+import pytest
+from modules.spacy_component import (
+    bucket_by_length,
+    extract_triplets,
+    extract_triplets_from_ids,
+    padded_token_count,
+)
+
+
+def test_bucket_by_length_reduces_padding():
+    lengths = [5, 60, 7, 58, 6, 61]
+
+    batches = bucket_by_length(lengths, 2)
+    in_order = [[0, 1], [2, 3], [4, 5]]
+
+    # Chaque phrase est placée dans exactement un lot
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    assert batches == [[0, 4], [2, 3], [1, 5]]
+    assert padded_token_count(lengths, batches) < padded_token_count(lengths, in_order)
+
+
+PARITY_SENTENCES = [
+    "Paris is the capital of France.",
+    "Barack Obama was born in Hawaii.",
+    "Napoleon Bonaparte was a French military leader born in Ajaccio.",
+    "Bill Gates founded Microsoft with Paul Allen.",
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _backend_triplets(backend):
+    import spacy
+
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    rebel = nlp.add_pipe("rebel", config={"device": -1, "backend": backend})
+    doc = nlp.get_pipe("sentencizer")(nlp.make_doc(" ".join(PARITY_SENTENCES)))
+
+    return rebel._generate_triplets(list(doc.sents))
+
+
+def _triplet_set(triplets_per_sentence):
+    return {
+        (i, tuple(triplet))
+        for i, triplets in enumerate(triplets_per_sentence)
+        for triplet in triplets
+    }
+
+
+@pytest.mark.parametrize("backend", ["int8", "onnx"])
+def test_cpu_backends_match_torch(backend):
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    if backend == "onnx":
+        pytest.importorskip("optimum.onnxruntime")
+
+    attendus = _triplet_set(_backend_triplets("torch"))
+    obtenus = _triplet_set(_backend_triplets(backend))
+
+    # La quantification peut changer quelques décodages : on tolère un faible écart
+    assert len(attendus & obtenus) / len(attendus | obtenus) >= 0.8
+
+
+LINEARIZED_OUTPUTS = [
+    "<triplet> Paris <subj> France <obj> capital of",
+    "<triplet> Napoleon Bonaparte <subj> Ajaccio <obj> place of birth <subj> French "
+    "<obj> country of citizenship <triplet> Ajaccio <subj> France <obj> country",
+    "<triplet> Bill Gates <subj> Microsoft <obj> founded by",
+    "no triplet here",
+]
+
+
+def test_token_id_parser_matches_text_parser():
+    pytest.importorskip("transformers")
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained("Babelscape/rebel-large")
+    marker_ids = tokenizer.convert_tokens_to_ids(["<triplet>", "<subj>", "<obj>"])
+    skip_ids = set(tokenizer.convert_tokens_to_ids(["<s>", "<pad>", "</s>"]))
+
+    for token_ids in tokenizer(LINEARIZED_OUTPUTS)["input_ids"]:
+        expected = extract_triplets(tokenizer.decode(token_ids))
+        records = extract_triplets_from_ids(
+            token_ids, tokenizer.decode, marker_ids, skip_ids
+        )
+
+        assert [record._asdict() for record in records] == expected
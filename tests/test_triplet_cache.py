@@ -0,0 +1,30 @@
+from modules.triplet_cache import TripletCache
+
+
+def test_triplet_cache_hits_and_lru_eviction(tmp_path):
+    path = str(tmp_path / "triplets.sqlite")
+    triplets = [{"head": "Paris", "type": "capital of", "tail": "France"}]
+
+    cache = TripletCache(path, "rebel-large", max_entries=2)
+    cache.put_many({"Paris is the capital of France.": triplets})
+    cache.put_many({"Phrase B.": []})
+
+    # Le texte normalisé sert de clé, les espaces superflus ne comptent pas
+    assert cache.get_many(["  Paris is  the capital of France. "]) == {
+        "  Paris is  the capital of France. ": triplets
+    }
+
+    # "Phrase B." est la moins récemment utilisée, elle est évincée
+    cache.put_many({"Phrase C.": []})
+    assert cache.get_many(["Phrase B."]) == {}
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(cache) == 2
+    cache.close()
+
+    # Le cache survit à la réouverture ; une autre configuration ne le partage pas
+    cache = TripletCache(path, "rebel-large", max_entries=2)
+    assert cache.get_many(["Paris is the capital of France.", "Phrase C."]) == {
+        "Paris is the capital of France.": triplets,
+        "Phrase C.": [],
+    }
+    assert TripletCache(path, "autre-modele").get_many(["Phrase C."]) == {}